@@ -1,17 +1,6 @@
-import os
 import json
-from google import genai
-from dotenv import load_dotenv
 
-load_dotenv()
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not set in environment")
-
-client = genai.Client(api_key=API_KEY)
-
-# list models
-models = client.models.list()   # returns model metadata
+from app.ai.client import call_llm
 
 
 def build_analysis_prompt(parsed_resume: dict, job_desc: dict) -> str:
@@ -49,13 +38,9 @@ def analyze_resume_with_gemini(parsed_resume: dict, job_desc: dict) -> dict:
     prompt = build_analysis_prompt(parsed_resume, job_desc)
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[{"role": "user", "parts": [{"text": prompt}]}],
-            config={"response_mime_type": "application/json"}
-        )
+        response = call_llm(prompt, json_output=True)
 
-        result = json.loads(response.text)
+        result = json.loads(response)
         return result
 
     except Exception as e:
@@ -1,31 +1,73 @@
+import hashlib
+import json
 import os
-from google import genai
+import threading
+import time
+
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from app.utils.logger import logger
+from app.utils.settings import (
+    LLM_MODEL,
+    LLM_MAX_TOKENS,
+    LLM_TEMPERATURE,
+    LLM_PROVIDER,
+    LLM_SERVER_URL,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MOCK_LATENCY_MS,
+    LLM_HTTP_POOL_SIZE,
+)
 
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not set")
 
-client = genai.Client(api_key=API_KEY)
+# -------------------------
+# Backends (one instance per process, created on first call)
+# -------------------------
+class LLMBackend:
+    """generate() returns the raw model text; call_llm handles cleanup + timing."""
+
+    provider = "base"
 
+    def generate(self, prompt: str, json_output: bool = False) -> str:
+        raise NotImplementedError
 
-def call_llm(prompt: str) -> str:
+
+class GeminiBackend(LLMBackend):
     """
-    Minimal, guaranteed-working Gemini call.
+    ONE genai.Client per process: its HTTP client (and connection pool) is
+    reused by every call, including concurrent calls of the async worker.
+    Calls are bounded by LLM_TIMEOUT_SECONDS, like the http backend.
     """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",   # ✅ NO extra quotes
-        contents=prompt,
-    )
+    provider = "gemini"
+
+    def __init__(self):
+        from google import genai
 
-    if isinstance(response, str):
-        text = response
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY not set")
+
+        # genai takes the per-request timeout in milliseconds
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options={"timeout": int(LLM_TIMEOUT_SECONDS * 1000)},
+        )
+
+    def generate(self, prompt: str, json_output: bool = False) -> str:
+        config = {"max_output_tokens": LLM_MAX_TOKENS, "temperature": LLM_TEMPERATURE}
+        if json_output:
+            config["response_mime_type"] = "application/json"
+
+        response = self.client.models.generate_content(
+            model=LLM_MODEL,   # part of the analysis cache key
+            contents=prompt,
+            config=config,
+        )
 
-    # Case 2: Proper SDK response object
-    elif hasattr(response, "candidates"):
         if not response.candidates:
             raise RuntimeError("Gemini returned no candidates")
 
@@ -33,14 +75,110 @@ def call_llm(prompt: str) -> str:
         if not parts:
             raise RuntimeError("Gemini returned empty content parts")
 
-        text = "".join(part.text for part in parts if hasattr(part, "text") and part.text)
+        return "".join(part.text for part in parts if hasattr(part, "text") and part.text)
+
+
+class HttpBackend(LLMBackend):
+    """
+    POST {LLM_SERVER_URL}/generate (e.g. benchmarks/fake_llm_server.py) over
+    a pooled session sized for the async worker's in-flight calls.
+    """
+
+    provider = "http"
+
+    def __init__(self, base_url: str = LLM_SERVER_URL):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_HTTP_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, prompt: str, json_output: bool = False) -> str:
+        response = self.session.post(
+            f"{self.base_url}/generate",
+            json={
+                "model": LLM_MODEL,
+                "prompt": prompt,
+                "maxOutputTokens": LLM_MAX_TOKENS,
+                "temperature": LLM_TEMPERATURE,
+            },
+            timeout=LLM_TIMEOUT_SECONDS,
+        )
+        # HTTPError keeps the response → 429s are recognized by the rate limiter
+        response.raise_for_status()
+        return response.json()["text"]
+
+
+class MockBackend(LLMBackend):
+    """
+    Deterministic, offline: a valid Phase 5B analysis derived from the prompt
+    hash, after LLM_MOCK_LATENCY_MS. For benchmarks and local runs.
+    """
+
+    provider = "mock"
 
-    else:
-        raise RuntimeError("Unexpected Gemini response type")
+    FITS = ("Strong", "Moderate", "Weak")
 
-    text = text.strip()
+    def __init__(self, latency_ms: float = LLM_MOCK_LATENCY_MS):
+        self.latency = latency_ms / 1000
+
+    def generate(self, prompt: str, json_output: bool = False) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        if self.latency:
+            time.sleep(self.latency)
+
+        return json.dumps({
+            "parsed_resume": {
+                "name": None,
+                "email": None,
+                "phone": None,
+                "education": [],
+                "experience": [],
+                "skills": [],
+            },
+            "analysis": {
+                "matchedSkills": [],
+                "missingSkills": [],
+                "strengths": [],
+                "concerns": [],
+                "experienceAssessment": "Generated by the mock LLM backend.",
+                "overallFit": self.FITS[digest[0] % len(self.FITS)],
+                "summary": f"Mock analysis {digest.hex()[:12]}.",
+                "recommendation": "Mock recommendation.",
+            },
+        })
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "http": HttpBackend,
+    "mock": MockBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_llm_backend() -> LLMBackend:
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if LLM_PROVIDER not in BACKENDS:
+                    raise ValueError(f"Unknown LLM provider: {LLM_PROVIDER}")
+                _backend = BACKENDS[LLM_PROVIDER]()
+
+    return _backend
+
+
+# -------------------------
+# Calls
+# -------------------------
+def _clean_text(text: str) -> str:
+    text = (text or "").strip()
     if not text:
-        raise RuntimeError("Gemini returned empty text")
+        raise RuntimeError("LLM returned empty text")
 
     if text.startswith("```"):
         lines = text.splitlines()
@@ -48,3 +186,29 @@ def call_llm(prompt: str) -> str:
         text = "\n".join(lines[1:-1]).strip()
 
     return text
+
+
+def generate(prompt: str, json_output: bool = False) -> dict:
+    """
+    One LLM call with timing.
+
+    Returns: {"text", "provider", "model", "latencyMs"}
+    """
+    backend = get_llm_backend()
+
+    started = time.perf_counter()
+    text = backend.generate(prompt, json_output=json_output)
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "text": _clean_text(text),
+        "provider": backend.provider,
+        "model": LLM_MODEL,
+        "latencyMs": round(latency_ms, 1),
+    }
+
+
+def call_llm(prompt: str, json_output: bool = False) -> str:
+    result = generate(prompt, json_output=json_output)
+    logger.info(f"LLM call: {result['latencyMs']} ms ({result['provider']}/{result['model']})")
+    return result["text"]
@@ -1,24 +1,5 @@
-import os
-import json
-import re
-from google import genai
-from dotenv import load_dotenv
-
-# load_dotenv()
-env = os.getenv("ENV", "development")
-load_dotenv(f".env.{env}")
-
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not set in environment")
-
-client = genai.Client(api_key=API_KEY)
-
-# list models
-models = client.models.list()   # returns model metadata
-
-
-
+# Not implemented yet; when it is, call the shared, lazily created client
+# in app.ai.client (call_llm / generate) instead of building a genai.Client here.
 
 
 # def parse_resume_with_gemini(text: str, model_id: str = "models/gemini-2.5-flash") -> dict:
@@ -0,0 +1,198 @@
+import json
+
+from app.analysis.prompt import build_prompt
+from app.embeddings.features import SECTION_HEADERS
+from app.embeddings.skill_matcher import SkillMatcher
+from app.utils.settings import (
+    LLM_INPUT_TOKEN_BUDGET,
+    LLM_JOB_TOKEN_BUDGET,
+    LLM_RESUME_MIN_TOKENS,
+)
+
+# ~4 characters per token for English prose (Gemini / GPT tokenizers)
+CHARS_PER_TOKEN = 4
+
+# Resume text is kept / dropped in segments of this many words
+SEGMENT_WORDS = 24
+
+# Word n-gram length: a run repeated this long (page headers / footers,
+# copy-pasted bullets) is kept only once
+REPEAT_NGRAM = 8
+
+# Tie-break between segments with the same number of skill hits
+SECTION_PRIORITY = {
+    "experience": 0,
+    "skills": 1,
+    "summary": 2,
+    "projects": 3,
+    "certifications": 4,
+    "education": 5,
+    "achievements": 6,
+}
+
+_TEMPLATE_TOKENS = None
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _template_tokens() -> int:
+    global _TEMPLATE_TOKENS
+    if _TEMPLATE_TOKENS is None:
+        _TEMPLATE_TOKENS = estimate_tokens(build_prompt(resume_text="", job_text="", explanation={}))
+    return _TEMPLATE_TOKENS
+
+
+def _dedupe_words(words: list[str]) -> list[str]:
+    """Drops every word run whose REPEAT_NGRAM-gram was already seen."""
+    seen = set()
+    kept = []
+    skip_until = 0
+
+    for i in range(len(words)):
+        gram = tuple(words[i:i + REPEAT_NGRAM])
+        if len(gram) == REPEAT_NGRAM:
+            if gram in seen:
+                skip_until = i + REPEAT_NGRAM
+            else:
+                seen.add(gram)
+
+        if i >= skip_until:
+            kept.append(words[i])
+
+    return kept
+
+
+def _segments(words: list[str]) -> list[tuple[str, int, int]]:
+    """(section, start, end) word ranges; a heading always starts a new segment."""
+    segments = []
+    section = None
+    start = 0
+
+    for i, word in enumerate(words):
+        if word in SECTION_HEADERS and i > start:
+            segments.append((section, start, i))
+            start = i
+        if word in SECTION_HEADERS:
+            section = word
+        if i + 1 - start >= SEGMENT_WORDS:
+            segments.append((section, start, i + 1))
+            start = i + 1
+
+    if start < len(words):
+        segments.append((section, start, len(words)))
+
+    return segments
+
+
+def compact_resume_text(
+    normalized_resume_text: str,
+    max_tokens: int,
+    skill_matcher: SkillMatcher | None = None,
+) -> str:
+    """
+    Fits normalized resume text into `max_tokens`:
+    1. repeated word runs are removed
+    2. if still too long, segments are kept by skill hits (job skills),
+       then section (experience → skills → summary → ...), then position,
+       and emitted in their original order (one line per kept run)
+    """
+    words = _dedupe_words(normalized_resume_text.split())
+    text = " ".join(words)
+
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Skill hits per word position (a hit counts where the skill ends)
+    hits = [0] * len(words)
+    if skill_matcher is not None:
+        node = 0
+        for i, word in enumerate(words):
+            node = skill_matcher.advance(node, word)
+            hits[i] = len(skill_matcher.outputs(node))
+
+    segments = _segments(words)
+    ranked = sorted(
+        range(len(segments)),
+        key=lambda s: (
+            -sum(hits[segments[s][1]:segments[s][2]]),
+            SECTION_PRIORITY.get(segments[s][0], len(SECTION_PRIORITY)),
+            s,
+        ),
+    )
+
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    kept = set()
+    used = 0
+
+    for s in ranked:
+        _, start, end = segments[s]
+        size = sum(len(word) + 1 for word in words[start:end])
+        if used + size > budget_chars:
+            continue
+        kept.add(s)
+        used += size
+
+    lines = []
+    previous = None
+    for s in sorted(kept):
+        segment_text = " ".join(words[segments[s][1]:segments[s][2]])
+        if previous is not None and previous == s - 1:
+            lines[-1] += " " + segment_text
+        else:
+            lines.append(segment_text)
+        previous = s
+
+    return "\n".join(lines)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0]
+
+
+def assemble_prompt(
+    resume_text: str,
+    job_text: str,
+    explanation: dict,
+    skill_matcher: SkillMatcher | None = None,
+    budget: int = LLM_INPUT_TOKEN_BUDGET,
+) -> dict:
+    """
+    Phase 5B — build_prompt within an input token budget:
+    template + explanation are always sent, the job description is capped at
+    LLM_JOB_TOKEN_BUDGET and the resume gets what is left (never less than
+    LLM_RESUME_MIN_TOKENS).
+
+    Returns: {"prompt", "tokens": {"template", "explanation", "job", "resume", "total"},
+              "resumeText" (as sent), "resumeCompacted"}
+    """
+    explanation_tokens = estimate_tokens(json.dumps(explanation or {}))
+
+    job_text = _truncate(job_text or "", LLM_JOB_TOKEN_BUDGET)
+    job_tokens = estimate_tokens(job_text)
+
+    resume_budget = max(
+        LLM_RESUME_MIN_TOKENS,
+        budget - _template_tokens() - explanation_tokens - job_tokens,
+    )
+    compacted = compact_resume_text(resume_text or "", resume_budget, skill_matcher)
+    resume_tokens = estimate_tokens(compacted)
+
+    prompt = build_prompt(resume_text=compacted, job_text=job_text, explanation=explanation)
+
+    return {
+        "prompt": prompt,
+        "tokens": {
+            "template": _template_tokens(),
+            "explanation": explanation_tokens,
+            "job": job_tokens,
+            "resume": resume_tokens,
+            "total": estimate_tokens(prompt),
+        },
+        "resumeText": compacted,
+        "resumeCompacted": compacted != resume_text,
+    }
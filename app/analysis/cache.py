@@ -0,0 +1,131 @@
+import hashlib
+import json
+import zlib
+from datetime import datetime, timezone
+
+from app.analysis.prompt import build_prompt
+from app.utils.logger import logger
+from app.utils.settings import (
+    ANALYSIS_CACHE_BACKEND,
+    ANALYSIS_CACHE_TTL_SECONDS,
+    LLM_INPUT_TOKEN_BUDGET,
+    LLM_JOB_TOKEN_BUDGET,
+    LLM_MODEL,
+)
+
+
+def _prompt_template_hash() -> str:
+    """
+    Hash of the build_prompt template itself (rendered with fixed placeholders)
+    and of the input budgets: any wording or compaction change to the prompt
+    invalidates every cached analysis.
+    """
+    template = build_prompt(resume_text="{resume_text}", job_text="{job_text}", explanation={})
+    template += f"\nbudget={LLM_INPUT_TOKEN_BUDGET}:{LLM_JOB_TOKEN_BUDGET}"
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+PROMPT_VERSION = _prompt_template_hash()
+
+
+def analysis_key(resume_hash: str, job_hash: str, model: str = LLM_MODEL) -> str:
+    """Content address of ONE analysis: same resume text + job version + prompt + model."""
+    return f"{resume_hash}:{job_hash}:{PROMPT_VERSION}:{model}"
+
+
+class AnalysisCache:
+    """
+    Validated LLM analysis outputs by analysis_key.
+    Backends must never raise on get/put — the cache is an optimization only.
+    """
+
+    def get(self, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def put(self, key: str, analysis: dict):
+        raise NotImplementedError
+
+
+class NullAnalysisCache(AnalysisCache):
+
+    def get(self, key: str) -> dict | None:
+        return None
+
+    def put(self, key: str, analysis: dict):
+        pass
+
+
+class RedisAnalysisCache(AnalysisCache):
+    """
+    Entries expire after `ttl_seconds`; size-based eviction is left to the
+    Redis maxmemory policy (e.g. allkeys-lru).
+    """
+
+    def __init__(self, redis_conn, ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS, prefix: str = "analysis"):
+        self.redis_conn = redis_conn
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> dict | None:
+        try:
+            raw = self.redis_conn.get(f"{self.prefix}:{key}")
+            return json.loads(zlib.decompress(raw)) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠ Analysis cache read failed: {e}")
+            return None
+
+    def put(self, key: str, analysis: dict):
+        try:
+            raw = zlib.compress(json.dumps(analysis).encode("utf-8"))
+            self.redis_conn.set(f"{self.prefix}:{key}", raw, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠ Analysis cache write failed: {e}")
+
+
+class MongoAnalysisCache(AnalysisCache):
+    """
+    One `analysiscache` doc per key. Expiry is the TTL index on `createdAt`
+    declared in app/utils/indexes.py (ANALYSIS_CACHE_TTL_SECONDS).
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get(self, key: str) -> dict | None:
+        try:
+            doc = self.collection.find_one({"_id": key}, {"analysis": 1})
+            return doc["analysis"] if doc else None
+        except Exception as e:
+            logger.warning(f"⚠ Analysis cache read failed: {e}")
+            return None
+
+    def put(self, key: str, analysis: dict):
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                {"$set": {"analysis": analysis, "createdAt": datetime.now(timezone.utc)}},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"⚠ Analysis cache write failed: {e}")
+
+
+_cache = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+
+    if _cache is None:
+        if ANALYSIS_CACHE_BACKEND == "redis":
+            from app.utils.redis_client import redis_conn
+            _cache = RedisAnalysisCache(redis_conn)
+        elif ANALYSIS_CACHE_BACKEND == "mongo":
+            from app.utils.mongo import analysis_cache_collection
+            _cache = MongoAnalysisCache(analysis_cache_collection)
+        elif ANALYSIS_CACHE_BACKEND == "none":
+            _cache = NullAnalysisCache()
+        else:
+            raise ValueError(f"Unknown analysis cache backend: {ANALYSIS_CACHE_BACKEND}")
+
+    return _cache
@@ -0,0 +1,127 @@
+import random
+import time
+
+from app.utils.logger import logger
+from app.utils.redis_client import redis_conn
+from app.utils.settings import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_BACKOFF_RESET_SECONDS,
+    LLM_RATE_LIMIT_PREFIX,
+    LLM_RPM_LIMIT,
+    LLM_TPM_LIMIT,
+)
+
+# Two token buckets refilled continuously over a minute (requests, prompt tokens).
+# A request is admitted only if BOTH have room; otherwise nothing is taken and
+# the script returns how long to wait. Returns "0" when admitted.
+# KEYS: requests bucket, tokens bucket, cooldown key
+# ARGV: now, rpm, tpm, tokens
+BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+
+local cooldown = tonumber(redis.call('GET', KEYS[3]) or '0')
+if cooldown > now then
+    return tostring(cooldown - now)
+end
+
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i + 1])
+    local cost = i == 1 and 1 or math.min(tonumber(ARGV[4]), capacity)
+    if capacity > 0 then
+        local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+        local level = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        level = math.min(capacity, level + math.max(0, now - ts) * capacity / 60)
+        levels[i] = {level, cost}
+        if level < cost then
+            wait = math.max(wait, (cost - level) * 60 / capacity)
+        end
+    end
+end
+
+for i = 1, 2 do
+    if levels[i] then
+        local level = levels[i][1]
+        if wait == 0 then
+            level = level - levels[i][2]
+        end
+        redis.call('HSET', KEYS[i], 'level', tostring(level), 'ts', ARGV[1])
+        redis.call('EXPIRE', KEYS[i], 120)
+    end
+end
+
+return tostring(wait)
+"""
+
+_bucket = redis_conn.register_script(BUCKET_SCRIPT)
+
+
+class LLMRateLimiter:
+    """
+    Requests/min + tokens/min limit shared by every analysis worker (and every
+    thread of the async mode) through Redis, plus a shared 429 cooldown.
+    """
+
+    def __init__(self, rpm: int = LLM_RPM_LIMIT, tpm: int = LLM_TPM_LIMIT, prefix: str = LLM_RATE_LIMIT_PREFIX):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.keys = [f"{prefix}:requests", f"{prefix}:tokens", f"{prefix}:cooldown"]
+        self.penalty_key = f"{prefix}:penalty"
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Blocks until the call may be sent (limits of 0 are unlimited, the 429
+        cooldown always applies). Returns seconds waited.
+        """
+        waited = 0.0
+        while True:
+            wait = float(_bucket(keys=self.keys, args=[time.time(), self.rpm, self.tpm, tokens]))
+            if wait <= 0:
+                return waited
+
+            # Jitter so waiting workers do not retry in lockstep
+            wait = wait * random.uniform(1.0, 1.2)
+            time.sleep(wait)
+            waited += wait
+
+    def backoff(self) -> float:
+        """
+        Provider answered 429: pause EVERY worker. Consecutive 429s double the
+        pause (up to LLM_BACKOFF_MAX_SECONDS); it resets after a quiet period.
+        """
+        pipeline = redis_conn.pipeline()
+        pipeline.incr(self.penalty_key)
+        pipeline.expire(self.penalty_key, LLM_BACKOFF_RESET_SECONDS)
+        penalty = pipeline.execute()[0]
+
+        delay = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** (penalty - 1))
+        until = time.time() + delay
+
+        # Only ever extends the cooldown
+        current = float(redis_conn.get(self.keys[2]) or 0)
+        if until > current:
+            redis_conn.set(self.keys[2], until, ex=int(delay) + 1)
+
+        logger.warning(f"⏸ LLM rate limited (429 #{penalty}), all workers pause {delay:.1f}s")
+        return delay
+
+
+def is_rate_limited(err: Exception) -> bool:
+    """429 from the Gemini SDK (`code`) or an HTTP client (`response.status_code`)."""
+    if getattr(err, "code", None) == 429 or getattr(err, "status_code", None) == 429:
+        return True
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+_limiter = None
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = LLMRateLimiter()
+    return _limiter
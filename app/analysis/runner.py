@@ -1,5 +1,23 @@
-
 from app.ai.client import call_llm  # your existing client
+from app.analysis.budget import estimate_tokens
+from app.analysis.rate_limit import get_rate_limiter, is_rate_limited
+from app.utils.settings import LLM_RATE_LIMIT_RETRIES
+
 
 def run_llm(prompt: str) -> str:
-    return call_llm(prompt=prompt)
+    """
+    One LLM call under the shared rate limit. A 429 pauses every worker
+    (adaptive backoff) and is retried here before it fails the job.
+    """
+    limiter = get_rate_limiter()
+    tokens = estimate_tokens(prompt)
+
+    for attempt in range(LLM_RATE_LIMIT_RETRIES + 1):
+        limiter.acquire(tokens)
+        try:
+            return call_llm(prompt=prompt)
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == LLM_RATE_LIMIT_RETRIES:
+                raise
+            # acquire() of the next attempt waits out the shared cooldown
+            limiter.backoff()
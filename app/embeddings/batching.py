@@ -0,0 +1,115 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.embeddings.providers.base import EmbeddingProvider
+from app.utils.logger import logger
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching executor in front of an EmbeddingProvider.
+
+    Callers from any thread submit single texts; a background thread collects
+    them and calls provider.embed_many() once the batch is full or the oldest
+    text has waited `max_wait_ms`. Each caller gets its own Future back.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        result_timeout: float | None = 60,
+    ):
+        self.provider = provider
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        # A caller never waits forever on a stuck provider / flusher
+        self.result_timeout = result_timeout
+
+        self._queue: "queue.Queue[tuple[str, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
+
+    def submit(self, text: str) -> Future:
+        # Reject bad input here so it cannot fail a whole batch of other callers
+        if not text or not text.strip():
+            raise ValueError("Cannot generate embedding for empty text")
+
+        self._ensure_running()
+
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> list[float]:
+        return self.submit(text).result(timeout=self.result_timeout)
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout=self.result_timeout) for future in futures]
+
+    def _ensure_running(self):
+        # Threads do not survive fork → restart the flusher in a new process
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="embedding-batcher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _flush(self, batch: list[tuple[str, Future]]):
+        texts = [text for text, _ in batch]
+        embeddings = self.provider.embed_many(texts)
+
+        if len(embeddings) != len(batch):
+            raise RuntimeError(f"Embedding provider returned {len(embeddings)} vectors for {len(batch)} texts")
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            # Every future is resolved, whatever happens: the flusher never dies
+            try:
+                self._flush(batch)
+
+            except Exception as e:
+                logger.warning(f"⚠ Embedding batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
@@ -0,0 +1,79 @@
+"""
+Compact embedding storage codec.
+
+Binary layout (little endian), stored as BSON binary:
+
+    version: uint8 | dtype: uint8 | dim: uint16 | scale: float32 | data...
+
+The 8-byte header keeps float32 data aligned, so decoding is a zero-copy
+np.frombuffer view. int8 vectors are symmetric-quantized with `scale`.
+"""
+import struct
+
+import numpy as np
+from bson.binary import Binary
+
+CODEC_VERSION = 1
+
+HEADER = struct.Struct("<BBHf")
+
+DTYPES = {
+    "float32": (1, np.float32),
+    "int8": (2, np.int8),
+}
+DTYPE_BY_CODE = {code: (name, dtype) for name, (code, dtype) in DTYPES.items()}
+
+STORAGE_FORMATS = ("list", *DTYPES)
+
+
+def encode_embedding(embedding, storage_format: str = "float32"):
+    """
+    Returns the value to store on a Mongo document:
+    a plain list for "list", BSON binary for "float32" / "int8".
+    """
+    if storage_format == "list":
+        return embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+
+    if storage_format not in DTYPES:
+        raise ValueError(f"Unknown embedding storage format: {storage_format}")
+
+    code, dtype = DTYPES[storage_format]
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    scale = 1.0
+
+    if dtype is np.int8:
+        peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        vector = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+
+    header = HEADER.pack(CODEC_VERSION, code, vector.size, scale)
+    return Binary(header + vector.tobytes())
+
+
+def decode_embedding(value) -> np.ndarray:
+    """
+    Decodes any stored representation (legacy list or binary) to a float32 array.
+    float32 blobs are decoded without copying.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False)
+
+    if isinstance(value, (list, tuple)):
+        return np.asarray(value, dtype=np.float32)
+
+    buffer = value if isinstance(value, (bytes, memoryview)) else bytes(value)
+    version, code, dim, scale = HEADER.unpack_from(buffer)
+
+    if version != CODEC_VERSION or code not in DTYPE_BY_CODE:
+        raise ValueError(f"Unsupported embedding blob (version={version}, dtype={code})")
+
+    _, dtype = DTYPE_BY_CODE[code]
+    vector = np.frombuffer(buffer, dtype=dtype, count=dim, offset=HEADER.size)
+
+    if dtype is np.int8:
+        return vector.astype(np.float32) * np.float32(scale)
+
+    return vector
@@ -1,13 +1,17 @@
 # from app.embeddings.providers.gemini import GeminiEmbeddingProvider
-from app.embeddings.providers.minilm import MiniLMEmbeddingProvider
 
 
 def get_embedding_provider(provider_name: str):
+    # Providers are imported lazily: a "remote" worker must not pull in torch
     if provider_name == "minilm":
+        from app.embeddings.providers.minilm import MiniLMEmbeddingProvider
         return MiniLMEmbeddingProvider()
 
+    if provider_name == "remote":
+        from app.embeddings.providers.remote import RemoteEmbeddingProvider
+        return RemoteEmbeddingProvider()
+
     # if provider_name == "gemini":
     #     return GeminiEmbeddingProvider()
 
     raise ValueError(f"Unknown embedding provider: {provider_name}")
-
@@ -0,0 +1,118 @@
+import re
+
+from app.embeddings.experience import compute_experience_match_ratio
+from app.embeddings.scoring import compute_final_score
+from app.embeddings.skill_matcher import SkillMatcher, SkillMatchResult
+
+# Bump when the record layout or extraction rules change
+FEATURES_VERSION = 1
+
+# Single-word headings (normalized text has no line breaks left)
+SECTION_HEADERS = frozenset({
+    "summary", "experience", "education", "skills",
+    "projects", "certifications", "achievements",
+})
+
+# "5 years" / "5 yrs" / "5years" — same units as EXPERIENCE_PATTERN
+_EXPERIENCE_UNIT = re.compile(r"(\d*)(?:years?|yrs?)")
+
+
+def extract_resume_features(
+    normalized_resume_text: str,
+    skill_matcher: SkillMatcher,
+    required_years: float | None = 0,
+) -> tuple[dict, SkillMatchResult]:
+    """
+    Phase 4.3 — Deterministic resume signals in ONE pass over the tokens:
+    - experience years (max "<n> years" mention, like extract_experience_years)
+    - required / preferred skill hits (job SkillMatcher automaton)
+    - section offsets: [start, end) char range in normalizedResumeText,
+      starting at the FIRST occurrence of each heading word
+
+    Returns (feature record stored as `features`, SkillMatchResult).
+    """
+    found: set[int] = set()
+    node = 0
+
+    experience_years = 0.0
+    previous_number = None
+
+    section_starts: dict[str, int] = {}
+    offset = 0
+    token_count = 0
+
+    for token in normalized_resume_text.split():
+        token_count += 1
+
+        # 1️⃣ Skills
+        node = skill_matcher.advance(node, token)
+        if skill_matcher.outputs(node):
+            found.update(skill_matcher.outputs(node))
+
+        # 2️⃣ Experience
+        if token.isdigit():
+            previous_number = token
+        else:
+            unit = _EXPERIENCE_UNIT.match(token)
+            years = (unit.group(1) or previous_number) if unit else None
+            if years:
+                experience_years = max(experience_years, float(years))
+            previous_number = None
+
+        # 3️⃣ Sections
+        if token in SECTION_HEADERS and token not in section_starts:
+            section_starts[token] = offset
+
+        offset += len(token) + 1
+
+    skill_matches = skill_matcher.result(found)
+
+    ordered = sorted(section_starts.items(), key=lambda item: item[1])
+    text_length = len(normalized_resume_text)
+    sections = {
+        name: [start, ordered[i + 1][1] - 1 if i + 1 < len(ordered) else text_length]
+        for i, (name, start) in enumerate(ordered)
+    }
+
+    features = {
+        "version": FEATURES_VERSION,
+        "tokenCount": token_count,
+        "experienceYears": experience_years,
+        "requiredYears": required_years or 0,
+        "experienceRatio": compute_experience_match_ratio(experience_years, required_years),
+        "requiredSkillHits": skill_matches.matched_required,
+        "missingRequiredSkills": skill_matches.missing_required,
+        "preferredSkillHits": skill_matches.matched_preferred,
+        "requiredSkillRatio": skill_matches.required_ratio,
+        "preferredSkillRatio": skill_matches.preferred_ratio,
+        "sections": sections,
+    }
+
+    return features, skill_matches
+
+
+def experience_info(features: dict) -> dict:
+    """Experience block used by the decision / experience explanations."""
+    return {
+        "requiredYears": features["requiredYears"],
+        "candidateYears": features["experienceYears"],
+        "meetsRequirement": features["experienceYears"] >= features["requiredYears"],
+    }
+
+
+def score_from_features(features: dict, similarity_score: float) -> float:
+    """Final score from a stored feature record (no resume text needed)."""
+    return compute_final_score(
+        semantic_similarity=similarity_score,
+        required_skill_match_ratio=features["requiredSkillRatio"],
+        preferred_skill_match_ratio=features["preferredSkillRatio"],
+        experience_match_ratio=features["experienceRatio"],
+    )
+
+
+def section_text(normalized_resume_text: str, features: dict, section: str) -> str:
+    """Slice one section out of the stored text without rescanning it."""
+    bounds = (features.get("sections") or {}).get(section)
+    if not bounds:
+        return ""
+    return normalized_resume_text[bounds[0]:bounds[1]]
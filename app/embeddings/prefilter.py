@@ -1,8 +1,12 @@
+from app.embeddings.skill_matcher import SkillMatchResult, match_skills
+
+
 def prefilter_resume(
     similarity_score: float,
     normalized_resume_text: str,
     required_skills: list[str],
     similarity_threshold: float = 0.30,
+    skill_matches: SkillMatchResult | None = None,
 ):
     """
     Phase 4.3 — Pre-filter decision
@@ -14,11 +18,14 @@ def prefilter_resume(
     if similarity_score < similarity_threshold:
         reasons.append("Low semantic similarity")
 
-    # 2️⃣ Required skills presence check (cheap string match)
+    # 2️⃣ Required skills presence check (whole-word match, one scan per resume)
+    if skill_matches is None:
+        skill_matches = match_skills(normalized_resume_text, required_skills)
+
     missing_skills = [
         skill
         for skill in required_skills
-        if skill.lower() not in normalized_resume_text
+        if skill not in skill_matches.matched
     ]
 
     if required_skills and len(missing_skills) >= max(1, len(required_skills) // 2):
@@ -33,3 +40,4 @@ def prefilter_resume(
         "similarityScore": round(similarity_score, 4),
         "reasons": reasons,
     }
+
@@ -4,3 +4,10 @@ class EmbeddingProvider:
 
     def embed(self, text: str) -> list[float]:
         raise NotImplementedError
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embeds several texts, results in input order.
+        Providers with native batching should override this.
+        """
+        return [self.embed(text) for text in texts]
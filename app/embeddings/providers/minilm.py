@@ -32,3 +32,23 @@ class MiniLMEmbeddingProvider(EmbeddingProvider):
 
         except Exception as e:
             raise RuntimeError(f"MiniLM embedding failed: {str(e)}") from e
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot generate embedding for empty text")
+
+        if not texts:
+            return []
+
+        try:
+            # One forward pass per batch is several times faster on CPU
+            embeddings = MiniLMEmbeddingProvider._model.encode(
+                texts,
+                batch_size=len(texts),
+                normalize_embeddings=True
+            )
+
+            return embeddings.tolist()
+
+        except Exception as e:
+            raise RuntimeError(f"MiniLM embedding failed: {str(e)}") from e
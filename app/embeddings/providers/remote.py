@@ -0,0 +1,64 @@
+import requests
+from app.embeddings.providers.base import EmbeddingProvider
+from app.utils.settings import EMBEDDING_SERVER_URL, EMBEDDING_SERVER_TIMEOUT
+
+
+class RemoteEmbeddingProvider(EmbeddingProvider):
+    """
+    Client for the local embedding sidecar (app/embeddings/server.py).
+    The model lives in the sidecar, so workers load no weights at all.
+    """
+
+    # IMPORTANT: one pooled keep-alive session per worker process
+    _session = None
+    _model_name = None
+
+    def __init__(self, base_url: str = EMBEDDING_SERVER_URL):
+        self.base_url = base_url.rstrip("/")
+
+        if RemoteEmbeddingProvider._session is None:
+            RemoteEmbeddingProvider._session = requests.Session()
+
+    @property
+    def model_name(self) -> str:
+        # Stored embeddingModel must name the real model, not "remote"
+        if RemoteEmbeddingProvider._model_name is None:
+            try:
+                response = self._session.get(
+                    f"{self.base_url}/health", timeout=EMBEDDING_SERVER_TIMEOUT
+                )
+                response.raise_for_status()
+                RemoteEmbeddingProvider._model_name = response.json()["model"]
+
+            except Exception as e:
+                raise RuntimeError(f"Embedding server unavailable: {str(e)}") from e
+
+        return RemoteEmbeddingProvider._model_name
+
+    def embed(self, text: str) -> list[float]:
+        if not text or not text.strip():
+            raise ValueError("Cannot generate embedding for empty text")
+
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot generate embedding for empty text")
+
+        if not texts:
+            return []
+
+        try:
+            response = self._session.post(
+                f"{self.base_url}/embed",
+                json={"texts": texts},
+                timeout=EMBEDDING_SERVER_TIMEOUT,
+            )
+            response.raise_for_status()
+            body = response.json()
+
+            RemoteEmbeddingProvider._model_name = body["model"]
+            return body["embeddings"]
+
+        except Exception as e:
+            raise RuntimeError(f"Remote embedding failed: {str(e)}") from e
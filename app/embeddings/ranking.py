@@ -1,77 +1,183 @@
+import time
+
 from bson import ObjectId
+from pymongo import UpdateOne
+from app.embeddings.features import score_from_features
+from app.services.resume_processings import find_unsettled, iter_ranking_candidates
 from app.utils.mongo import resume_processings_collection
-from app.embeddings.scoring import compute_final_score
-from app.embeddings.skill_match import compute_skill_match_ratio
-from app.embeddings.experience import compute_experience_match_ratio
+from app.utils.redis_client import redis_conn
+from app.utils.settings import (
+    RANKING_KEY_PREFIX,
+    RANKING_KEY_TTL_SECONDS,
+    RANKING_WRITE_CHUNK_SIZE,
+)
+
+
+def ranking_key(batch_id: str, job_description_id: str) -> str:
+    return f"{RANKING_KEY_PREFIX}:{batch_id}:{job_description_id}"
+
+
+def record_resume_score(
+    batch_id: str,
+    job_description_id: str,
+    resume_processing_id: str,
+    final_score: float,
+):
+    """
+    Phase 4.4 — Insert ONE scored resume into the batch ordered set.
+    ZADD is idempotent, so retries simply overwrite the same member.
+    """
+
+    key = ranking_key(batch_id, job_description_id)
+
+    pipeline = redis_conn.pipeline()
+    pipeline.zadd(key, {str(resume_processing_id): final_score})
+    pipeline.expire(key, RANKING_KEY_TTL_SECONDS)
+    pipeline.execute()
 
 
-def rank_resumes_in_batch(
+def discard_resume_score(
     batch_id: str,
     job_description_id: str,
-    required_skills: list[str],
-    preferred_skills: list[str],
-    min_experience_years: float,
+    resume_processing_id: str,
 ):
     """
-    Phase 4.4 — Rank all PASSED resumes in a batch
+    Remove a resume from the batch ordered set (e.g. it failed permanently
+    after being scored but before its results were persisted).
     """
+    redis_conn.zrem(ranking_key(batch_id, job_description_id), str(resume_processing_id))
 
-    cursor = resume_processings_collection.find(
-        {
-            "batchId": batch_id,
-            "jobDescriptionId": ObjectId(job_description_id),
-            "preFilter.passed": True,
-        }
-    )
 
-    resumes = list(cursor)
+def _reseed_from_mongo(batch_id: str, job_description_id: str):
+    """
+    Rebuild the ordered set from persisted results
+    (e.g. Redis was flushed before the batch settled).
+    Resumes without a finalScore are scored from their feature record,
+    so the full resume text is never reloaded.
+    """
+
+    cursor = iter_ranking_candidates(batch_id, job_description_id)
+
+    scores = {}
+    for doc in cursor:
+        score = doc.get("finalScore")
+        if score is None:
+            score = score_from_features(doc["features"], doc["preFilter"]["similarityScore"])
+        scores[str(doc["_id"])] = score
+
+    if scores:
+        key = ranking_key(batch_id, job_description_id)
+        pipeline = redis_conn.pipeline()
+        pipeline.zadd(key, scores)
+        pipeline.expire(key, RANKING_KEY_TTL_SECONDS)
+        pipeline.execute()
+
+    return scores
 
-    if not resumes:
-        return
 
-    scored = []
+def _ordered_scores(key: str) -> list[tuple[str, float]]:
+    """
+    Sorted by score DESC (ties broken deterministically by member id)
+    """
+    return [
+        (member.decode() if isinstance(member, bytes) else member, score)
+        for member, score in redis_conn.zrevrange(key, 0, -1, withscores=True)
+    ]
 
-    for doc in resumes:
-        semantic = doc["preFilter"]["similarityScore"]
 
-        required_ratio = compute_skill_match_ratio(
-            doc.get("normalizedResumeText", ""),
-            required_skills
-        )
+def is_batch_settled(batch_id: str, job_description_id: str) -> bool:
+    """
+    A batch is settled once no resume is still pending / processing / retrying.
+    """
 
-        experience_ratio = compute_experience_match_ratio(
-            extracted_years=doc.get("extractedExperienceYears", 0.0),
-            required_years=min_experience_years,
-        )
+    pending = find_unsettled(batch_id, job_description_id)
 
-        preferred_ratio = compute_skill_match_ratio(
-            doc.get("normalizedResumeText", ""),
-            preferred_skills
-        )
+    return pending is None
 
-        final_score = compute_final_score(
-            semantic_similarity=semantic,
-            required_skill_match_ratio=required_ratio,
-            preferred_skill_match_ratio=preferred_ratio,
-            experience_match_ratio=experience_ratio,
-        )
 
-        scored.append((doc["_id"], final_score))
+def rank_resumes_in_batch(batch_id: str, job_description_id: str) -> int:
+    """
+    Phase 4.4 — Materialize ranks of all PASSED resumes in a batch.
+    Reads the pre-sorted set once and writes every rank in chunked bulk writes.
+    Safe to call repeatedly (on demand or when the batch settles).
+    """
 
-    # Sort by score DESC
-    scored.sort(key=lambda x: x[1], reverse=True)
+    key = ranking_key(batch_id, job_description_id)
+
+    scored = _ordered_scores(key)
+
+    if not scored and _reseed_from_mongo(batch_id, job_description_id):
+        scored = _ordered_scores(key)
+
+    if not scored:
+        return 0
+
+    return materialize_ranks(scored)
+
+
+def materialize_ranks(
+    scored: list[tuple[str, float]],
+    chunk_size: int = RANKING_WRITE_CHUNK_SIZE,
+) -> int:
+    """
+    Write finalScore / rank / rankingStatus for pre-sorted (id, score) pairs.
+    One unordered bulk_write per chunk: the server may apply the updates in
+    parallel and one bad document does not stop the rest of the chunk.
+    """
+
+    written = 0
+
+    for start in range(0, len(scored), chunk_size):
+        operations = [
+            UpdateOne(
+                {"_id": ObjectId(resume_id)},
+                {
+                    "$set": {
+                        "finalScore": score,
+                        "rank": rank,
+                        "rankingStatus": "completed",
+                    }
+                },
+            )
+            for rank, (resume_id, score) in enumerate(scored[start:start + chunk_size], start=start + 1)
+        ]
+
+        resume_processings_collection.bulk_write(operations, ordered=False)
+        written += len(operations)
+
+    return written
+
+
+def rank_batch_if_settled(batch_id: str, job_description_id: str) -> bool:
+    """
+    Called after a resume reaches a terminal status.
+    The last resume to settle materializes the batch ranking.
+    """
+
+    if not is_batch_settled(batch_id, job_description_id):
+        return False
+
+    rank_resumes_in_batch(batch_id, job_description_id)
+    return True
+
+
+def finalize_batch_ranking(batch_id: str, job_description_id: str) -> dict:
+    """
+    Standalone "finalize batch ranking" task, triggered once per batch by the
+    backend (see app/queues/ranking_worker.py). Materializes ranks whether or
+    not the batch has settled.
+
+    Returns: {"batchId", "jobDescriptionId", "ranked", "settled", "materializeMs"}
+    """
 
-    # Assign ranks
-    for rank, (resume_id, score) in enumerate(scored, start=1):
-        resume_processings_collection.update_one(
-            {"_id": resume_id},
-            {
-                "$set": {
-                    "finalScore": score,
-                    "rank": rank,
-                    "rankingStatus": "completed",
-                }
-            }
-        )
+    started = time.perf_counter()
+    ranked = rank_resumes_in_batch(batch_id, job_description_id)
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
-    
+    return {
+        "batchId": batch_id,
+        "jobDescriptionId": job_description_id,
+        "ranked": ranked,
+        "settled": is_batch_settled(batch_id, job_description_id),
+        "materializeMs": round(elapsed_ms, 2),
+    }
@@ -0,0 +1,96 @@
+"""
+Local embedding sidecar.
+
+Owns ONE embedding model per node and batches requests coming from every
+batch worker process through the shared EmbeddingBatcher.
+
+    GET  /health  → {"status": "ok", "model": "<model name>"}
+    POST /embed   {"texts": [...]} → {"model": "<model name>", "embeddings": [[...], ...]}
+
+Workers talk to it through RemoteEmbeddingProvider (EMBEDDING_PROVIDER=remote).
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.embeddings.batching import EmbeddingBatcher
+from app.embeddings.factory import get_embedding_provider
+from app.utils.logger import logger
+from app.utils.settings import (
+    EMBEDDING_SERVER_HOST,
+    EMBEDDING_SERVER_PORT,
+    EMBEDDING_SERVER_PROVIDER,
+    EMBED_BATCH_MAX_SIZE,
+    EMBED_BATCH_MAX_WAIT_MS,
+)
+
+
+class EmbeddingRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive so every worker reuses one connection
+    protocol_version = "HTTP/1.1"
+
+    batcher: EmbeddingBatcher = None
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "Not found"})
+
+        self._send_json(200, {"status": "ok", "model": self.batcher.model_name})
+
+    def do_POST(self):
+        if self.path != "/embed":
+            return self._send_json(404, {"error": "Not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length)).get("texts")
+
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError("'texts' must be a list of strings")
+
+            embeddings = self.batcher.embed_many(texts)
+
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+
+        except Exception as e:
+            logger.exception("❌ Embedding request failed")
+            return self._send_json(500, {"error": str(e)})
+
+        self._send_json(200, {"model": self.batcher.model_name, "embeddings": embeddings})
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"embedding-server {self.address_string()} {format % args}")
+
+
+def create_server(host: str = EMBEDDING_SERVER_HOST, port: int = EMBEDDING_SERVER_PORT) -> ThreadingHTTPServer:
+    # Model is loaded ONCE here, before accepting requests
+    EmbeddingRequestHandler.batcher = EmbeddingBatcher(
+        get_embedding_provider(EMBEDDING_SERVER_PROVIDER),
+        max_batch_size=EMBED_BATCH_MAX_SIZE,
+        max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+    )
+
+    server = ThreadingHTTPServer((host, port), EmbeddingRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    server = create_server()
+    logger.info(
+        f"🧮 Embedding server started — {EMBEDDING_SERVER_HOST}:{EMBEDDING_SERVER_PORT} "
+        f"| provider {EMBEDDING_SERVER_PROVIDER}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -1,7 +1,48 @@
+import threading
+
+from app.embeddings.batching import EmbeddingBatcher
 from app.embeddings.factory import get_embedding_provider
+from app.utils.settings import (
+    EMBEDDING_PROVIDER,
+    EMBED_BATCHING_ENABLED,
+    EMBED_BATCH_MAX_SIZE,
+    EMBED_BATCH_MAX_WAIT_MS,
+    EMBED_BATCH_RESULT_TIMEOUT_SECONDS,
+)
+
+# One executor per provider per process, shared by every pipeline stage
+_batchers: dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(provider_name: str = EMBEDDING_PROVIDER) -> EmbeddingBatcher:
+    with _batchers_lock:
+        if provider_name not in _batchers:
+            _batchers[provider_name] = EmbeddingBatcher(
+                get_embedding_provider(provider_name),
+                max_batch_size=EMBED_BATCH_MAX_SIZE,
+                max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+                result_timeout=EMBED_BATCH_RESULT_TIMEOUT_SECONDS,
+            )
+        return _batchers[provider_name]
+
+
+def generate_embedding(text: str, provider_name: str = EMBEDDING_PROVIDER):
+    if not EMBED_BATCHING_ENABLED:
+        provider = get_embedding_provider(provider_name)
+        return provider.embed(text), provider.model_name
+
+    batcher = get_batcher(provider_name)
+    return batcher.embed(text), batcher.model_name
+
 
+def generate_embeddings(texts: list[str], provider_name: str = EMBEDDING_PROVIDER):
+    """
+    Embeds several texts in one go (results in input order).
+    """
+    if not EMBED_BATCHING_ENABLED:
+        provider = get_embedding_provider(provider_name)
+        return provider.embed_many(texts), provider.model_name
 
-def generate_embedding(text: str, provider_name: str = "minilm"):
-    provider = get_embedding_provider(provider_name)
-    embedding = provider.embed(text)
-    return embedding, provider.model_name
+    batcher = get_batcher(provider_name)
+    return batcher.embed_many(texts), batcher.model_name
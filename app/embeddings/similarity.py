@@ -1,12 +1,67 @@
-import math
+import numpy as np
+
+from app.utils.settings import EMBEDDING_STORAGE_FORMAT
+
+# Models whose provider returns L2-normalized vectors (MiniLM: normalize_embeddings=True)
+NORMALIZED_MODELS = frozenset({"sentence-transformers/all-MiniLM-L6-v2"})
+
+
+def as_vector(vec) -> np.ndarray:
+    return np.asarray(vec, dtype=np.float32)
+
+
+def as_matrix(vectors) -> np.ndarray:
+    """(N×d) float32 matrix from a list of vectors / an existing array."""
+    return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
 
 
 def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
-    dot = sum(a * b for a, b in zip(vec1, vec2))
-    norm1 = math.sqrt(sum(a * a for a in vec1))
-    norm2 = math.sqrt(sum(b * b for b in vec2))
+    a = as_vector(vec1)
+    b = as_vector(vec2)
 
-    if norm1 == 0 or norm2 == 0:
+    norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if norm == 0:
         return 0.0
 
-    return dot / (norm1 * norm2)
+    return float(np.dot(a, b)) / norm
+
+
+def normalized_similarity(vec1: list[float], vec2: list[float]) -> float:
+    """
+    Fast path for L2-normalized vectors (MiniLM uses normalize_embeddings=True):
+    cosine similarity is just the dot product.
+    """
+    return float(np.dot(as_vector(vec1), as_vector(vec2)))
+
+
+def is_normalized_model(model_name: str) -> bool:
+    """
+    True when both vectors of a pair are unit length, so the dot product IS
+    the cosine. int8 storage is excluded: reused quantized vectors are not.
+    """
+    return model_name in NORMALIZED_MODELS and EMBEDDING_STORAGE_FORMAT != "int8"
+
+
+def similarity(vec1: list[float], vec2: list[float], model_name: str) -> float:
+    """Cosine similarity, via the plain dot product when the model allows it."""
+    if is_normalized_model(model_name):
+        return normalized_similarity(vec1, vec2)
+
+    return cosine_similarity(vec1, vec2)
+
+
+def similarity_matrix(job_vector, resume_vectors, normalized: bool = True) -> np.ndarray:
+    """
+    Scores ONE job vector against N resume vectors in a single call.
+    Returns a float32 array of N similarities (resume order preserved).
+    """
+    matrix = as_matrix(resume_vectors)
+    job = as_vector(job_vector)
+
+    scores = matrix @ job
+
+    if normalized:
+        return scores
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(job)
+    return np.divide(scores, norms, out=np.zeros_like(scores), where=norms != 0)
@@ -1,14 +1,16 @@
+from app.embeddings.skill_matcher import SkillMatchResult, match_skills
+
+
 def compute_skill_match_ratio(
     normalized_resume_text: str,
-    skills: list[str]
+    skills: list[str],
+    skill_matches: SkillMatchResult | None = None,
 ) -> float:
     if not skills:
         return 1.0
 
-    matched = [
-        skill
-        for skill in skills
-        if skill.lower() in normalized_resume_text
-    ]
+    # Reuse the job's single scan when available
+    if skill_matches is None:
+        skill_matches = match_skills(normalized_resume_text, skills)
 
-    return len(matched) / len(skills)
+    return skill_matches.ratio(skills)
@@ -0,0 +1,171 @@
+import re
+from collections import deque
+
+from app.services.normalize import normalize_text
+
+
+class SkillMatchResult:
+    """
+    Skills of ONE job found in ONE resume.
+    Shared by prefilter, skill ratios and the skills explanation.
+    """
+
+    def __init__(self, required_skills: list[str], preferred_skills: list[str], matched: set[str]):
+        self.required_skills = list(required_skills)
+        self.preferred_skills = list(preferred_skills)
+        self.matched = matched
+
+    @property
+    def matched_required(self) -> list[str]:
+        return [skill for skill in self.required_skills if skill in self.matched]
+
+    @property
+    def missing_required(self) -> list[str]:
+        return [skill for skill in self.required_skills if skill not in self.matched]
+
+    @property
+    def matched_preferred(self) -> list[str]:
+        return [skill for skill in self.preferred_skills if skill in self.matched]
+
+    def ratio(self, skills: list[str]) -> float:
+        if not skills:
+            return 1.0
+        return sum(1 for skill in skills if skill in self.matched) / len(skills)
+
+    @property
+    def required_ratio(self) -> float:
+        return self.ratio(self.required_skills)
+
+    @property
+    def preferred_ratio(self) -> float:
+        return self.ratio(self.preferred_skills)
+
+
+def _is_ambiguous(skill: str, tokens: tuple[str, ...]) -> bool:
+    """
+    True when dropping symbols left a lone 1-character token ("C++" / "C#" → "c").
+    Plain one-letter skills ("C", "R") keep their meaning and are still matched.
+    """
+    return len(tokens) == 1 and len(tokens[0]) == 1 and bool(re.search(r"[^a-z0-9\s]", skill.lower()))
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher compiled ONCE per job.
+
+    Skills are normalized exactly like resume text (normalize_text) and matched
+    as whole token sequences with an Aho-Corasick automaton over tokens, so a
+    resume is scanned once for all skills and "java" never matches "javascript".
+
+    Normalization drops symbols, so "C++", "C#" (and a stray "c") all become
+    the token "c". Such skills are NOT compiled: they cannot be told apart in
+    normalized text and are reported as unmatched (see `unmatchable`).
+    """
+
+    def __init__(self, required_skills: list[str] | None = None, preferred_skills: list[str] | None = None):
+        self.required_skills = list(required_skills or [])
+        self.preferred_skills = list(preferred_skills or [])
+
+        # token pattern → original skill strings ("Node.js" and "node js" share one pattern)
+        patterns: dict[tuple[str, ...], list[str]] = {}
+        self.unmatchable: list[str] = []
+        for skill in dict.fromkeys(self.required_skills + self.preferred_skills):
+            tokens = tuple(normalize_text(skill).split())
+            if _is_ambiguous(skill, tokens):
+                self.unmatchable.append(skill)
+                continue
+            if tokens:
+                patterns.setdefault(tokens, []).append(skill)
+
+        self._skills_by_pattern = list(patterns.values())
+        self._compile(list(patterns))
+
+    def _compile(self, patterns: list[tuple[str, ...]]):
+        goto: list[dict[str, int]] = [{}]
+        output: list[list[int]] = [[]]
+
+        for pattern_id, tokens in enumerate(patterns):
+            node = 0
+            for token in tokens:
+                nxt = goto[node].get(token)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][token] = nxt
+                    goto.append({})
+                    output.append([])
+                node = nxt
+            output[node].append(pattern_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+
+        # BFS: failure link = longest proper suffix that is also a trie path
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+
+                fallback = goto[state].get(token, 0)
+                fail[child] = fallback if fallback != child else 0
+                output[child] = output[child] + output[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def advance(self, node: int, token: str) -> int:
+        """One automaton step; lets other single-pass scanners share the walk."""
+        if node == 0:
+            # Fast path: most tokens start no skill at all
+            return self._goto[0].get(token, 0)
+
+        goto, fail = self._goto, self._fail
+        while node and token not in goto[node]:
+            node = fail[node]
+        return goto[node].get(token, 0)
+
+    def outputs(self, node: int) -> list[int]:
+        return self._output[node]
+
+    def result(self, found: set[int]) -> SkillMatchResult:
+        matched = {
+            skill
+            for pattern_id in found
+            for skill in self._skills_by_pattern[pattern_id]
+        }
+
+        return SkillMatchResult(self.required_skills, self.preferred_skills, matched)
+
+    def scan(self, normalized_resume_text: str) -> SkillMatchResult:
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+
+        found: set[int] = set()
+        node = 0
+
+        for token in normalized_resume_text.split():
+            # Fast path: most tokens start no skill at all
+            if node == 0:
+                node = root.get(token, 0)
+            else:
+                while node and token not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(token, 0)
+
+            if output[node]:
+                found.update(output[node])
+
+        return self.result(found)
+
+
+def match_skills(
+    normalized_resume_text: str,
+    required_skills: list[str] | None = None,
+    preferred_skills: list[str] | None = None,
+) -> SkillMatchResult:
+    """One-off helper; hot paths should reuse a compiled SkillMatcher."""
+    return SkillMatcher(required_skills, preferred_skills).scan(normalized_resume_text)
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+from app.embeddings.codec import decode_embedding, encode_embedding
+from app.utils.mongo import job_embeddings_collection, resume_embeddings_collection
+from app.utils.settings import EMBEDDING_STORAGE_FORMAT
+
+
+def job_embedding_ref(job_description_id: str, job_hash: str, embedding_model: str) -> str:
+    return f"{job_description_id}:{job_hash}:{embedding_model}"
+
+
+def save_job_embedding(
+    job_description_id: str,
+    job_hash: str,
+    embedding_model: str,
+    embedding,
+    storage_format: str = EMBEDDING_STORAGE_FORMAT,
+) -> str:
+    """
+    Stores ONE job embedding per (job, content version, model).
+    ResumeProcessings reference it through `jobEmbeddingRef` instead of
+    carrying their own copy. Idempotent.
+    """
+    ref = job_embedding_ref(job_description_id, job_hash, embedding_model)
+
+    job_embeddings_collection.update_one(
+        {"_id": ref},
+        {
+            "$setOnInsert": {
+                "jobDescriptionId": job_description_id,
+                "jobHash": job_hash,
+                "embeddingModel": embedding_model,
+                "embedding": encode_embedding(embedding, storage_format),
+                "embeddingFormat": storage_format,
+                "createdAt": datetime.now(timezone.utc),
+            }
+        },
+        upsert=True,
+    )
+
+    return ref
+
+
+def load_job_embedding(ref: str):
+    doc = job_embeddings_collection.find_one({"_id": ref}, {"embedding": 1})
+    return decode_embedding(doc["embedding"]) if doc else None
+
+
+def resume_embedding_id(resume_hash: str, embedding_model: str) -> str:
+    return f"{resume_hash}:{embedding_model}"
+
+
+def load_resume_embedding(resume_hash: str, embedding_model: str) -> list[float] | None:
+    """
+    Embedding of an identical resume text computed for ANY job.
+    The resume embedding only depends on the resume text and the model.
+    """
+    doc = resume_embeddings_collection.find_one(
+        {"_id": resume_embedding_id(resume_hash, embedding_model)},
+        {"embedding": 1},
+    )
+    return decode_embedding(doc["embedding"]).tolist() if doc else None
+
+
+def save_resume_embedding(resume_hash: str, embedding_model: str, embedding) -> str:
+    """
+    Stored as float32 binary regardless of EMBEDDING_STORAGE_FORMAT so reuse is lossless.
+    Idempotent.
+    """
+    ref = resume_embedding_id(resume_hash, embedding_model)
+
+    resume_embeddings_collection.update_one(
+        {"_id": ref},
+        {
+            "$setOnInsert": {
+                "resumeHash": resume_hash,
+                "embeddingModel": embedding_model,
+                "embedding": encode_embedding(embedding, "float32"),
+                "createdAt": datetime.now(timezone.utc),
+            }
+        },
+        upsert=True,
+    )
+
+    return ref
@@ -10,24 +10,30 @@ def truncate_text(text: str, max_words: int = MAX_WORDS) -> str:
     return " ".join(words[:max_words])
 
 
-def build_embedding_texts(normalized_resume_text: str, normalized_job_text: str):
-    """
-    Validates and produce input text for embeddings
-    """
-
+def build_resume_embedding_text(normalized_resume_text: str) -> str:
     resume_text = truncate_text(normalized_resume_text)
 
-    resume_embedding_text = (
+    return (
         "RESUME PROFILE\n"
         "---------------\n"
         f"{resume_text}"
     )
 
 
-    job_embedding_text = (
+def build_job_embedding_text(normalized_job_text: str) -> str:
+    return (
         "JOB REQUIREMENTS\n"
         "----------------\n"
         f"{normalized_job_text}"
     )
 
+
+def build_embedding_texts(normalized_resume_text: str, normalized_job_text: str):
+    """
+    Validates and produce input text for embeddings
+    """
+
+    resume_embedding_text = build_resume_embedding_text(normalized_resume_text)
+    job_embedding_text = build_job_embedding_text(normalized_job_text)
+
     return resume_embedding_text, job_embedding_text
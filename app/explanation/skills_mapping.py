@@ -1,34 +1,30 @@
 from typing import List, Dict
-import re
-
-
-def normalize_skill(skill: str) -> str:
-    return re.sub(r"[^a-z0-9+.#]", "", skill.lower().strip())
+from app.embeddings.skill_matcher import SkillMatchResult, match_skills
 
 
 def build_skill_explanation(
     required_skills: List[str],
     preferred_skills: List[str],
     normalized_resume_text: str,
+    skill_matches: SkillMatchResult | None = None,
+    features: Dict | None = None,
 ) -> Dict:
-    matched_required = []
-    missing_required = []
-
-    for skill in required_skills:
-        if normalize_skill(skill) in normalized_resume_text:
-            matched_required.append(skill)
-        else:
-            missing_required.append(skill)
+    # Stored feature record → no resume text needed
+    if features is not None:
+        return {
+            "required": required_skills,
+            "matched": features["requiredSkillHits"],
+            "missing": features["missingRequiredSkills"],
+            "optionalMatched": features["preferredSkillHits"],
+        }
 
-    matched_preferred = [
-        skill
-        for skill in preferred_skills
-        if normalize_skill(skill) in normalized_resume_text
-    ]
+    # Same whole-word matching as prefilter / ranking → explanations never disagree
+    if skill_matches is None:
+        skill_matches = match_skills(normalized_resume_text, required_skills, preferred_skills)
 
     return {
         "required": required_skills,
-        "matched": matched_required,
-        "missing": missing_required,
-        "optionalMatched": matched_preferred,
+        "matched": skill_matches.matched_required,
+        "missing": skill_matches.missing_required,
+        "optionalMatched": skill_matches.matched_preferred,
     }
@@ -3,135 +3,181 @@ import os
 from bson import ObjectId
 from datetime import datetime, timezone
 from rq import Worker, Queue, job
-from redis import Redis
 import time
 from bson import ObjectId
 from app.utils.settings import ANALYSIS_MAX_RETRIES, ANALYSIS_BASE_DELAY
 
 from app.utils.mongo import resume_processings_collection, job_descriptions_collection
-from app.analysis.prompt import build_prompt
+from app.services.resume_processings import find_for_analysis
+from app.services.dedup import propagate_analysis
+from app.analysis.cache import analysis_key, get_analysis_cache
+from app.analysis.budget import assemble_prompt
+from app.embeddings.skill_matcher import SkillMatcher
 from app.analysis.runner import run_llm
 from app.analysis.validator import validate_analysis_output
 from app.utils.logger import logger
+from app.utils.redis_client import redis_conn
+from app.utils.warmup import warm_up
+from app.queues.retry import schedule_retry
 from dotenv import load_dotenv
 
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
-ANALYSIS_QUEUE = "analysis-processing"
+ANALYSIS_QUEUE = os.getenv("ANALYSIS_QUEUE_NAME", "analysis-processing")
 ANALYSIS_RETRY_SET = os.getenv("ANALYSIS_RETRY_SET", 'rq:analysis-retry')
-redis_conn = Redis.from_url("redis://localhost:6379")
 queue = Queue(ANALYSIS_QUEUE, connection=redis_conn)
 
 
-class JSONWorker(Worker):
+def run_analysis_job(job_id: str, payload: dict):
+    """Executes a single resume-analysis job with retry + safe callbacks."""
 
-    def execute_job(self, job: job, queue):
-        """Executes a single resume-analysis job with retry + safe callbacks."""
+    logger.info("===============================================================")
+    resume_processing_id = payload["resumeProcessingId"]
 
-        logger.inf("===============================================================")
-        payload = json.loads(job.data)
-        resume_processing_id = payload["resumeProcessingId"]
+    rp = find_for_analysis(resume_processing_id)
+    if not rp:
+        logger.info(f"resume processing not found for {resume_processing_id}")
+        return
+    logger.info(f"Analysis started for Resume: {rp.get('externalResumeId')}")
 
-        rp = resume_processings_collection.find_one({"_id": ObjectId(resume_processing_id)})
-        logger.info(f"Analysis started for Resume: {rp.get("externalResumeId")}")
-        if not rp:
-            logger.info(f"resume processing not found for {resume_processing_id}")
-            return
+    # Idempotency guard
+    if rp.get("analysisStatus") == "completed":
+        logger.info("Analysis is already completed!")
+        return
 
-        # Idempotency guard
-        if rp.get("analysisStatus") == "completed":
-            logger.info("Analysis is already completed!")
-            return
+    # Mark processing
+    resume_processings_collection.update_one(
+        {"_id": ObjectId(resume_processing_id)},
+        {"$set": {"analysisStatus": "processing"}}
+    )
+    logger.info("Analysis status is marked as processing.")
 
-        # Mark processing
-        resume_processings_collection.update_one(
-            {"_id": ObjectId(resume_processing_id)},
-            {"$set": {"analysisStatus": "processing"}}
-        )
-        logger.info("Analysis status is marked as processing.")
+    try:
+        # Same resume text + job version + prompt + model → reuse the analysis
+        cache = get_analysis_cache()
+        cache_key = None
+        if rp.get("resumeHash") and rp.get("jobHash"):
+            cache_key = analysis_key(rp["resumeHash"], rp["jobHash"])
+
+        analysis_output = cache.get(cache_key) if cache_key else None
+        prompt_tokens = None
 
-        try:
-            job_doc = job_descriptions_collection.find_one({"_id": rp["jobDescriptionId"]})
+        if analysis_output is not None:
+            logger.info("Analysis cache hit, LLM call skipped.")
 
-            prompt = build_prompt(
+        else:
+            job_doc = job_descriptions_collection.find_one(
+                {"_id": rp["jobDescriptionId"]},
+                {"description": 1, "required_skills": 1, "preferred_skills": 1},
+            )
+
+            assembled = assemble_prompt(
                 resume_text=rp["normalizedResumeText"],
                 job_text=job_doc["description"],
-                explanation=rp.get("explanation", {})
+                explanation=rp.get("explanation", {}),
+                skill_matcher=SkillMatcher(job_doc.get("required_skills"), job_doc.get("preferred_skills")),
+            )
+            prompt_tokens = assembled["tokens"]
+            logger.info(
+                f"Prompt assembled: ~{prompt_tokens['total']} tokens "
+                f"(resume {prompt_tokens['resume']}, job {prompt_tokens['job']}, "
+                f"compacted={assembled['resumeCompacted']})"
             )
 
             logger.info("Calling LLM for analysis...")
-            llm_response = run_llm(prompt)
+            llm_response = run_llm(assembled["prompt"])
 
             analysis_output = json.loads(llm_response)
 
             logger.info("Validating response...")
             validate_analysis_output(analysis_output)
 
-            logger.info("Writing updates to database...")
+            if cache_key:
+                cache.put(cache_key, analysis_output)
 
-            resume_processings_collection.update_one(
-                {"_id": ObjectId(resume_processing_id)},
-                {
-                    "$set": {
-                        "analysis": analysis_output,
-                        "analysisStatus": "completed",
-                        "analysisCompletedAt": datetime.now(timezone.utc),
-                    }
-                }
-            )
-            logger.info("Analysis completed!")
-
-        except Exception as e:
-            logger.exception("❌ Phase 5B analysis job failed")
-
-            job_redis_key = f"rq:job:{job.id}"
-
-            # ------------------------------
-            # STEP 1 — increment attempts
-            # ------------------------------
-            attempts = redis_conn.hincrby(job_redis_key, "attempts", 1)
-
-            if attempts <= ANALYSIS_MAX_RETRIES:
-                delay = ANALYSIS_BASE_DELAY * (2 ** (attempts - 1))
-                next_time = int(time.time()) + delay
-
-                # Schedule retry
-                redis_conn.zadd(ANALYSIS_RETRY_SET, {job.id: next_time})
-
-                logger.warning(
-                    f"↻ Phase 5B retry scheduled "
-                    f"(attempt {attempts}/{ANALYSIS_MAX_RETRIES}) "
-                    f"after {delay}s | resumeProcessing={resume_processing_id}"
-                )
-
-                # IMPORTANT:
-                # Do NOT mark analysis as failed yet
-                return True
-
-            # ------------------------------
-            # STEP 2 — permanent failure
-            # ------------------------------
-            resume_processings_collection.update_one(
-                {"_id": ObjectId(resume_processing_id)},
-                {
-                    "$set": {
-                        "analysisStatus": "failed",
-                        "analysisError": str(e),
-                    }
+        logger.info("Writing updates to database...")
+
+        resume_processings_collection.update_one(
+            {"_id": ObjectId(resume_processing_id)},
+            {
+                "$set": {
+                    "analysis": analysis_output,
+                    "analysisStatus": "completed",
+                    "analysisCompletedAt": datetime.now(timezone.utc),
+                    # Estimated prompt tokens (None when served from the analysis cache)
+                    "analysisPromptTokens": prompt_tokens,
                 }
-            )
+            }
+        )
+        logger.info("Analysis completed!")
+
+        # Duplicates created before this analysis existed get it now
+        if cache_key:
+            backfilled = propagate_analysis(rp["resumeHash"], rp["jobHash"], analysis_output)
+            if backfilled:
+                logger.info(f"Analysis copied to {backfilled} duplicate(s).")
+
+    except Exception as e:
+        logger.exception("❌ Phase 5B analysis job failed")
 
-            redis_conn.zrem(ANALYSIS_RETRY_SET, job.id)
-            redis_conn.delete(job_redis_key)
+        job_redis_key = f"rq:job:{job_id}"
 
-            logger.error(
-                f"✖ Phase 5B analysis permanently failed "
-                f"resumeProcessing={resume_processing_id}"
+        # ------------------------------
+        # STEP 1 — increment attempts
+        # ------------------------------
+        attempts = redis_conn.hincrby(job_redis_key, "attempts", 1)
+
+        if attempts <= ANALYSIS_MAX_RETRIES:
+            delay = ANALYSIS_BASE_DELAY * (2 ** (attempts - 1))
+            next_time = int(time.time()) + delay
+
+            # Schedule retry
+            schedule_retry(redis_conn, ANALYSIS_RETRY_SET, job_id, next_time)
+
+            logger.warning(
+                f"↻ Phase 5B retry scheduled "
+                f"(attempt {attempts}/{ANALYSIS_MAX_RETRIES}) "
+                f"after {delay}s | resumeProcessing={resume_processing_id}"
             )
 
+            # IMPORTANT:
+            # Do NOT mark analysis as failed yet
             return True
 
+        # ------------------------------
+        # STEP 2 — permanent failure
+        # ------------------------------
+        resume_processings_collection.update_one(
+            {"_id": ObjectId(resume_processing_id)},
+            {
+                "$set": {
+                    "analysisStatus": "failed",
+                    "analysisError": str(e),
+                }
+            }
+        )
+
+        redis_conn.zrem(ANALYSIS_RETRY_SET, job_id)
+        redis_conn.delete(job_redis_key)
+
+        logger.error(
+            f"✖ Phase 5B analysis permanently failed "
+            f"resumeProcessing={resume_processing_id}"
+        )
+
+        return True
+
+
+class JSONWorker(Worker):
+
+    def execute_job(self, job: job, queue):
+        # Load payload
+        payload = json.loads(job.data)
+        return run_analysis_job(job.id, payload)
+
+
 if __name__ == "__main__":
     logger.info(f"👷 Analysis Worker started — queue: {ANALYSIS_QUEUE}")
+    warm_up(llm=True, connections=True)
     worker = JSONWorker([queue], connection=redis_conn)
     worker.work()
\ No newline at end of file
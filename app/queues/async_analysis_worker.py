@@ -0,0 +1,46 @@
+import asyncio
+import sys
+
+from app.queues.analysis_worker import ANALYSIS_QUEUE, run_analysis_job
+from app.queues.async_batch_worker import AsyncBatchWorker
+from app.utils.log_context import set_log_context
+from app.utils.logger import logger
+from app.utils.settings import ANALYSIS_MAX_IN_FLIGHT
+from app.utils.warmup import warm_up
+
+
+class AsyncAnalysisWorker(AsyncBatchWorker):
+    """
+    Analysis worker that keeps up to `max_in_flight` LLM calls in flight per
+    process. Same queue loop as AsyncBatchWorker; each job runs the SAME
+    run_analysis_job as the RQ worker on its own I/O thread, so the blocking
+    LLM call never stalls the loop. Calls are paced by the shared Redis rate
+    limiter (app/analysis/rate_limit.py), not by the number of processes.
+    """
+
+    payload_fields = ("resumeProcessingId",)
+
+    def __init__(
+        self,
+        queue_name: str = ANALYSIS_QUEUE,
+        max_in_flight: int = ANALYSIS_MAX_IN_FLIGHT,
+        burst: bool = False,
+    ):
+        # No lease: BATCH_LEASE_SET re-queues onto the batch queue
+        super().__init__(queue_name, max_in_flight, burst, io_threads=max_in_flight, lease_set=None)
+
+    async def _process(self, job_id: str):
+        payload = await self._load_payload(job_id)
+        if payload is None:
+            logger.warning(f"⚠ Job {job_id} has no data, skipped\n")
+            return
+
+        set_log_context(jobId=f"rq:job:{job_id}", resumeProcessingId=payload["resumeProcessingId"])
+
+        await self._run(self.io_executor, run_analysis_job, job_id, payload)
+
+
+if __name__ == "__main__":
+    logger.info(f"👷 Async Analysis Worker started — queue: {ANALYSIS_QUEUE} | in flight: {ANALYSIS_MAX_IN_FLIGHT}")
+    warm_up(llm=True, connections=True)
+    asyncio.run(AsyncAnalysisWorker(burst="--burst" in sys.argv).work())
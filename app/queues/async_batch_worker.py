@@ -0,0 +1,265 @@
+import asyncio
+import contextvars
+import functools
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis.asyncio as aioredis
+
+from app.queues.batch_worker import (
+    PAYLOAD_FIELDS,
+    QUEUE_NAME,
+    complete_job,
+    decode_payload,
+    fail_job,
+    mark_processing,
+    send_callback,
+)
+from app.queues.retry import LEASE_SCRIPT
+from app.services.job_context import get_job_context
+from app.services.resume_text import download_resume_text, extract_resume_text
+from app.services.tasks import check_duplicate, embed_resume, score_resume
+from app.services.write_buffer import ResumeProcessingWriter
+from app.utils.log_context import set_log_context
+from app.utils.logger import logger
+from app.utils.settings import (
+    REDIS_URL,
+    BATCH_LEASE_SET,
+    BATCH_LEASE_TIMEOUT_SECONDS,
+    PIPELINE_MAX_IN_FLIGHT,
+    PIPELINE_FETCH_CONCURRENCY,
+    PIPELINE_EXTRACT_CONCURRENCY,
+    PIPELINE_EMBED_CONCURRENCY,
+    PIPELINE_SCORE_CONCURRENCY,
+    PIPELINE_IO_THREADS,
+    PIPELINE_CPU_THREADS,
+)
+from app.utils.warmup import warm_up
+
+# Seconds a BLPOP waits before re-checking for shutdown
+POP_TIMEOUT_SECONDS = 1
+
+
+class AsyncBatchWorker:
+    """
+    Batch worker that keeps several resumes in flight per process.
+
+    Same queue, payloads, retries and Mongo fields as JSONWorker, and the
+    same stage functions as process_resume — only scheduled differently:
+    - Redis queue ops are native asyncio
+    - downloads, Mongo round trips and the embedding call run on a pooled
+      I/O executor; pdfminer and scoring on a small CPU executor
+    - each stage has its own concurrency limit (PIPELINE_*_CONCURRENCY)
+    - callbacks are fired in the background, never awaited by the job
+    """
+
+    # Fields a payload of this worker's queue must carry
+    payload_fields = PAYLOAD_FIELDS
+
+    def __init__(
+        self,
+        queue_name: str = QUEUE_NAME,
+        max_in_flight: int = PIPELINE_MAX_IN_FLIGHT,
+        burst: bool = False,
+        io_threads: int = PIPELINE_IO_THREADS,
+        lease_set: str | None = BATCH_LEASE_SET,
+    ):
+        self.queue_key = f"rq:queue:{queue_name}"
+        self.burst = burst
+        # Popped ids are leased here (None → plain pop); the scheduler re-queues
+        # the leases of a dead process onto this worker's queue
+        self.lease_set = lease_set
+
+        self.io_executor = ThreadPoolExecutor(io_threads, thread_name_prefix="pipeline-io")
+        self.cpu_executor = ThreadPoolExecutor(PIPELINE_CPU_THREADS, thread_name_prefix="pipeline-cpu")
+
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.limits = {
+            "fetch": asyncio.Semaphore(PIPELINE_FETCH_CONCURRENCY),
+            "extract": asyncio.Semaphore(PIPELINE_EXTRACT_CONCURRENCY),
+            "embed": asyncio.Semaphore(PIPELINE_EMBED_CONCURRENCY),
+            "score": asyncio.Semaphore(PIPELINE_SCORE_CONCURRENCY),
+        }
+
+        self.redis = None
+        self.jobs: set[asyncio.Task] = set()
+        self.background: set[asyncio.Task] = set()
+        self.stopping = False
+        self.processed = 0
+
+    # ------------------------------
+    # Executors
+    # ------------------------------
+    async def _run(self, executor, fn, *args):
+        # Executor threads do not inherit contextvars → keep the job's log context
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(context.run, fn, *args))
+
+    async def _stage(self, name: str, executor, fn, *args):
+        async with self.limits[name]:
+            return await self._run(executor, fn, *args)
+
+    def _fire(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.background.add(task)
+        task.add_done_callback(self.background.discard)
+
+    # ------------------------------
+    # Queue
+    # ------------------------------
+    async def _next_job_id(self) -> str | None:
+        """
+        Pops ONE job id and leases it (`lease_set`) in the same script:
+        if this process dies, the scheduler re-queues every in-flight job.
+        complete_job / fail_job release the lease.
+        """
+        first = ""
+        if not self.burst:
+            item = await self.redis.blpop(self.queue_key, timeout=POP_TIMEOUT_SECONDS)
+            if not item:
+                return None
+            first = item[1]
+
+        if self.lease_set is None:
+            job_id = first or await self.redis.lpop(self.queue_key)
+            return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+        deadline = int(time.time()) + BATCH_LEASE_TIMEOUT_SECONDS
+        ids = await self.lease_script(keys=[self.queue_key, self.lease_set], args=[1, deadline, first])
+        if not ids:
+            return None
+
+        job_id = ids[0]
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    async def _load_payload(self, job_id: str) -> dict | None:
+        raw = await self.redis.hget(f"rq:job:{job_id}", "data")
+        if raw is None:
+            return None
+
+        try:
+            return decode_payload(raw, self.payload_fields)
+        except ValueError as e:
+            # Kept in Redis for inspection; retrying cannot fix it
+            logger.error(f"❌ Job {job_id} has an unusable payload, skipped: {e}\n")
+            return None
+
+    # ------------------------------
+    # One resume
+    # ------------------------------
+    async def _process(self, job_id: str):
+        payload = await self._load_payload(job_id)
+        if payload is None:
+            logger.warning(f"⚠ Job {job_id} has no usable data, skipped\n")
+            if self.lease_set:
+                await self.redis.zrem(self.lease_set, job_id)
+            return
+
+        set_log_context(
+            jobId=f"rq:job:{job_id}",
+            batchId=payload["batchId"],
+            resumeProcessingId=payload["resumeProcessingId"],
+            externalResumeId=payload["externalResumeId"],
+        )
+
+        logger.info(f"🚀 Job started {job_id} | Resume {payload['externalResumeId']} | Batch {payload['batchId']}\n")
+
+        writer = ResumeProcessingWriter(payload["resumeProcessingId"])
+        await self._run(self.io_executor, mark_processing, payload, writer)
+
+        try:
+            download = await self._stage("fetch", self.io_executor, download_resume_text, payload["resumeUrl"])
+
+            if download["record"] is None:
+                resume_text = await self._stage("extract", self.cpu_executor, extract_resume_text, download)
+            else:
+                resume_text = download["record"]
+
+            job_context = await self._run(self.io_executor, get_job_context, payload["jobDescriptionId"])
+
+            result = await self._run(
+                self.io_executor, check_duplicate, payload, resume_text, job_context, writer
+            )
+
+            if result is None:
+                resume_embedding, model_name = await self._stage(
+                    "embed", self.io_executor, embed_resume, resume_text, job_context
+                )
+                await self._stage(
+                    "score", self.cpu_executor, score_resume,
+                    payload, resume_text, job_context, resume_embedding, model_name, writer,
+                )
+
+            await self._run(self.io_executor, complete_job, job_id, payload, writer)
+            self._fire(self._run(self.io_executor, send_callback, payload, "completed"))
+
+            logger.info("✅ Job completed successfully\n")
+
+        except Exception as err:
+            logger.exception("❌ Job failed")
+
+            status = await self._run(self.io_executor, fail_job, job_id, payload, writer, err)
+            if status == "failed":
+                self._fire(self._run(self.io_executor, send_callback, payload, "failed"))
+
+    def _job_done(self, task: asyncio.Task):
+        self.jobs.discard(task)
+        self.in_flight.release()
+        self.processed += 1
+
+        if not task.cancelled() and task.exception():
+            logger.error(f"❌ Unhandled job error: {task.exception()}\n")
+
+    # ------------------------------
+    # Main loop
+    # ------------------------------
+    def stop(self):
+        if not self.stopping:
+            logger.info("🛑 Stopping: no new jobs, waiting for in-flight resumes\n")
+        self.stopping = True
+
+    async def work(self) -> int:
+        self.redis = aioredis.from_url(REDIS_URL)
+        self.lease_script = self.redis.register_script(LEASE_SCRIPT)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        try:
+            while not self.stopping:
+                # Only pop what can start right away; the rest stays for other workers
+                await self.in_flight.acquire()
+
+                job_id = await self._next_job_id()
+                if job_id is None:
+                    self.in_flight.release()
+                    if self.burst:
+                        break
+                    continue
+
+                task = asyncio.create_task(self._process(job_id))
+                self.jobs.add(task)
+                task.add_done_callback(self._job_done)
+
+            await asyncio.gather(*self.jobs, return_exceptions=True)
+            await asyncio.gather(*self.background, return_exceptions=True)
+
+        finally:
+            await self.redis.aclose()
+            self.io_executor.shutdown(wait=True)
+            self.cpu_executor.shutdown(wait=True)
+
+        return self.processed
+
+
+if __name__ == "__main__":
+    logger.info(f"👷Async Batch Worker started — queue: {QUEUE_NAME} | in flight: {PIPELINE_MAX_IN_FLIGHT}\n")
+    warm_up(parsers=True, embeddings=True, connections=True)
+    asyncio.run(AsyncBatchWorker(burst="--burst" in sys.argv).work())
@@ -1,13 +1,19 @@
 import json
 import os
 import time
-import redis
+import zlib
 import requests
 from rq import Worker, Queue, job
 from app.services.tasks import process_resume
+from app.queues.retry import schedule_retry
+from app.embeddings.ranking import rank_batch_if_settled, discard_resume_score
+from app.services.write_buffer import ResumeProcessingWriter
 from app.utils.log_context import set_log_context
 from app.utils.logger import logger
 from app.utils.mongo import resume_processings_collection
+from app.utils.redis_client import redis_conn
+from app.utils.settings import BATCH_LEASE_SET
+from app.utils.warmup import warm_up
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
 
@@ -27,154 +33,234 @@ QUEUE_NAME = os.getenv("BATCH_QUEUE_NAME", "batch-processing")
 # ------------------------------
 # CONNECTIONS
 # ------------------------------
-redis_conn = redis.from_url(REDIS_URL)
 queue = Queue(QUEUE_NAME, connection=redis_conn)
 
 
-class JSONWorker(Worker):
-
-    def execute_job(self, job: job, queue):
-        """Executes a single resume-processing job with retry + safe callbacks."""
+def run_resume_job(job_id: str, payload: dict):
+    """Executes a single resume-processing job with retry + safe callbacks."""
+
+    resume_processing_id = payload["resumeProcessingId"]
+    batch_id = payload["batchId"]
+    external_resume_id = payload["externalResumeId"]
 
-        # Load payload
-        payload = json.loads(job.data)
+    job_redis_key = f"rq:job:{job_id}"
 
-        resume_processing_id = payload["resumeProcessingId"]
-        batch_id = payload["batchId"]
-        external_resume_id = payload["externalResumeId"]
+    set_log_context(
+        jobId=job_redis_key,
+        batchId=batch_id,
+        resumeProcessingId=resume_processing_id,
+        externalResumeId=external_resume_id
+    )
 
-        job_redis_key = f"rq:job:{job.id}"
+    logger.info(f"🚀 Job started{job_id} | Resume {external_resume_id} | Batch {batch_id}\n")
+    logger.info("\n\n=========================================================")
+
+    # All pipeline fields are staged here and written with the terminal status
+    writer = ResumeProcessingWriter(resume_processing_id)
+
+    # ------------------------------
+    # STEP 1 — Update resume status to PROCESSING in Mongo
+    # ------------------------------
+    mark_processing(payload, writer)
+
+    try:
+        # ------------------------------
+        # STEP 2 — execute business logic
+        # ------------------------------
+        process_resume(payload, writer=writer)
+
+        # ------------------------------
+        # STEP 3/4 — mark COMPLETED + final callback
+        # ------------------------------
+        complete_job(job_id, payload, writer)
+        send_callback(payload, status="completed")
+
+        logger.info("✅ Job completed successfully\n")
+        return True
+
+    except Exception as err:
+        logger.exception("❌ Job failed")
+
+        # ------------------------------
+        # STEP 5/6 — retry or fail
+        # ------------------------------
+        if fail_job(job_id, payload, writer, err) == "failed":
+            send_callback(payload, status="failed")
+
+        return True
+
+
+def mark_processing(payload: dict, writer: ResumeProcessingWriter):
+    try:
+        writer.set({"status": "processing"})
+        writer.flush()
+
+        logger.info(f"⚙️ Mongo update: resume {payload['externalResumeId']} → processing\n\n")
+
+    except Exception as e:
+        print(f"❌ Failed to set processing state: {e}")
+
+
+def complete_job(job_id: str, payload: dict, writer: ResumeProcessingWriter):
+    """
+    Single write with all staged results + terminal status, then ranking / cleanup.
+    """
+    writer.set({"status": "completed"})
+    writer.flush()
+
+    settle_ranking(payload["batchId"], payload["jobDescriptionId"])
+
+    # Cleanup redis job (+ its lease, async / bulk workers)
+    pipeline = redis_conn.pipeline()
+    pipeline.delete(f"rq:job:{job_id}")
+    pipeline.zrem(BATCH_LEASE_SET, job_id)
+    pipeline.execute()
+
+
+def fail_job(
+    job_id: str,
+    payload: dict,
+    writer: ResumeProcessingWriter,
+    err: Exception,
+    retry_set: str = RETRY_SET,
+    attempts_field: str = "attempts",
+) -> str:
+    """
+    Schedules a retry (exponential backoff) or marks the resume permanently failed.
+    `retry_set` decides which queue the retry re-enters (see scheduler.py);
+    failures are counted in the `attempts_field` of the rq:job hash, so each
+    pipeline stage gets its own MAX_RETRIES.
+    Returns "retry" or "failed".
+    """
+    resume_processing_id = payload["resumeProcessingId"]
+    batch_id = payload["batchId"]
+    job_description_id = payload["jobDescriptionId"]
+    external_resume_id = payload["externalResumeId"]
+    job_redis_key = f"rq:job:{job_id}"
+
+    # Un-flushed stage results are dropped → the retry recomputes them
+    writer.discard()
+
+    attempts = redis_conn.hincrby(job_redis_key, attempts_field, 1)
+
+    if attempts <= MAX_RETRIES:
+        delay = BASE_DELAY * (2 ** (attempts - 1))
+        next_time = int(time.time()) + delay
+
+        schedule_retry(redis_conn, retry_set, job_id, next_time)
+        redis_conn.zrem(BATCH_LEASE_SET, job_id)
+
+        logger.warning(
+            f"↻ Retry scheduled (attempt {attempts}/{MAX_RETRIES}) "
+            f"after {delay}s"
+            f"Resume: {external_resume_id}"
+        )
 
-        set_log_context(
-            jobId=job_redis_key,
-            batchId=batch_id,
-            resumeProcessingId=resume_processing_id,
-            externalResumeId=external_resume_id
+        # DO NOT mark failed
+        return "retry"
+
+    # ------------------------------
+    # permanent FAILURE
+    # ------------------------------
+    resume_processings_collection.update_one(
+        {"_id": ObjectId(resume_processing_id)},
+        {
+            "$set": {
+                "status": "failed",
+                "error": str(err)
+            }
+        }
+    )
+
+    discard_resume_score(batch_id, job_description_id, resume_processing_id)
+    settle_ranking(batch_id, job_description_id)
+
+    redis_conn.zrem(retry_set, job_id)
+    redis_conn.zrem(BATCH_LEASE_SET, job_id)
+    redis_conn.delete(job_redis_key)
+
+    logger.error("✖ Job permanently failed")
+    return "failed"
+
+
+def settle_ranking(batch_id, job_description_id):
+    """
+    Materialize batch ranks once the last resume reaches a terminal status.
+    """
+    try:
+        if rank_batch_if_settled(batch_id, job_description_id):
+            logger.info("🏁 Batch settled, ranking materialized\n")
+
+    except Exception as e:
+        # Ranking can be re-materialized on demand, never fail the resume for it
+        logger.warning(f"⚠ Ranking materialization failed: {e}\n")
+
+
+def send_callback(payload: dict, status: str):
+    """
+    Final callback only (success or permanent failure).
+    """
+    try:
+        requests.post(
+            CALLBACK_URL,
+            json={
+                "batchId": payload["batchId"],
+                "resumeProcessingId": payload["resumeProcessingId"],
+                "status": status,
+                "externalResumeId": payload["externalResumeId"]
+            },
+            timeout=5,
         )
+        logger.info("📩 Callback sent\n")
 
-        logger.info(f"🚀 Job started{job.id} | Resume {external_resume_id} | Batch {batch_id}\n")
-        logger.info("\n\n=========================================================")
+    except Exception as e:
+        # Callback failure should NOT retry processing
+        logger.warning(f"⚠ Callback failed: {e}\n")
 
-        try:
-            # ------------------------------
-            # STEP 1 — Update resume status to PROCESSING in Mongo
-            # ------------------------------
-            resume_processings_collection.update_one(
-                {"_id": ObjectId(resume_processing_id)},
-                {"$set": {"status": "processing"}}
-            )
 
-            logger.info(f"⚙️ Mongo update: resume {external_resume_id} → processing\n\n")
+# Fields every batch payload carries (Node producer contract)
+PAYLOAD_FIELDS = ("resumeUrl", "resumeProcessingId", "externalResumeId", "jobDescriptionId", "batchId")
 
-        except Exception as e:
-            print(f"❌ Failed to set processing state: {e}")
 
-        
-        try:
-            # ------------------------------
-            # STEP 2 — execute business logic
-            # ------------------------------
-            result = process_resume(payload)
-
-
-            # ------------------------------
-            # STEP 3 — mark COMPLETED
-            # ------------------------------
-            resume_processings_collection.update_one(
-                {"_id": ObjectId(resume_processing_id)},
-                {"$set": {"status": "completed"}}
-            )
-
-            # ------------------------------
-            # STEP 4 — final callback
-            # ------------------------------
-            self._send_callback(
-                batch_id=batch_id,
-                resume_processing_id=resume_processing_id,
-                status="completed",
-                external_resume_id=external_resume_id
-            )
-
-            # Cleanup redis job
-            redis_conn.delete(job_redis_key)
-
-            logger.info("✅ Job completed successfully\n")
-            return True
-
-        except Exception as err:
-            logger.exception("❌ Job failed")
-
-            # ------------------------------
-            # STEP 5 — retry or fail
-            # ------------------------------
-            attempts = redis_conn.hincrby(job_redis_key, "attempts", 1) 
-
-            if attempts <= MAX_RETRIES:
-                delay = BASE_DELAY * (2 ** (attempts - 1))
-                next_time = int(time.time()) + delay
-
-                redis_conn.zadd(RETRY_SET, {job.id: next_time})
-
-                logger.warning(
-                    f"↻ Retry scheduled (attempt {attempts}/{MAX_RETRIES}) "
-                    f"after {delay}s"
-                    f"Resume: {external_resume_id}"
-                )
-
-                # DO NOT mark failed
-                return True  
-
-            # ------------------------------
-            # STEP 6 — permanent FAILURE
-            # ------------------------------
-            resume_processings_collection.update_one(
-                {"_id": ObjectId(resume_processing_id)},
-                {
-                    "$set": {
-                        "status": "failed",
-                        "error": str(err)
-                    }
-                }
-            )
-
-            self._send_callback(
-                batch_id=batch_id,
-                resume_processing_id=resume_processing_id,
-                status="failed",
-                external_resume_id=external_resume_id
-            )
-
-            redis_conn.zrem(RETRY_SET, job.id)
-            redis_conn.delete(job_redis_key)
-
-            logger.error("✖ Job permanently failed")
-            return True
-
-
-    def _send_callback(self, batch_id, resume_processing_id, status, external_resume_id):
-        """
-        Final callback only (success or permanent failure).
-        """
+def decode_payload(raw: bytes | str, fields: tuple[str, ...] = PAYLOAD_FIELDS) -> dict:
+    """
+    Decodes the `data` field of an rq:job hash read straight from Redis
+    (workers that bypass RQ's Job). RQ stores it zlib-compressed; producers
+    may also write plain JSON. Raises ValueError for an unusable payload
+    (not JSON, or missing one of `fields`).
+    """
+    if isinstance(raw, bytes):
         try:
-            requests.post(
-                CALLBACK_URL,
-                json={
-                    "batchId": batch_id,
-                    "resumeProcessingId": resume_processing_id,
-                    "status": status,
-                    "externalResumeId": external_resume_id
-                },
-                timeout=5,
-            )
-            logger.info("📩 Callback sent\n")
-
-        except Exception as e:
-            # Callback failure should NOT retry processing
-            logger.warning(f"⚠ Callback failed: {e}\n")
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            pass
+
+    try:
+        payload = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Job data is not JSON: {e}") from e
+
+    if not isinstance(payload, dict):
+        raise ValueError("Job data is not a JSON object")
+
+    missing = [name for name in fields if name not in payload]
+    if missing:
+        raise ValueError(f"Job data misses {', '.join(missing)}")
+
+    return payload
+
+
+class JSONWorker(Worker):
+
+    def execute_job(self, job: job, queue):
+        # Load payload
+        payload = json.loads(job.data)
+        return run_resume_job(job.id, payload)
 
 
 if __name__ == "__main__":
     logger.info(f"👷Batch Worker started — queue: {QUEUE_NAME}\n")
+    warm_up(parsers=True, embeddings=True, connections=True)
     worker = JSONWorker([queue], connection=redis_conn)
     worker.work()
 
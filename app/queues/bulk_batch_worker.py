@@ -0,0 +1,251 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+
+from app.embeddings.similarity import is_normalized_model, similarity_matrix
+from app.queues.batch_worker import QUEUE_NAME, decode_payload, fail_job, send_callback, settle_ranking
+from app.queues.retry import LEASE_SCRIPT
+from app.services.job_context import get_job_context
+from app.services.resume_text import fetch_resume_text
+from app.services.tasks import check_duplicate, embed_resumes, score_resume
+from app.services.write_buffer import ResumeProcessingWriter, flush_writers
+from app.utils.log_context import set_log_context
+from app.utils.logger import logger
+from app.utils.mongo import resume_processings_collection
+from app.utils.redis_client import redis_conn
+from app.utils.settings import (
+    BATCH_LEASE_SET,
+    BATCH_LEASE_SIZE,
+    BATCH_LEASE_TIMEOUT_SECONDS,
+    DOWNLOAD_POOL_SIZE,
+)
+from app.utils.warmup import warm_up
+
+# Seconds a BLPOP waits for the first job of a lease
+POP_TIMEOUT_SECONDS = 5
+
+_lease_script = redis_conn.register_script(LEASE_SCRIPT)
+
+
+def lease_jobs(queue_name: str = QUEUE_NAME, size: int = BATCH_LEASE_SIZE, block: bool = True) -> list[str]:
+    """
+    Leases up to `size` job ids. Unacked leases are re-queued by the
+    scheduler once BATCH_LEASE_TIMEOUT_SECONDS have passed.
+    """
+    queue_key = f"rq:queue:{queue_name}"
+    first = ""
+
+    if block:
+        item = redis_conn.blpop(queue_key, timeout=POP_TIMEOUT_SECONDS)
+        if not item:
+            return []
+        first = item[1]
+
+    deadline = int(time.time()) + BATCH_LEASE_TIMEOUT_SECONDS
+    ids = _lease_script(keys=[queue_key, BATCH_LEASE_SET], args=[size, deadline, first])
+
+    return [job_id.decode() if isinstance(job_id, bytes) else job_id for job_id in ids]
+
+
+def ack_jobs(job_ids: list[str], delete_job: bool):
+    """Releases leases (and the rq job hashes of finished resumes) in one pipeline."""
+    if not job_ids:
+        return
+
+    pipeline = redis_conn.pipeline()
+    pipeline.zrem(BATCH_LEASE_SET, *job_ids)
+    if delete_job:
+        pipeline.delete(*[f"rq:job:{job_id}" for job_id in job_ids])
+    pipeline.execute()
+
+
+def load_payloads(job_ids: list[str]) -> dict[str, dict]:
+    """Payloads of the leased jobs; missing / unusable ones are left out (caller acks them)."""
+    pipeline = redis_conn.pipeline()
+    for job_id in job_ids:
+        pipeline.hget(f"rq:job:{job_id}", "data")
+
+    payloads = {}
+    for job_id, raw in zip(job_ids, pipeline.execute()):
+        if raw is None:
+            logger.warning(f"⚠ Job {job_id} has no data, skipped\n")
+            continue
+
+        try:
+            payloads[job_id] = decode_payload(raw)
+        except ValueError as e:
+            # Kept in Redis for inspection; retrying cannot fix it
+            logger.error(f"❌ Job {job_id} has an unusable payload, skipped: {e}\n")
+
+    return payloads
+
+
+class LeasedResume:
+    """One leased job while its group is processed."""
+
+    def __init__(self, job_id: str, payload: dict):
+        self.job_id = job_id
+        self.payload = payload
+        self.writer = ResumeProcessingWriter(payload["resumeProcessingId"])
+        self.resume_text = None
+        self.error = None
+
+
+def process_group(resumes: list[LeasedResume]):
+    """
+    Phase 3 → 5A for resumes of the SAME batch + job:
+    one job context, one embed_many call, one bulk write for every terminal status.
+    A failing resume only fails itself.
+    """
+    job_description_id = resumes[0].payload["jobDescriptionId"]
+    batch_id = resumes[0].payload["batchId"]
+
+    set_log_context(batchId=batch_id)
+    logger.info(f"🚀 Lease group started | {len(resumes)} resumes | Batch {batch_id}\n")
+
+    # STEP 1 — PROCESSING for the whole group
+    try:
+        resume_processings_collection.bulk_write(
+            [
+                UpdateOne({"_id": ObjectId(r.payload["resumeProcessingId"])}, {"$set": {"status": "processing"}})
+                for r in resumes
+            ],
+            ordered=False,
+        )
+
+    except Exception as e:
+        logger.warning(f"⚠ Failed to set processing state: {e}\n")
+
+    def attempt(resume: LeasedResume, step, *args):
+        if resume.error is not None:
+            return None
+        try:
+            set_log_context(
+                jobId=f"rq:job:{resume.job_id}",
+                resumeProcessingId=resume.payload["resumeProcessingId"],
+                externalResumeId=resume.payload["externalResumeId"],
+            )
+            return step(*args)
+        except Exception as e:
+            logger.exception(f"❌ Resume {resume.payload['externalResumeId']} failed")
+            resume.error = e
+            return None
+
+    # STEP 2 — shared job context
+    try:
+        job_context = get_job_context(job_description_id)
+    except Exception as e:
+        logger.exception("❌ Job context failed")
+        for resume in resumes:
+            resume.error = e
+        job_context = None
+
+    # STEP 3 — download + extract (downloads overlap on the pooled session), dedup
+    def fetch(resume: LeasedResume):
+        resume.resume_text = attempt(resume, fetch_resume_text, resume.payload["resumeUrl"])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(resumes), DOWNLOAD_POOL_SIZE))) as pool:
+        list(pool.map(fetch, resumes))
+
+    to_embed = []
+    for resume in resumes:
+        if resume.error is not None:
+            continue
+
+        duplicate = attempt(resume, check_duplicate, resume.payload, resume.resume_text, job_context, resume.writer)
+        if resume.error is None and duplicate is None:
+            to_embed.append(resume)
+
+    # STEP 4 — ONE embedding call + ONE similarity matrix product for the group
+    if to_embed:
+        try:
+            embedded = embed_resumes([r.resume_text for r in to_embed], job_context)
+            similarities = similarity_matrix(
+                job_context.job_embedding,
+                [resume_embedding for resume_embedding, _ in embedded],
+                normalized=all(is_normalized_model(model_name) for _, model_name in embedded),
+            )
+        except Exception as e:
+            logger.exception("❌ Group embedding failed")
+            for resume in to_embed:
+                resume.error = e
+            embedded, similarities = [], []
+
+        for resume, (resume_embedding, model_name), similarity in zip(to_embed, embedded, similarities):
+            attempt(
+                resume, score_resume,
+                resume.payload, resume.resume_text, job_context, resume_embedding, model_name, resume.writer,
+                float(similarity),
+            )
+
+    # STEP 5 — ONE bulk write with every completed resume
+    completed = [r for r in resumes if r.error is None]
+    for resume in completed:
+        resume.writer.set({"status": "completed"})
+
+    try:
+        flush_writers([r.writer for r in completed])
+    except Exception as e:
+        logger.exception("❌ Bulk write failed")
+        for resume in completed:
+            resume.error = e
+        completed = []
+
+    if completed:
+        settle_ranking(batch_id, job_description_id)
+        ack_jobs([r.job_id for r in completed], delete_job=True)
+
+        for resume in completed:
+            send_callback(resume.payload, status="completed")
+
+    # STEP 6 — retries / permanent failures, per resume (attempts hash + RETRY_SET)
+    for resume in resumes:
+        if resume.error is None:
+            continue
+
+        status = fail_job(resume.job_id, resume.payload, resume.writer, resume.error)
+        ack_jobs([resume.job_id], delete_job=False)
+
+        if status == "failed":
+            send_callback(resume.payload, status="failed")
+
+    logger.info(f"✅ Lease group done | completed={len(completed)}/{len(resumes)}\n")
+
+
+def work_leases(queue_name: str = QUEUE_NAME, size: int = BATCH_LEASE_SIZE, burst: bool = False) -> int:
+    """
+    Main loop: lease → group by (batch, job) → process groups.
+    `burst` stops once the queue is empty. Returns resumes processed.
+    """
+    processed = 0
+
+    while True:
+        job_ids = lease_jobs(queue_name, size, block=not burst)
+        if not job_ids:
+            if burst:
+                return processed
+            continue
+
+        payloads = load_payloads(job_ids)
+        ack_jobs([job_id for job_id in job_ids if job_id not in payloads], delete_job=False)
+
+        groups = defaultdict(list)
+        for job_id, payload in payloads.items():
+            groups[(payload["batchId"], payload["jobDescriptionId"])].append(LeasedResume(job_id, payload))
+
+        for resumes in groups.values():
+            try:
+                process_group(resumes)
+            except Exception:
+                # Unacked leases are re-queued by the scheduler; keep the worker alive
+                logger.exception(f"❌ Lease group of {len(resumes)} resumes crashed")
+            processed += len(resumes)
+
+
+if __name__ == "__main__":
+    logger.info(f"👷Bulk Batch Worker started — queue: {QUEUE_NAME} | lease size: {BATCH_LEASE_SIZE}\n")
+    warm_up(parsers=True, embeddings=True, connections=True)
+    work_leases()
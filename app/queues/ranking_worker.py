@@ -0,0 +1,82 @@
+import json
+import time
+
+from rq import Queue, Worker, job
+
+from app.embeddings.ranking import finalize_batch_ranking
+from app.queues.retry import schedule_retry
+from app.utils.log_context import set_log_context
+from app.utils.logger import logger
+from app.utils.redis_client import redis_conn
+from app.utils.warmup import warm_up
+from app.utils.settings import (
+    RANKING_BASE_DELAY_SECONDS,
+    RANKING_MAX_RETRIES,
+    RANKING_QUEUE_NAME,
+    RANKING_RETRY_SET,
+)
+
+queue = Queue(RANKING_QUEUE_NAME, connection=redis_conn)
+
+
+def run_finalize_ranking_job(job_id: str, payload: dict):
+    """Materializes the ranking of ONE batch ({"batchId", "jobDescriptionId"})."""
+
+    set_log_context(jobId=f"rq:job:{job_id}", batchId=payload["batchId"])
+
+    logger.info(f"🏁 Finalizing ranking | Batch {payload['batchId']}\n")
+
+    try:
+        result = finalize_batch_ranking(payload["batchId"], payload["jobDescriptionId"])
+
+    except Exception:
+        # Re-running the task is safe: ranks are simply rewritten
+        logger.exception("❌ Ranking finalization failed")
+        fail_ranking_job(job_id)
+        return False
+
+    logger.info(
+        f"✅ Ranking materialized | {result['ranked']} resumes in {result['materializeMs']} ms"
+        f" | settled={result['settled']}\n"
+    )
+
+    redis_conn.delete(f"rq:job:{job_id}")
+    return True
+
+
+def fail_ranking_job(job_id: str) -> str:
+    """
+    Schedules a retry (exponential backoff, RANKING_RETRY_SET) or gives up
+    after RANKING_MAX_RETRIES. Returns "retry" or "failed".
+    """
+    job_redis_key = f"rq:job:{job_id}"
+    attempts = redis_conn.hincrby(job_redis_key, "attempts", 1)
+
+    if attempts <= RANKING_MAX_RETRIES:
+        delay = RANKING_BASE_DELAY_SECONDS * (2 ** (attempts - 1))
+        schedule_retry(redis_conn, RANKING_RETRY_SET, job_id, int(time.time()) + delay)
+
+        logger.warning(f"↻ Ranking retry scheduled (attempt {attempts}/{RANKING_MAX_RETRIES}) after {delay}s\n")
+        return "retry"
+
+    redis_conn.zrem(RANKING_RETRY_SET, job_id)
+    redis_conn.delete(job_redis_key)
+
+    # Ranks stay pending; the next resume that settles the batch (or a new task) re-materializes them
+    logger.error("✖ Ranking finalization permanently failed\n")
+    return "failed"
+
+
+class RankingWorker(Worker):
+
+    def execute_job(self, job: job, queue):
+        # Load payload
+        payload = json.loads(job.data)
+        return run_finalize_ranking_job(job.id, payload)
+
+
+if __name__ == "__main__":
+    logger.info(f"👷Ranking Worker started — queue: {RANKING_QUEUE_NAME}\n")
+    warm_up(connections=True)
+    worker = RankingWorker([queue], connection=redis_conn)
+    worker.work()
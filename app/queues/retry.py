@@ -0,0 +1,31 @@
+from app.utils.settings import SCHEDULER_WAKEUP_CHANNEL
+
+# Pops up to ARGV[1] ids and records each lease (score = lease deadline)
+# in ONE round trip. ARGV[3] is an id already taken by BLPOP, if any.
+# Unacked leases are re-queued by the scheduler (the lease set is a retry set).
+LEASE_SCRIPT = """
+local ids = {}
+if ARGV[3] ~= '' then
+    table.insert(ids, ARGV[3])
+end
+while #ids < tonumber(ARGV[1]) do
+    local id = redis.call('LPOP', KEYS[1])
+    if not id then break end
+    table.insert(ids, id)
+end
+for _, id in ipairs(ids) do
+    redis.call('ZADD', KEYS[2], ARGV[2], id)
+end
+return ids
+"""
+
+
+def schedule_retry(redis_conn, retry_set: str, job_id: str, due_at: int):
+    """
+    Adds a job to a retry ZSET (score = due time) and wakes the scheduler,
+    which otherwise sleeps until the previously earliest due job.
+    """
+    pipeline = redis_conn.pipeline()
+    pipeline.zadd(retry_set, {job_id: due_at})
+    pipeline.publish(SCHEDULER_WAKEUP_CHANNEL, retry_set)
+    pipeline.execute()
@@ -7,8 +7,19 @@ from dotenv import load_dotenv
 # ENV CONFIG
 # -----------------------------
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
+
+from app.utils.settings import (
+    BATCH_LEASE_SET,
+    RANKING_QUEUE_NAME,
+    RANKING_RETRY_SET,
+    STAGE_QUEUES,
+    STAGE_RETRY_SETS,
+    RETRY_SCHED_BATCH_LIMIT,
+    RETRY_SCHED_MAX_SLEEP,
+    SCHEDULER_WAKEUP_CHANNEL,
+    SCHEDULER_METRICS_PREFIX,
+)
 REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379")
-POLL_INTERVAL = float(os.getenv("RETRY_SCHED_POLL_INTERVAL", "1"))  # seconds
 
 # Queue → Retry ZSET mapping
 RETRY_CONFIGS = [
@@ -20,6 +31,21 @@ RETRY_CONFIGS = [
         "queue": os.getenv("ANALYSIS_QUEUE_NAME", "analysis-processing"),
         "retry_set": os.getenv("ANALYSIS_RETRY_SET", "rq:analysis-retry"),
     },
+    # Bulk leases: score = lease deadline → unacked jobs of a dead worker go back
+    {
+        "queue": os.getenv("BATCH_QUEUE_NAME", "batch-processing"),
+        "retry_set": BATCH_LEASE_SET,
+    },
+    # Failed "finalize batch ranking" tasks
+    {
+        "queue": RANKING_QUEUE_NAME,
+        "retry_set": RANKING_RETRY_SET,
+    },
+    # Staged pipeline: a failed stage is retried on its own queue
+    *(
+        {"queue": STAGE_QUEUES[stage], "retry_set": STAGE_RETRY_SETS[stage]}
+        for stage in STAGE_QUEUES
+    ),
 ]
 
 # -----------------------------
@@ -27,26 +53,101 @@ RETRY_CONFIGS = [
 # -----------------------------
 r = redis.from_url(REDIS_URL)
 
+# Moves at most ARGV[2] jobs due at ARGV[1] from the retry ZSET (KEYS[1]) to
+# the queue (KEYS[2]) atomically. ZREM decides who moves a job, so several
+# scheduler replicas never enqueue it twice.
+# Returns {id1, score1, id2, score2, ..., next due score or false}.
+MOVE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[2]))
+local result = {}
+for i = 1, #due, 2 do
+    if redis.call('ZREM', KEYS[1], due[i]) == 1 then
+        redis.call('LPUSH', KEYS[2], due[i])
+        table.insert(result, due[i])
+        table.insert(result, due[i + 1])
+    end
+end
+local head = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+table.insert(result, head[2] or false)
+return result
+"""
 
-def move_due_jobs(queue_name: str, retry_set: str) -> int:
-    """Moves due retry jobs back into their processing queue."""
-    now = int(time.time())
+_move_due = r.register_script(MOVE_DUE_SCRIPT)
 
-    job_ids = r.zrangebyscore(retry_set, 0, now)
-    if not job_ids:
-        return 0
 
+def record_lag(retry_set: str, lags: list[float]):
+    """
+    Requeue lag (requeue time - due time) per retry set, for dashboards:
+    HGETALL rq:scheduler:metrics:<retry set>
+    """
     pipeline = r.pipeline()
-    for job_id in job_ids:
-        pipeline.lpush(f"rq:queue:{queue_name}", job_id)
-        pipeline.zrem(retry_set, job_id)
+    key = f"{SCHEDULER_METRICS_PREFIX}:{retry_set}"
+    pipeline.hincrby(key, "moved", len(lags))
+    pipeline.hincrbyfloat(key, "lagSecondsTotal", sum(lags))
+    pipeline.hset(key, mapping={"lastLagSeconds": max(lags), "lastMoveAt": time.time()})
     pipeline.execute()
 
+
+def move_due_jobs(queue_name: str, retry_set: str, limit: int = RETRY_SCHED_BATCH_LIMIT):
+    """
+    Moves due retry jobs back into their processing queue (up to `limit` per call).
+    Returns (moved count, next due score or None).
+    """
+    now = time.time()
+
+    result = _move_due(keys=[retry_set, f"rq:queue:{queue_name}"], args=[now, limit])
+    next_due = float(result[-1]) if result[-1] else None
+    scores = [float(score) for score in result[1:-1:2]]
+
+    if not scores:
+        return 0, next_due
+
+    lags = [max(0.0, now - score) for score in scores]
+    record_lag(retry_set, lags)
+
     print(
-        f"↪ Re-queued {len(job_ids)} job(s) "
-        f"into '{queue_name}' from '{retry_set}' at {now}"
+        f"↪ Re-queued {len(scores)} job(s) "
+        f"into '{queue_name}' from '{retry_set}' | "
+        f"lag avg={sum(lags) / len(lags):.2f}s max={max(lags):.2f}s"
     )
-    return len(job_ids)
+    return len(scores), next_due
+
+
+def run_once() -> float | None:
+    """
+    One pass over every retry set (each drained in LIMIT-sized chunks).
+    Returns the earliest next due score, if any.
+    """
+    next_due = None
+
+    for cfg in RETRY_CONFIGS:
+        while True:
+            moved, head = move_due_jobs(cfg["queue"], cfg["retry_set"])
+            if moved < RETRY_SCHED_BATCH_LIMIT:
+                break
+
+        if head is not None and (next_due is None or head < next_due):
+            next_due = head
+
+    return next_due
+
+
+def sleep_until(next_due: float | None, wakeup) -> None:
+    """
+    Sleeps until the next due job, a worker wake-up message, or RETRY_SCHED_MAX_SLEEP.
+    """
+    timeout = RETRY_SCHED_MAX_SLEEP
+    if next_due is not None:
+        timeout = min(timeout, max(0.0, next_due - time.time()))
+
+    if timeout <= 0:
+        return
+
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        message = wakeup.get_message(ignore_subscribe_messages=True, timeout=remaining)
+        if message is not None:
+            return
 
 
 if __name__ == "__main__":
@@ -57,11 +158,19 @@ if __name__ == "__main__":
             f"→ queue '{cfg['queue']}'"
         )
 
+    wakeup = r.pubsub()
+    wakeup.subscribe(SCHEDULER_WAKEUP_CHANNEL)
+
     while True:
+        next_due = None
         try:
-            for cfg in RETRY_CONFIGS:
-                move_due_jobs(cfg["queue"], cfg["retry_set"])
+            next_due = run_once()
         except Exception as e:
             print(f"⚠ Scheduler error: {e}")
+            time.sleep(1)
 
-        time.sleep(POLL_INTERVAL)
+        try:
+            sleep_until(next_due, wakeup)
+        except Exception as e:
+            print(f"⚠ Scheduler wake-up channel error: {e}")
+            time.sleep(1)
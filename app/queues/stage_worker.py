@@ -0,0 +1,224 @@
+import io
+import json
+import sys
+
+from rq import Queue, Worker, job
+
+from app.queues.batch_worker import (
+    QUEUE_NAME,
+    RETRY_SET,
+    complete_job,
+    fail_job,
+    mark_processing,
+    send_callback,
+)
+from app.services.file_loader import close_resume
+from app.services.job_context import get_job_context, job_embedding_handoff
+from app.services.resume_text import download_resume_text, extract_resume_text
+from app.services.tasks import check_duplicate, embed_resume, score_resume
+from app.services.write_buffer import ResumeProcessingWriter
+from app.utils.log_context import set_log_context
+from app.utils.logger import logger
+from app.utils.redis_client import redis_conn
+from app.utils.settings import STAGE_HANDOFF_TTL_SECONDS, STAGE_QUEUES, STAGE_RETRY_SETS
+from app.utils.warmup import warm_up
+
+# Stage → queue / retry set. "fetch" is the queue Node enqueues into.
+QUEUES = {"fetch": QUEUE_NAME, **STAGE_QUEUES}
+RETRY_SETS = {"fetch": RETRY_SET, **STAGE_RETRY_SETS}
+STAGES = tuple(QUEUES)
+
+
+def body_key(job_id: str) -> str:
+    return f"rq:job:{job_id}:body"
+
+
+def hand_off(job_id: str, payload: dict, next_stage: str, body: bytes | None = None):
+    """
+    Passes a resume to the next stage: the SAME rq job hash carries the
+    updated payload (its `data` field), the job id is pushed onto the next
+    stage queue. Raw file bytes travel in a side key with a TTL.
+    """
+    pipeline = redis_conn.pipeline()
+    pipeline.hset(f"rq:job:{job_id}", "data", json.dumps(payload))
+    if body is not None:
+        pipeline.set(body_key(job_id), body, ex=STAGE_HANDOFF_TTL_SECONDS)
+    pipeline.rpush(f"rq:queue:{QUEUES[next_stage]}", job_id)
+    pipeline.execute()
+
+    logger.info(f"➡️ Handed off to {next_stage} stage\n")
+
+
+def _read_source(source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            return file.read()
+
+    source.seek(0)
+    return source.read()
+
+
+# ------------------------------
+# Stages (each returns True once the resume reached a terminal status)
+# ------------------------------
+def fetch_stage(job_id: str, payload: dict, writer: ResumeProcessingWriter) -> bool:
+    mark_processing(payload, writer)
+
+    download = download_resume_text(payload["resumeUrl"])
+
+    # Extraction cache hit → nothing left for the extract stage
+    if download["record"] is not None:
+        hand_off(job_id, {**payload, "resumeText": download["record"]}, "embed")
+        return False
+
+    try:
+        body = _read_source(download["source"])
+    finally:
+        close_resume(download["source"])
+
+    hand_off(
+        job_id,
+        {
+            **payload,
+            "download": {
+                "mime": download["mime"],
+                "contentHash": download["contentHash"],
+                "alias": download["alias"],
+            },
+        },
+        "extract",
+        body=body,
+    )
+    return False
+
+
+def extract_stage(job_id: str, payload: dict, writer: ResumeProcessingWriter) -> bool:
+    body = redis_conn.get(body_key(job_id))
+    if body is None:
+        raise Exception("Downloaded resume expired before extraction")
+
+    resume_text = extract_resume_text({
+        **payload["download"],
+        "record": None,
+        "source": io.BytesIO(body),
+    })
+
+    payload = {key: value for key, value in payload.items() if key != "download"}
+    hand_off(job_id, {**payload, "resumeText": resume_text}, "embed")
+    redis_conn.delete(body_key(job_id))
+    return False
+
+
+def embed_stage(job_id: str, payload: dict, writer: ResumeProcessingWriter) -> bool:
+    resume_text = payload["resumeText"]
+    job_context = get_job_context(payload["jobDescriptionId"])
+
+    if check_duplicate(payload, resume_text, job_context, writer) is not None:
+        complete_job(job_id, payload, writer)
+        send_callback(payload, status="completed")
+        return True
+
+    resume_embedding, model_name = embed_resume(resume_text, job_context)
+
+    hand_off(
+        job_id,
+        {
+            **payload,
+            "resumeEmbedding": [float(value) for value in resume_embedding],
+            "embeddingModel": model_name,
+            # Score workers must never load the embedding model for the job text
+            "jobEmbedding": job_embedding_handoff(job_context),
+            # Staged fields (hashes) ride along → still ONE write with the terminal status
+            "pendingFields": writer.pending,
+        },
+        "score",
+    )
+    writer.discard()
+    return False
+
+
+def score_stage(job_id: str, payload: dict, writer: ResumeProcessingWriter) -> bool:
+    writer.set(payload.get("pendingFields") or {})
+
+    # Job embedding comes with the payload; nothing is embedded in this stage
+    if not payload.get("jobEmbedding"):
+        raise Exception("Job embedding missing from the score stage payload")
+
+    job_context = get_job_context(payload["jobDescriptionId"], handoff=payload["jobEmbedding"])
+
+    score_resume(
+        payload,
+        payload["resumeText"],
+        job_context,
+        payload["resumeEmbedding"],
+        payload["embeddingModel"],
+        writer,
+    )
+
+    complete_job(job_id, payload, writer)
+    send_callback(payload, status="completed")
+    return True
+
+
+STAGE_HANDLERS = {
+    "fetch": fetch_stage,
+    "extract": extract_stage,
+    "embed": embed_stage,
+    "score": score_stage,
+}
+
+
+def run_stage_job(stage: str, job_id: str, payload: dict):
+    """Runs ONE stage of one resume; failures retry that stage only."""
+
+    set_log_context(
+        jobId=f"rq:job:{job_id}",
+        batchId=payload["batchId"],
+        resumeProcessingId=payload["resumeProcessingId"],
+        externalResumeId=payload["externalResumeId"]
+    )
+
+    logger.info(f"🚀 Stage {stage} started {job_id} | Resume {payload['externalResumeId']}\n")
+
+    writer = ResumeProcessingWriter(payload["resumeProcessingId"])
+
+    try:
+        if STAGE_HANDLERS[stage](job_id, payload, writer):
+            logger.info("✅ Job completed successfully\n")
+        return True
+
+    except Exception as err:
+        logger.exception(f"❌ Stage {stage} failed")
+
+        status = fail_job(
+            job_id, payload, writer, err,
+            retry_set=RETRY_SETS[stage],
+            attempts_field=f"attempts:{stage}",
+        )
+        if status == "failed":
+            redis_conn.delete(body_key(job_id))
+            send_callback(payload, status="failed")
+
+        return True
+
+
+class StageWorker(Worker):
+
+    stage = "fetch"
+
+    def execute_job(self, job: job, queue):
+        # Load payload
+        payload = json.loads(job.data)
+        return run_stage_job(self.stage, job.id, payload)
+
+
+if __name__ == "__main__":
+    stage = sys.argv[1] if len(sys.argv) > 1 else "fetch"
+    if stage not in STAGES:
+        sys.exit(f"Unknown stage '{stage}', expected one of {', '.join(STAGES)}")
+
+    logger.info(f"👷Stage Worker started — stage: {stage} | queue: {QUEUES[stage]}\n")
+    warm_up(parsers=stage == "extract", embeddings=stage == "embed", connections=True)
+    worker = StageWorker([Queue(QUEUES[stage], connection=redis_conn)], connection=redis_conn)
+    worker.stage = stage
+    worker.work()
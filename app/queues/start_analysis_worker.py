@@ -6,18 +6,25 @@ from dotenv import load_dotenv
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
 WORKER_COUNT = int(os.getenv("ANALYSIS_WORKER_COUNT", "1"))
+# "sync" (one blocking LLM call per process, RQ worker) or
+# "async" (ANALYSIS_MAX_IN_FLIGHT calls per process, shared Redis rate limit)
+WORKER_MODE = os.getenv("ANALYSIS_WORKER_MODE", "sync")
+WORKER_MODULE = {
+    "sync": "app.queues.analysis_worker",
+    "async": "app.queues.async_analysis_worker",
+}.get(WORKER_MODE, "app.queues.analysis_worker")
 
 PYTHON_EXECUTABLE = sys.executable
 
 print(f"🧠 Using Python executable: {PYTHON_EXECUTABLE}")
-print(f"🧠 Starting {WORKER_COUNT} Analysis workers...")
+print(f"🧠 Starting {WORKER_COUNT} Analysis workers ({WORKER_MODE})...")
 
 processes = []
 
 for i in range(WORKER_COUNT):
     print(f"👷 Launching analysis worker #{i+1}")
     p = subprocess.Popen(
-        [PYTHON_EXECUTABLE, "-m", "app.queues.analysis_worker"]
+        [PYTHON_EXECUTABLE, "-m", WORKER_MODULE]
     )
     processes.append(p)
 
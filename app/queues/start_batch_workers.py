@@ -1,24 +1,120 @@
 import os
 import subprocess
 import sys
+import time
+import requests
 from dotenv import load_dotenv
 
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
+from app.utils.settings import (
+    EMBEDDING_SERVER_ENABLED,
+    EMBEDDING_SERVER_URL,
+    EMBEDDING_SERVER_STARTUP_TIMEOUT,
+    MONGO_ENSURE_INDEXES,
+)
+
 WORKER_COUNT = int(os.getenv("PY_WORKER_COUNT", "4"))
+# "sync" (one resume at a time, RQ worker), "async" (several resumes in flight
+# per process), "bulk" (leases BATCH_LEASE_SIZE jobs per iteration) or
+# "staged" (one queue + worker pool per pipeline stage)
+WORKER_MODE = os.getenv("BATCH_WORKER_MODE", "sync")
+WORKER_MODULES = {
+    "sync": "app.queues.batch_worker",
+    "async": "app.queues.async_batch_worker",
+    "bulk": "app.queues.bulk_batch_worker",
+}
+WORKER_MODULE = WORKER_MODULES.get(WORKER_MODE, "app.queues.batch_worker")
+
+# Staged mode: scale each stage to its own bottleneck
+STAGE_WORKER_COUNTS = {
+    "fetch": int(os.getenv("FETCH_WORKER_COUNT", "2")),
+    "extract": int(os.getenv("EXTRACT_WORKER_COUNT", "2")),
+    "embed": int(os.getenv("EMBED_WORKER_COUNT", "1")),
+    "score": int(os.getenv("SCORE_WORKER_COUNT", "1")),
+}
+
+# Standalone "finalize batch ranking" workers (RANKING_QUEUE_NAME)
+RANKING_WORKER_COUNT = int(os.getenv("RANKING_WORKER_COUNT", "1"))
 
 # Detect the current python executable (the one running this script)
 PYTHON_EXECUTABLE = sys.executable
 
 print(f"🚀 Using Python executable: {PYTHON_EXECUTABLE}")
-print(f"🚀 Starting {WORKER_COUNT} Python workers...")
 
 processes = []
+worker_env = dict(os.environ)
+
+if WORKER_MODE == "async":
+    # Several resumes in flight per process → concurrent embeds worth batching
+    worker_env.setdefault("EMBED_BATCHING_ENABLED", "true")
+
+
+def wait_for_embedding_server():
+    deadline = time.monotonic() + EMBEDDING_SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{EMBEDDING_SERVER_URL}/health", timeout=2).raise_for_status()
+            return True
+        except Exception:
+            time.sleep(1)
+    return False
+
+
+if MONGO_ENSURE_INDEXES:
+    # Once per node, before any worker queries Mongo
+    try:
+        from app.utils.indexes import ensure_indexes
+
+        ensure_indexes()
+        print("🗂️ Mongo indexes ensured")
+    except Exception as e:
+        print(f"⚠ Could not ensure Mongo indexes: {e}")
+
+if EMBEDDING_SERVER_ENABLED:
+    # ONE model per node, shared by every worker below
+    print(f"🧮 Starting embedding server at {EMBEDDING_SERVER_URL}...")
+    processes.append(
+        subprocess.Popen([PYTHON_EXECUTABLE, "-m", "app.embeddings.server"])
+    )
+
+    if not wait_for_embedding_server():
+        print("❌ Embedding server did not become healthy, aborting")
+        for p in processes:
+            p.terminate()
+        sys.exit(1)
+
+    worker_env["EMBEDDING_PROVIDER"] = "remote"
+    print("🧮 Embedding server ready, workers will use the remote provider")
+
+if WORKER_MODE == "staged":
+    for stage, count in STAGE_WORKER_COUNTS.items():
+        print(f"🚀 Starting {count} {stage} workers...")
+
+        for i in range(count):
+            print(f"👷 Launching {stage} worker #{i+1}")
+            p = subprocess.Popen(
+                [PYTHON_EXECUTABLE, "-m", "app.queues.stage_worker", stage],
+                env=worker_env,
+            )
+            processes.append(p)
+
+else:
+    print(f"🚀 Starting {WORKER_COUNT} Python workers ({WORKER_MODE})...")
+
+    for i in range(WORKER_COUNT):
+        print(f"👷 Launching worker #{i+1}")
+        p = subprocess.Popen(
+            [PYTHON_EXECUTABLE, "-m", WORKER_MODULE],
+            env=worker_env,
+        )
+        processes.append(p)
 
-for i in range(WORKER_COUNT):
-    print(f"👷 Launching worker #{i+1}")
-    p = subprocess.Popen([PYTHON_EXECUTABLE, "-m", "app.queues.batch_worker"])
-    processes.append(p)
+for i in range(RANKING_WORKER_COUNT):
+    print(f"👷 Launching ranking worker #{i+1}")
+    processes.append(
+        subprocess.Popen([PYTHON_EXECUTABLE, "-m", "app.queues.ranking_worker"], env=worker_env)
+    )
 
 print("All workers started. Press CTRL+C to terminate.")
 
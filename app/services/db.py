@@ -1,17 +1,4 @@
-import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
-
-load_dotenv(f".env.{os.getenv('ENV', 'development')}")
-
-MONGO_URI = os.getenv("MONGO_URI_PY")
-if not MONGO_URI:
-    raise RuntimeError("MONGO_URI_PY not set in env")
-
-client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=10000, maxPoolSize=20)
-db = client.get_default_database()  # picks DB from connection string
-
-def ping():
-    # quick connectivity check
-    return client.server_info()  # will raise on failure
+# Same lazily created client as the worker modules (no second MongoClient)
+from app.utils.mongo import MONGO_URI, db, get_client, get_db, ping
 
+__all__ = ["MONGO_URI", "db", "get_client", "get_db", "ping"]
@@ -1,3 +1,7 @@
+from datetime import datetime, timezone
+
+from app.analysis.cache import analysis_key, get_analysis_cache
+from app.services.resume_processings import find_dedup_source
 from app.utils.mongo import resume_processings_collection
 from bson.objectid import ObjectId
 
@@ -5,35 +9,36 @@ from bson.objectid import ObjectId
 def find_duplicate(resume_hash: str, job_hash: str):
     """
     Find an already COMPLETED ResumeProcessing
-    with same resumeHash + jobHash
+    with same resumeHash + jobHash (only the fields that get copied)
     """
-    return resume_processings_collection.find_one({
-        "resumeHash": resume_hash,
-        "jobHash": job_hash,
-        "status": "completed"
-    })
+    return find_dedup_source(resume_hash, job_hash)
 
 
 def mark_as_duplicate(
     current_processing_id,
-    source_processing_doc
+    source_processing_doc,
+    writer=None,
 ):
     """
     Mark current ResumeProcessing as duplicate
-    and reuse cached results
+    and reuse cached results.
+    With a ResumeProcessingWriter the fields are staged for the job's final flush.
     """
     copy_fields = {
         # ---- Phase 3 ----
         "parsedResume": source_processing_doc.get("parsedResume"),
-        "analysis": source_processing_doc.get("analysis"),
+        "analysis": source_processing_doc.get("analysis") or _cached_analysis(source_processing_doc),
 
         # ---- Phase 4.2 ----
         "resumeEmbedding": source_processing_doc.get("resumeEmbedding"),
         "jobEmbedding": source_processing_doc.get("jobEmbedding"),
+        "jobEmbeddingRef": source_processing_doc.get("jobEmbeddingRef"),
+        "embeddingFormat": source_processing_doc.get("embeddingFormat", "list"),
         "embeddingStatus": source_processing_doc.get("embeddingStatus"),
         "embeddingModel": source_processing_doc.get("embeddingModel"),
 
         # ---- Phase 4.3 ----
+        "features": source_processing_doc.get("features"),
         "preFilter": source_processing_doc.get("preFilter"),
 
         # ---- Phase 4.4 ----
@@ -46,14 +51,53 @@ def mark_as_duplicate(
         "jobHash": source_processing_doc.get("jobHash"),
     }
 
+    fields = {
+        **copy_fields,
+        "status": "completed",
+        "isDuplicate": True,
+        "duplicateOf": source_processing_doc["_id"],
+    }
+
+    if writer is not None:
+        writer.set(fields)
+        return
+
     resume_processings_collection.update_one(
         {"_id": ObjectId(current_processing_id)},
+        {"$set": fields}
+    )
+
+
+def _cached_analysis(source_processing_doc):
+    """Analysis of the same resume + job computed for ANOTHER ResumeProcessing."""
+    if not source_processing_doc.get("resumeHash") or not source_processing_doc.get("jobHash"):
+        return None
+
+    return get_analysis_cache().get(
+        analysis_key(source_processing_doc["resumeHash"], source_processing_doc["jobHash"])
+    )
+
+
+def propagate_analysis(resume_hash: str, job_hash: str, analysis: dict) -> int:
+    """
+    A source analysis completed after its duplicates were created:
+    give it to every completed duplicate that has none yet.
+    """
+    result = resume_processings_collection.update_many(
+        {
+            "resumeHash": resume_hash,
+            "jobHash": job_hash,
+            "status": "completed",
+            "isDuplicate": True,
+            "analysis": None,
+            "analysisStatus": {"$nin": ["processing", "completed"]},
+        },
         {
             "$set": {
-                **copy_fields,
-                "status": "completed",
-                "isDuplicate": True,
-                "duplicateOf": source_processing_doc["_id"],
+                "analysis": analysis,
+                "analysisStatus": "completed",
+                "analysisCompletedAt": datetime.now(timezone.utc),
             }
-        }
+        },
     )
+    return result.modified_count
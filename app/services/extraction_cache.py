@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from app.utils.logger import logger
+from app.utils.settings import (
+    EXTRACTION_CACHE_BACKEND,
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_BYTES,
+    EXTRACTION_CACHE_TTL_SECONDS,
+    PDF_LAYOUT_MODE,
+    PDF_MAX_PAGES,
+)
+
+# Bump when extraction / normalization output changes → old entries are ignored
+EXTRACTION_CACHE_VERSION = "2"
+
+# PDF settings that change the extracted text are part of every key
+_EXTRACTION_PROFILE = f"{EXTRACTION_CACHE_VERSION}:{PDF_LAYOUT_MODE}:p{PDF_MAX_PAGES}"
+
+
+def content_key(content_hash: str) -> str:
+    """Key for the sha256 of the raw file bytes."""
+    return f"v{_EXTRACTION_PROFILE}:sha256:{content_hash}"
+
+
+def url_key(resume_url: str, etag: str) -> str:
+    """Alias key: lets a re-submitted URL skip the body download entirely."""
+    digest = hashlib.sha256(f"{resume_url}\n{etag}".encode("utf-8")).hexdigest()
+    return f"v{_EXTRACTION_PROFILE}:url:{digest}"
+
+
+def _encode(record: dict) -> bytes:
+    return zlib.compress(json.dumps(record).encode("utf-8"))
+
+
+def _decode(raw: bytes) -> dict:
+    return json.loads(zlib.decompress(raw))
+
+
+class ExtractionCache:
+    """
+    Extraction results ({normalizedText, resumeHash}) by key.
+    Backends must never raise on get/put — the cache is an optimization only.
+    """
+
+    def get(self, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def put(self, key: str, record: dict):
+        raise NotImplementedError
+
+
+class NullExtractionCache(ExtractionCache):
+
+    def get(self, key: str) -> dict | None:
+        return None
+
+    def put(self, key: str, record: dict):
+        pass
+
+
+class DiskExtractionCache(ExtractionCache):
+    """
+    Local LRU on disk, shared by every worker process of a node.
+    Entries hold resume text (PII): the directory is 0700, files 0600.
+    Write time = file mtime (expires after `ttl_seconds`), recency = atime
+    (touched on hit); least recently used entries are evicted once the
+    directory grows past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str = EXTRACTION_CACHE_DIR,
+        max_bytes: int = EXTRACTION_CACHE_MAX_BYTES,
+        ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # makedirs' mode is masked by the umask / ignored for an existing directory
+        os.chmod(directory, 0o700)
+        self._approx_size = self._scan_size()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - mtime > self.ttl_seconds
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            now = time.time()
+            mtime = os.stat(path).st_mtime
+
+            if self._expired(mtime, now):
+                os.remove(path)
+                return None
+
+            with open(path, "rb") as f:
+                record = _decode(f.read())
+
+            # Recency only: mtime (write time → TTL) is kept
+            os.utime(path, (now, mtime))
+            return record
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠ Extraction cache read failed: {e}")
+            return None
+
+    def put(self, key: str, record: dict):
+        path = self._path(key)
+        data = _encode(record)
+
+        try:
+            # Atomic publish: concurrent workers never read a half-written entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self._approx_size += len(data)
+                if self._approx_size > self.max_bytes:
+                    self._evict()
+
+        except Exception as e:
+            logger.warning(f"⚠ Extraction cache write failed: {e}")
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+
+            stat = entry.stat()
+            # Expired entries go first, whatever their recency
+            recency = -1 if self._expired(stat.st_mtime, now) else stat.st_atime
+            entries.append((recency, stat.st_size, entry.path))
+
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for recency, size, path in entries:
+            if total <= target and recency >= 0:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+        self._approx_size = total
+
+
+class RedisExtractionCache(ExtractionCache):
+    """
+    Fleet-wide tier. Entries expire after `ttl_seconds`; size-based eviction
+    is left to the Redis maxmemory policy (e.g. allkeys-lru).
+    """
+
+    def __init__(self, redis_conn, ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS, prefix: str = "extraction"):
+        self.redis_conn = redis_conn
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> dict | None:
+        try:
+            raw = self.redis_conn.get(f"{self.prefix}:{key}")
+            return _decode(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠ Extraction cache read failed: {e}")
+            return None
+
+    def put(self, key: str, record: dict):
+        try:
+            self.redis_conn.set(f"{self.prefix}:{key}", _encode(record), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠ Extraction cache write failed: {e}")
+
+
+_cache = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    global _cache
+
+    if _cache is None:
+        if EXTRACTION_CACHE_BACKEND == "disk":
+            _cache = DiskExtractionCache()
+        elif EXTRACTION_CACHE_BACKEND == "redis":
+            from app.utils.redis_client import redis_conn
+            _cache = RedisExtractionCache(redis_conn)
+        elif EXTRACTION_CACHE_BACKEND == "none":
+            _cache = NullExtractionCache()
+        else:
+            raise ValueError(f"Unknown extraction cache backend: {EXTRACTION_CACHE_BACKEND}")
+
+    return _cache
@@ -1,7 +1,14 @@
 import re
-import spacy
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_nlp():
+    """spaCy pipeline, loaded on first use (warm it with app.utils.warmup)."""
+    import spacy
+
+    return spacy.load("en_core_web_sm")
 
-nlp = spacy.load("en_core_web_sm")
 
 # ---------------------------
 # 1️⃣ BASIC FILE EXTRACTORS
@@ -54,7 +61,7 @@ def extract_phone(text: str) -> str | None:
     return match.group(0) if match else None
 
 def extract_name(text: str) -> str | None:
-    doc = nlp(text)
+    doc = get_nlp()(text)
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             return ent.text
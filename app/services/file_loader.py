@@ -1,21 +1,148 @@
-import requests
-import tempfile
+import hashlib
 import mimetypes
 import os
+import tempfile
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.settings import (
+    DOWNLOAD_MAX_BYTES,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_CONNECT_TIMEOUT,
+    DOWNLOAD_READ_TIMEOUT,
+    DOWNLOAD_POOL_SIZE,
+    DOWNLOAD_SPOOL_MAX_BYTES,
+)
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOC_MIME = "application/msword"
+
+# Magic bytes → mime (first bytes of the file, not its name)
+MAGIC_NUMBERS = [
+    (b"%PDF-", PDF_MIME),
+    (b"PK\x03\x04", DOCX_MIME),  # zip container (docx)
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", DOC_MIME),  # OLE2 (legacy .doc)
+]
+SNIFF_BYTES = max(len(magic) for magic, _ in MAGIC_NUMBERS)
+
+# IMPORTANT: one pooled session per worker process (keep-alive to Cloudinary)
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
 
-def download_resume(resume_url: str):
+def get_session() -> requests.Session:
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=DOWNLOAD_POOL_SIZE, pool_maxsize=DOWNLOAD_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _session, _session_pid = session, os.getpid()
+
+        return _session
+
+
+def sniff_mime(head: bytes, resume_url: str = "") -> str:
+    for magic, mime in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return mime
+
+    # Unknown signature → fall back to the URL extension
+    return mimetypes.guess_type(urlparse(resume_url).path)[0] or "application/octet-stream"
+
+
+def open_resume_response(resume_url: str) -> requests.Response:
     """
-    Downloads resume from Cloudinary and stores it as a temporary file.
-    Returns: (local_path, mime_type)
+    Starts a streamed GET; headers (ETag, Content-Length) are available
+    before any body byte is read. Use as a context manager.
     """
-    response = requests.get(resume_url, stream=True)
+    response = get_session().get(
+        resume_url,
+        stream=True,
+        timeout=(DOWNLOAD_CONNECT_TIMEOUT, DOWNLOAD_READ_TIMEOUT),
+    )
     response.raise_for_status()
+    return response
+
 
-    suffix = os.path.splitext(resume_url)[1] or ""
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(response.content)
-    tmp.close()
+def read_resume_body(response: requests.Response, resume_url: str, max_bytes: int = DOWNLOAD_MAX_BYTES):
+    """
+    Streams the body with a hard size cap, hashing raw bytes on the way.
+    Files up to DOWNLOAD_SPOOL_MAX_BYTES stay in memory (spooled buffer rolls
+    over to an anonymous temp file beyond that); DOWNLOAD_SPOOL_MAX_BYTES=0
+    keeps the legacy named temp file.
+    Returns: (source, mime_type, sha256 of raw bytes)
+    """
+    declared = int(response.headers.get("Content-Length") or 0)
+    if declared > max_bytes:
+        raise ValueError(f"Resume too large: {declared} bytes (limit {max_bytes})")
+
+    in_memory = DOWNLOAD_SPOOL_MAX_BYTES > 0
+
+    if in_memory:
+        target = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_BYTES)
+    else:
+        suffix = os.path.splitext(urlparse(resume_url).path)[1] or ""
+        target = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+
+    try:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"Resume too large: more than {max_bytes} bytes")
+
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+
+            digest.update(chunk)
+            target.write(chunk)
+
+    except Exception:
+        target.close()
+        if not in_memory:
+            os.remove(target.name)
+        raise
+
+    mime = sniff_mime(head, resume_url)
 
-    mime = mimetypes.guess_type(tmp.name)[0] or "application/octet-stream"
+    if in_memory:
+        target.seek(0)
+        return target, mime, digest.hexdigest()
 
-    return tmp.name, mime
+    target.close()
+    return target.name, mime, digest.hexdigest()
+
+
+def download_resume(resume_url: str, max_bytes: int = DOWNLOAD_MAX_BYTES):
+    """
+    Streams resume from Cloudinary with a hard size cap.
+    Returns: (source, mime_type) — source is a file path or a seekable file object.
+    Release it with close_resume().
+    """
+    with open_resume_response(resume_url) as response:
+        source, mime, _ = read_resume_body(response, resume_url, max_bytes)
+
+    return source, mime
+
+
+def close_resume(source):
+    """
+    Releases whatever download_resume returned (temp file path or buffer).
+    """
+    if isinstance(source, str):
+        if os.path.exists(source):
+            os.remove(source)
+    elif source is not None:
+        source.close()
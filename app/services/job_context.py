@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from bson.objectid import ObjectId
+
+from app.embeddings.service import generate_embedding
+from app.embeddings.skill_matcher import SkillMatcher
+from app.embeddings.store import save_job_embedding
+from app.embeddings.text_builder import build_job_embedding_text
+from app.services.hashing import sha256_hash
+from app.services.normalize import normalize_text
+from app.utils.logger import logger
+from app.utils.mongo import job_descriptions_collection
+from app.utils.redis_client import redis_conn
+from app.utils.settings import (
+    JOB_CONTEXT_CACHE_SIZE,
+    JOB_CONTEXT_TTL_SECONDS,
+    JOB_CONTEXT_REDIS_ENABLED,
+    JOB_CONTEXT_REDIS_TTL_SECONDS,
+    EMBEDDING_PROVIDER,
+    EMBEDDING_STORAGE_FORMAT,
+)
+
+JOB_PROJECTION = {
+    "title": 1,
+    "company": 1,
+    "location": 1,
+    "required_skills": 1,
+    "preferred_skills": 1,
+    "experience_level": 1,
+    "min_experience_years": 1,
+    "description": 1,
+}
+
+# How long a worker waits for another worker that is already embedding the same job
+SHARED_EMBEDDING_LOCK_SECONDS = 30
+SHARED_EMBEDDING_WAIT_SECONDS = 10
+
+
+@dataclass
+class JobContext:
+    """
+    Everything the pipeline derives from a job description.
+    Identical for every resume screened against the same job version.
+    """
+
+    job_description_id: str
+    job_doc: dict
+    normalized_job_text: str
+    job_hash: str  # content version
+    job_embedding: list[float]
+    embedding_model: str
+    # Set when embeddings are stored in binary form (one jobembeddings doc per job version)
+    job_embedding_ref: str | None = None
+    # required + preferred skills compiled once per job
+    skill_matcher: SkillMatcher | None = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+_cache: "OrderedDict[tuple[str, str], JobContext]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def build_job_text(job_doc: dict) -> str:
+    job_text_parts = [
+        job_doc.get("title", ""),
+        job_doc.get("company", ""),
+        job_doc.get("location", ""),
+        " ".join(job_doc.get("required_skills", [])),
+        " ".join(job_doc.get("preferred_skills", [])),
+        job_doc.get("experience_level", ""),
+        str(job_doc.get("min_experience_years", "")),
+        job_doc.get("description", ""),
+    ]
+
+    return " ".join(job_text_parts)
+
+
+def _shared_key(job_description_id: str, job_hash: str, provider_name: str) -> str:
+    return f"jobctx:{provider_name}:{job_description_id}:{job_hash}"
+
+
+def _read_shared(key: str):
+    raw = redis_conn.get(key)
+    if not raw:
+        return None
+
+    cached = json.loads(raw)
+    return cached["embedding"], cached["model"]
+
+
+def _embed_job(job_description_id: str, job_hash: str, job_embedding_text: str, provider_name: str):
+    """
+    Embed the job text at most once per fleet (Redis tier),
+    falling back to a local embed when Redis is disabled or unavailable.
+    """
+
+    if not JOB_CONTEXT_REDIS_ENABLED:
+        return generate_embedding(job_embedding_text, provider_name)
+
+    key = _shared_key(job_description_id, job_hash, provider_name)
+
+    try:
+        shared = _read_shared(key)
+        if shared:
+            return shared
+
+        # Only one worker embeds, the others wait for its result
+        if not redis_conn.set(f"{key}:lock", 1, nx=True, ex=SHARED_EMBEDDING_LOCK_SECONDS):
+            deadline = time.monotonic() + SHARED_EMBEDDING_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                shared = _read_shared(key)
+                if shared:
+                    return shared
+
+        embedding, model_name = generate_embedding(job_embedding_text, provider_name)
+
+        redis_conn.set(
+            key,
+            json.dumps({"embedding": embedding, "model": model_name}),
+            ex=JOB_CONTEXT_REDIS_TTL_SECONDS,
+        )
+        return embedding, model_name
+
+    except Exception as e:
+        # Redis is only a cache tier → never fail the resume for it
+        logger.warning(f"⚠ Job context Redis tier unavailable: {e}")
+        return generate_embedding(job_embedding_text, provider_name)
+
+
+def _cache_get(key):
+    with _cache_lock:
+        context = _cache.get(key)
+        if context is not None:
+            _cache.move_to_end(key)
+        return context
+
+
+def _cache_put(key, context: JobContext):
+    with _cache_lock:
+        _cache[key] = context
+        _cache.move_to_end(key)
+        while len(_cache) > JOB_CONTEXT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def job_embedding_handoff(context: JobContext) -> dict:
+    """The job embedding of a context, as carried between pipeline stages."""
+    return {
+        "jobHash": context.job_hash,
+        "embedding": [float(value) for value in context.job_embedding],
+        "model": context.embedding_model,
+        "ref": context.job_embedding_ref,
+    }
+
+
+def get_job_context(
+    job_description_id: str,
+    provider_name: str = EMBEDDING_PROVIDER,
+    handoff: dict | None = None,
+) -> JobContext:
+    """
+    Returns the cached JobContext for a job.
+
+    The job doc is re-read after JOB_CONTEXT_TTL_SECONDS; the embedding is only
+    recomputed when the normalized job text (its hash) actually changed.
+
+    With `handoff` (job_embedding_handoff of an earlier stage) the job is
+    NEVER embedded here: a job text that changed since then raises instead.
+    """
+
+    key = (str(job_description_id), provider_name)
+    cached = _cache_get(key)
+
+    if cached and time.monotonic() - cached.fetched_at < JOB_CONTEXT_TTL_SECONDS:
+        return cached
+
+    job_doc = job_descriptions_collection.find_one(
+        {"_id": ObjectId(job_description_id)},
+        JOB_PROJECTION,
+    )
+
+    if not job_doc:
+        raise Exception("Job description not found or empty")
+
+    normalized_job_text = normalize_text(build_job_text(job_doc))
+    job_hash = sha256_hash(normalized_job_text)
+
+    if cached and cached.job_hash == job_hash:
+        job_embedding, embedding_model = cached.job_embedding, cached.embedding_model
+        job_embedding_ref = cached.job_embedding_ref
+    elif handoff is not None:
+        if handoff.get("jobHash") != job_hash:
+            raise Exception("Job description changed since its embedding was handed off")
+
+        job_embedding, embedding_model = handoff["embedding"], handoff["model"]
+        job_embedding_ref = handoff.get("ref")
+    else:
+        logger.info(f"Job context miss → resolving embedding for job {job_description_id}")
+        job_embedding, embedding_model = _embed_job(
+            str(job_description_id),
+            job_hash,
+            build_job_embedding_text(normalized_job_text),
+            provider_name,
+        )
+
+        job_embedding_ref = None
+        if EMBEDDING_STORAGE_FORMAT != "list":
+            job_embedding_ref = save_job_embedding(
+                str(job_description_id), job_hash, embedding_model, job_embedding
+            )
+
+    context = JobContext(
+        job_description_id=str(job_description_id),
+        job_doc=job_doc,
+        normalized_job_text=normalized_job_text,
+        job_hash=job_hash,
+        job_embedding=job_embedding,
+        embedding_model=embedding_model,
+        job_embedding_ref=job_embedding_ref,
+        skill_matcher=SkillMatcher(
+            job_doc.get("required_skills", []),
+            job_doc.get("preferred_skills", []),
+        ),
+    )
+    _cache_put(key, context)
+
+    return context
+
+
+def clear_job_context_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,244 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+
+from app.utils.logger import logger
+from app.utils.settings import (
+    PDF_LAYOUT_MODE,
+    PDF_MAX_PAGES,
+    PDF_PAGES_PER_CHUNK,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_POOL_WORKERS,
+    PDF_TIME_BUDGET_SECONDS,
+)
+
+LAYOUT_MODES = ("default", "tuned", "off")
+
+# Grace period for pool chunks to hand back the pages they finished before the deadline
+_DEADLINE_GRACE_SECONDS = 0.5
+
+# pdfminer is imported on first use (or by app.utils.warmup), not when a
+# worker module is imported
+if TYPE_CHECKING:
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+
+
+def _laparams(layout_mode: str) -> "LAParams | None":
+    from pdfminer.layout import LAParams
+
+    if layout_mode == "default":
+        return LAParams()
+
+    if layout_mode == "tuned":
+        # Lines/words are still grouped (spaces + newlines preserved), but the
+        # costly text box ordering and vertical text detection are skipped
+        return LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+    if layout_mode == "off":
+        # Raw character stream: fastest, but words may run together
+        return None
+
+    raise ValueError(f"Unknown PDF layout mode: {layout_mode}")
+
+
+def _page_count(document: "PDFDocument") -> int:
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+
+    try:
+        return int(resolve1(document.catalog["Pages"])["Count"])
+    except Exception:
+        return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _extract_pages(fp, first: int, last: int, layout_mode: str, deadline: float | None) -> tuple[str, int]:
+    """
+    Extract pages [first, last) of an open PDF.
+    Stops between pages once `deadline` (time.time()) has passed.
+    Returns (text, pages processed).
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    document = PDFDocument(PDFParser(fp))
+    resources = PDFResourceManager(caching=True)
+    output = io.StringIO()
+    converter = TextConverter(resources, output, laparams=_laparams(layout_mode))
+    interpreter = PDFPageInterpreter(resources, converter)
+
+    processed = 0
+    try:
+        for index, page in enumerate(PDFPage.create_pages(document)):
+            if index < first:
+                continue
+            if index >= last:
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+
+            interpreter.process_page(page)
+            processed += 1
+    finally:
+        converter.close()
+
+    return output.getvalue(), processed
+
+
+def _extract_chunk(data: bytes, first: int, last: int, layout_mode: str, deadline: float | None) -> tuple[str, int]:
+    """Process pool entry point (one chunk of pages)."""
+    return _extract_pages(io.BytesIO(data), first, last, layout_mode, deadline)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    # Workers already run threads (batcher, executors, pymongo monitors):
+    # never fork them. forkserver children start from a clean server process.
+    try:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["app.services.pdf_engine"])
+        return context
+    except ValueError:
+        return multiprocessing.get_context("spawn")
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """One long-lived pool per worker process, created on first use."""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=max(1, PDF_POOL_WORKERS), mp_context=_pool_context())
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _reset_pdf_pool(broken: ProcessPoolExecutor):
+    """Drops a broken pool; the next document builds a new one."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_parallel(data: bytes, page_limit: int, layout_mode: str, deadline: float | None) -> tuple[str, int, bool]:
+    chunks = [
+        (first, min(first + PDF_PAGES_PER_CHUNK, page_limit))
+        for first in range(0, page_limit, PDF_PAGES_PER_CHUNK)
+    ]
+
+    pool = get_pdf_pool()
+    futures = []
+    try:
+        for first, last in chunks:
+            futures.append(pool.submit(_extract_chunk, data, first, last, layout_mode, deadline))
+
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.time()) + _DEADLINE_GRACE_SECONDS
+
+        done, _ = wait(futures, timeout=timeout)
+
+        # Contiguous prefix only: stop at the first chunk that is missing or cut short
+        texts, processed = [], 0
+        for future, (first, last) in zip(futures, chunks):
+            if future not in done:
+                break
+
+            chunk_text, chunk_pages = future.result()
+            texts.append(chunk_text)
+            processed += chunk_pages
+
+            if chunk_pages < last - first:
+                break
+
+        return "".join(texts), processed, processed < page_limit
+
+    except BrokenProcessPool:
+        _reset_pdf_pool(pool)
+        raise
+
+    finally:
+        # Queued chunks of a timed-out document are dropped; running ones stop
+        # at the deadline themselves (the pool is shared, never waited on here)
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf(
+    source,
+    max_pages: int = PDF_MAX_PAGES,
+    layout_mode: str = PDF_LAYOUT_MODE,
+    time_budget_seconds: float = PDF_TIME_BUDGET_SECONDS,
+    parallel_min_pages: int = PDF_PARALLEL_MIN_PAGES,
+) -> dict:
+    """
+    Phase 3 — PDF text extraction engine (pdfminer low-level API).
+
+    - only the first `max_pages` pages are read
+    - layout analysis is pdfminer's default, or tuned / disabled through PDF_LAYOUT_MODE
+    - large documents are split in page chunks across a process pool
+    - past the time budget the pages extracted so far are returned
+
+    `source` is a file path or a seekable binary file object.
+    Returns: {"text", "pages", "totalPages", "truncated", "timedOut"}
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+
+    started = time.time()
+    deadline = started + time_budget_seconds if time_budget_seconds > 0 else None
+
+    fp = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        fp.seek(0)
+        total_pages = _page_count(PDFDocument(PDFParser(fp)))
+        page_limit = min(total_pages, max_pages) if max_pages > 0 else total_pages
+
+        text = None
+        if parallel_min_pages > 0 and page_limit >= parallel_min_pages and page_limit > PDF_PAGES_PER_CHUNK:
+            fp.seek(0)
+            try:
+                text, processed, timed_out = _extract_parallel(fp.read(), page_limit, layout_mode, deadline)
+            except Exception as e:
+                logger.warning(f"⚠️ Parallel PDF extraction failed, falling back to sequential: {e}\n")
+
+        if text is None:
+            fp.seek(0)
+            text, processed = _extract_pages(fp, 0, page_limit, layout_mode, deadline)
+            timed_out = processed < page_limit
+
+    finally:
+        if fp is not source:
+            fp.close()
+
+    if timed_out:
+        logger.warning(
+            f"⏱️ PDF time budget ({time_budget_seconds}s) exceeded, "
+            f"kept {processed}/{page_limit} pages\n"
+        )
+
+    if page_limit < total_pages:
+        logger.info(f"PDF page cap reached: {page_limit}/{total_pages} pages read\n")
+
+    return {
+        "text": text,
+        "pages": processed,
+        "totalPages": total_pages,
+        "truncated": page_limit < total_pages,
+        "timedOut": timed_out,
+    }
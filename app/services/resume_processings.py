@@ -0,0 +1,111 @@
+"""
+Read access to `resumeprocessings`, one function + projection per access path.
+Nothing here loads a whole document: normalizedResumeText, embeddings and the
+explanation tree only come over the wire for the paths that need them.
+"""
+from typing import Any, Iterator, TypedDict
+
+from bson.objectid import ObjectId
+
+from app.utils.mongo import resume_processings_collection
+from app.utils.settings import MONGO_CURSOR_BATCH_SIZE
+
+
+class RankingView(TypedDict, total=False):
+    _id: ObjectId
+    finalScore: float | None
+    features: dict
+    preFilter: dict  # similarityScore only
+
+
+class DedupSource(TypedDict, total=False):
+    _id: ObjectId
+    parsedResume: Any
+    analysis: Any
+    resumeEmbedding: Any
+    jobEmbedding: Any
+    jobEmbeddingRef: str
+    embeddingFormat: str
+    embeddingStatus: str
+    embeddingModel: str
+    features: dict
+    preFilter: dict
+    finalScore: float | None
+    rank: int | None
+    rankingStatus: str
+    resumeHash: str
+    jobHash: str
+
+
+class AnalysisView(TypedDict, total=False):
+    _id: ObjectId
+    externalResumeId: str
+    jobDescriptionId: ObjectId
+    resumeHash: str
+    jobHash: str
+    analysisStatus: str
+    normalizedResumeText: str
+    explanation: dict
+
+
+class StatusView(TypedDict, total=False):
+    _id: ObjectId
+    status: str
+
+
+RANKING_PROJECTION = {"finalScore": 1, "features": 1, "preFilter.similarityScore": 1}
+
+# Everything mark_as_duplicate copies (+ _id), nothing else
+DEDUP_PROJECTION = {field: 1 for field in DedupSource.__annotations__ if field != "_id"}
+
+ANALYSIS_PROJECTION = {field: 1 for field in AnalysisView.__annotations__ if field != "_id"}
+
+STATUS_PROJECTION = {"status": 1}
+
+
+def find_dedup_source(resume_hash: str, job_hash: str) -> DedupSource | None:
+    """An already COMPLETED ResumeProcessing with the same resumeHash + jobHash."""
+    return resume_processings_collection.find_one(
+        {"resumeHash": resume_hash, "jobHash": job_hash, "status": "completed"},
+        DEDUP_PROJECTION,
+    )
+
+
+def iter_ranking_candidates(
+    batch_id: str,
+    job_description_id: str,
+    batch_size: int = MONGO_CURSOR_BATCH_SIZE,
+) -> Iterator[RankingView]:
+    """PASSED resumes of a batch that have a finalScore or a feature record."""
+    return resume_processings_collection.find(
+        {
+            "batchId": batch_id,
+            "jobDescriptionId": ObjectId(job_description_id),
+            "preFilter.passed": True,
+            "$or": [
+                {"finalScore": {"$ne": None}},
+                {"features": {"$exists": True}},
+            ],
+        },
+        RANKING_PROJECTION,
+        batch_size=batch_size,
+    )
+
+
+def find_for_analysis(resume_processing_id: str) -> AnalysisView | None:
+    return resume_processings_collection.find_one(
+        {"_id": ObjectId(resume_processing_id)},
+        ANALYSIS_PROJECTION,
+    )
+
+
+def find_unsettled(batch_id: str, job_description_id: str) -> StatusView | None:
+    """Any resume of the batch still pending / processing / retrying."""
+    return resume_processings_collection.find_one(
+        {
+            "batchId": batch_id,
+            "jobDescriptionId": ObjectId(job_description_id),
+            "status": {"$nin": ["completed", "failed"]},
+        },
+        STATUS_PROJECTION,
+    )
@@ -0,0 +1,111 @@
+from app.services.extraction_cache import content_key, get_extraction_cache, url_key
+from app.services.file_loader import close_resume, open_resume_response, read_resume_body
+from app.services.hashing import sha256_hash
+from app.services.normalize import normalize_text
+from app.services.text_extractor import extract_document
+from app.utils.logger import logger
+
+
+def download_resume_text(resume_url: str) -> dict:
+    """
+    Phase 3 — I/O half: download one resume, unless the extraction cache
+    already knows it:
+    - same URL + ETag → the body is not even downloaded
+    - same raw bytes (sha256) → pdfminer / normalization are skipped
+
+    Returns {"record": cached result} on a hit, else
+    {"record": None, "source", "mime", "contentHash", "alias"} for extract_resume_text.
+    """
+    cache = get_extraction_cache()
+    source = None
+
+    try:
+        # 1. Download (headers first)
+        logger.info("Downloading resume\n")
+        with open_resume_response(resume_url) as response:
+            etag = response.headers.get("ETag")
+            alias = url_key(resume_url, etag) if etag else None
+
+            cached = cache.get(alias) if alias else None
+            if cached:
+                logger.info("Extraction cache hit (url + etag), download skipped\n")
+                return {"record": {**cached, "cache": "url"}}
+
+            source, mime, content_hash = read_resume_body(response, resume_url)
+
+        cached = cache.get(content_key(content_hash))
+        if cached:
+            logger.info("Extraction cache hit (file hash), extraction skipped\n")
+            if alias:
+                cache.put(alias, cached)
+            close_resume(source)
+            return {"record": {**cached, "cache": "content"}}
+
+        return {
+            "record": None,
+            "source": source,
+            "mime": mime,
+            "contentHash": content_hash,
+            "alias": alias,
+        }
+
+    except Exception:
+        # 🧹 cleanup temp file / in-memory buffer
+        close_resume(source)
+        raise
+
+
+def extract_resume_text(download: dict) -> dict:
+    """
+    Phase 3 — CPU half: extract + normalize a downloaded resume.
+    Always releases the downloaded file.
+
+    Returns: {"normalizedText", "resumeHash", "contentHash", "cache"}
+    """
+    if download["record"] is not None:
+        return download["record"]
+
+    source = download["source"]
+    cache = get_extraction_cache()
+
+    try:
+        # 2. Extract text
+        logger.info("Extracting text\n")
+        extracted = extract_document(source, download["mime"])
+        raw_text = extracted["text"]
+
+        logger.info("Text extraction completed\n")
+
+        if not raw_text.strip():
+            raise Exception("Extracted text is empty")
+
+        # 3. Normalizing text
+        logger.info("Normalizing text\n")
+        normalized_resume_text = normalize_text(raw_text)
+
+        record = {
+            "normalizedText": normalized_resume_text,
+            "resumeHash": sha256_hash(normalized_resume_text),
+            "contentHash": download["contentHash"],
+        }
+
+        # Partial text (PDF time budget hit) is used for this run only
+        if extracted["complete"]:
+            cache.put(content_key(download["contentHash"]), record)
+            if download["alias"]:
+                cache.put(download["alias"], record)
+
+        return {**record, "cache": None}
+
+    finally:
+        # 🧹 cleanup temp file / in-memory buffer
+        close_resume(source)
+
+
+def fetch_resume_text(resume_url: str) -> dict:
+    """
+    Phase 3 — Download + extract + normalize one resume (extraction cache aware).
+
+    Returns: {"normalizedText", "resumeHash", "contentHash", "cache"}
+    """
+    return extract_resume_text(download_resume_text(resume_url))
@@ -1,314 +1,344 @@
-import os
-from app.services.file_loader import download_resume
-from app.services.text_extractor import extract_raw_text
+from app.services.resume_text import fetch_resume_text
 from app.utils.logger import logger
 # from app.utils.log_context import set_log_context
-from app.services.normalize import normalize_text
-from app.services.hashing import sha256_hash
 from app.services.dedup import find_duplicate, mark_as_duplicate
-from app.utils.mongo import resume_processings_collection, job_descriptions_collection
-from bson.objectid import ObjectId
-from app.embeddings.text_builder import build_embedding_texts
-from app.embeddings.service import generate_embedding
-from app.embeddings.similarity import cosine_similarity
+from app.services.job_context import get_job_context
+from app.services.write_buffer import ResumeProcessingWriter
+from app.embeddings.text_builder import build_resume_embedding_text
+from app.embeddings.service import generate_embedding, generate_embeddings
+from app.embeddings.codec import encode_embedding
+from app.embeddings.store import load_resume_embedding, save_resume_embedding
+from app.utils.settings import EMBEDDING_STORAGE_FORMAT, RESUME_EMBEDDING_REUSE_ENABLED
+from app.embeddings.similarity import similarity
 from app.embeddings.prefilter import prefilter_resume
-from app.embeddings.ranking import rank_resumes_in_batch
-from app.embeddings.experience import extract_experience_years,compute_experience_match_ratio
-from app.embeddings.skill_match import compute_skill_match_ratio
+from app.embeddings.ranking import record_resume_score
+from app.embeddings.scoring import compute_final_score
+from app.embeddings.features import experience_info, extract_resume_features
 from app.explanation.skills_mapping import build_skill_explanation
 from app.explanation.decision_builder import build_decision_explanation
 from app.explanation.score_breakdown import build_score_breakdown
 
-def process_resume(job_payload):
+def check_duplicate(job_payload, resume_text: dict, job_context, writer: ResumeProcessingWriter):
     """
-    Phase 3 - Step 1:
-    Download resume + extract raw text
+    Phase 3 - Step 3:
+    Reuse the results of an identical (resumeHash, jobHash) screening.
+    Returns the job result when a duplicate was found, else None.
     """
-    file_path = None
+    resume_processing_id = job_payload["resumeProcessingId"]
+    job_description_id = job_payload["jobDescriptionId"]
+    resume_hash = resume_text["resumeHash"]
+    job_hash = job_context.job_hash
 
+    # 5. ------------- dedup --------------------
 
-    # logger.info(f"Starting resume processing for {external_resume_id}")
+    logger.info("Phase-3 Step-3: Checking for duplicates\n")
 
-    try:
-        resume_url = job_payload["resumeUrl"]
-        resume_processing_id = job_payload["resumeProcessingId"]
-        external_resume_id = job_payload["externalResumeId"]
-        job_description_id = job_payload["jobDescriptionId"]
-
-        # 1. Download
-        logger.info("Downloading resume\n")
-        file_path, mime = download_resume(resume_url)
-
-        # 2. Extract text
-        logger.info("Extracting text\n")
-        raw_text = extract_raw_text(file_path, mime)
-        
-        logger.info("Text extraction completed\n")
-
-        if not raw_text.strip():
-            raise Exception("Extracted text is empty")
-        
-        # 3. Normalizing text
-        logger.info("Normalizing text\n")
-        normalized_resume_text = normalize_text(raw_text)
+    duplicate = find_duplicate(resume_hash, job_hash)
 
+    if duplicate:
         logger.info(
-            f"Normalized resume text length={len(normalized_resume_text)}\n"
+            f"Duplicate found. Reusing results from ResumeProcessing={duplicate['_id']}\n"
         )
 
-        # 4. ---- HASHING ----
-        resume_hash = sha256_hash(normalized_resume_text)
-
-        # Job text should already be stored in DB or payload
-        bson_job_description_id = ObjectId(job_description_id)
-        job_doc = job_descriptions_collection.find_one(
-            {"_id": bson_job_description_id},
-            {
-                "title": 1,
-                "company": 1,
-                "location": 1,
-                "required_skills": 1,
-                "preferred_skills": 1,
-                "experience_level": 1,
-                "min_experience_years": 1,
-                "description": 1,
-            }
+        mark_as_duplicate(
+            current_processing_id=resume_processing_id,
+            source_processing_doc=duplicate,
+            writer=writer,
         )
 
+        # Reused score still has to take part in THIS batch's ranking
+        if (duplicate.get("preFilter") or {}).get("passed") and duplicate.get("finalScore") is not None:
+            record_resume_score(
+                batch_id=job_payload["batchId"],
+                job_description_id=job_description_id,
+                resume_processing_id=resume_processing_id,
+                final_score=duplicate["finalScore"],
+            )
 
-        if not job_doc:
-            raise Exception("Job description not found or empty")
+        return {
+            "resumeProcessingId": resume_processing_id,
+            "status": "completed",
+            "result": "cache",
+            "duplicateOf": str(duplicate["_id"])
+        }
 
-        job_text_parts = [
-            job_doc.get("title", ""),
-            job_doc.get("company", ""),
-            job_doc.get("location", ""),
-            " ".join(job_doc.get("required_skills", [])),
-            " ".join(job_doc.get("preferred_skills", [])),
-            job_doc.get("experience_level", ""),
-            str(job_doc.get("min_experience_years", "")),
-            job_doc.get("description", ""),
-        ]
+    # No duplicate → store hashes and continue pipeline
+    writer.set({
+        "resumeHash": resume_hash,
+        "jobHash": job_hash,
+        "normalizedResumeText": resume_text["normalizedText"]
+    })
+    writer.checkpoint("hashes")
 
-        
+    logger.info("No duplicate found, moving to Phase-4\n")
 
-        job_text = " ".join(job_text_parts)
-        normalized_job_text = normalize_text(job_text)
-        job_hash = sha256_hash(normalized_job_text)
+    return None
 
-        logger.info("Hashes computed successfully\n")  
 
-        # 5. ------------- dedup --------------------
+def embed_resume(resume_text: dict, job_context):
+    """
+    Phase 4.2:
+    Resume embedding (reused across jobs when possible).
+    Returns (resume_embedding, model_name).
+    """
+    resume_hash = resume_text["resumeHash"]
+    normalized_resume_text = resume_text["normalizedText"]
 
-        logger.info("Phase-3 Step-3: Checking for duplicates\n")
+    # ----  Build embedding texts ----
+    logger.info("Embedding starts!")
 
-        duplicate = find_duplicate(resume_hash, job_hash)
+    # ----  Generate embeddings (job embedding comes from the job context) ----
+    # Same resume text screened for another job → reuse its vector
+    resume_embedding = None
+    model_name = job_context.embedding_model
 
-        if duplicate:
-            logger.info(
-                f"Duplicate found. Reusing results from ResumeProcessing={duplicate['_id']}\n"
-            )
+    if RESUME_EMBEDDING_REUSE_ENABLED:
+        resume_embedding = load_resume_embedding(resume_hash, model_name)
 
-            mark_as_duplicate(
-                current_processing_id=resume_processing_id,
-                source_processing_doc=duplicate
-            )
+    if resume_embedding is None:
+        resume_embedding_text = build_resume_embedding_text(normalized_resume_text)
+        resume_embedding, model_name = generate_embedding(resume_embedding_text)
 
-            return {
-                "resumeProcessingId": resume_processing_id,
-                "status": "completed",
-                "result": "cache",
-                "duplicateOf": str(duplicate["_id"])
-            }
-
-        # No duplicate → store hashes and continue pipeline
-        resume_processings_collection.update_one(
-            {"_id": ObjectId(resume_processing_id)},
-            {
-                "$set": {
-                    "resumeHash": resume_hash,
-                    "jobHash": job_hash,
-                    "normalizedResumeText": normalized_resume_text
-                }
-            }
-        )
+        if RESUME_EMBEDDING_REUSE_ENABLED:
+            save_resume_embedding(resume_hash, model_name, resume_embedding)
+    else:
+        logger.info("Resume embedding reused from another job\n")
 
-        logger.info("No duplicate found, moving to Phase-4\n")
+    return resume_embedding, model_name
 
-        # ----  Build embedding texts ----
-        logger.info("Embedding starts!")
-        resume_embedding_text, job_embedding_text = build_embedding_texts(
-            normalized_resume_text,
-            normalized_job_text
-        )
 
-        # ----  Generate embeddings ----
-        resume_embedding, model_name = generate_embedding(resume_embedding_text)
-        job_embedding, _ = generate_embedding(job_embedding_text)
-
-
-        resume_processings_collection.update_one(
-            {"_id": ObjectId(resume_processing_id)},
-            {
-                "$set": {
-                    "resumeEmbedding": resume_embedding,
-                    "jobEmbedding": job_embedding,
-                    "embeddingModel": model_name,
-                    "embeddingStatus": "completed",
-                }
-            }
-        )
+def embed_resumes(resume_texts: list[dict], job_context) -> list[tuple]:
+    """
+    Phase 4.2 for several resumes of the SAME job:
+    reused vectors first, then ONE embed_many call for all the rest.
+    Returns [(resume_embedding, model_name), ...] in input order.
+    """
+    results = [None] * len(resume_texts)
 
-        logger.info("Phase 4.2 embeddings generated and stored\n")
+    if RESUME_EMBEDDING_REUSE_ENABLED:
+        for i, resume_text in enumerate(resume_texts):
+            embedding = load_resume_embedding(resume_text["resumeHash"], job_context.embedding_model)
+            if embedding is not None:
+                results[i] = (embedding, job_context.embedding_model)
 
-        # ---- Pre-filtering ----
-        similarity_score = cosine_similarity(
-            resume_embedding,
-            job_embedding
-        )
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    if missing:
+        embeddings, model_name = generate_embeddings([
+            build_resume_embedding_text(resume_texts[i]["normalizedText"])
+            for i in missing
+        ])
+
+        for i, embedding in zip(missing, embeddings):
+            results[i] = (embedding, model_name)
+
+            if RESUME_EMBEDDING_REUSE_ENABLED:
+                save_resume_embedding(resume_texts[i]["resumeHash"], model_name, embedding)
+
+    logger.info(f"Embedded {len(missing)}/{len(resume_texts)} resumes in one call\n")
+
+    return results
+
+
+def score_resume(
+    job_payload,
+    resume_text: dict,
+    job_context,
+    resume_embedding,
+    model_name: str,
+    writer: ResumeProcessingWriter,
+    similarity_score: float | None = None,
+):
+    """
+    Phase 4.2 - 5A:
+    Store embeddings, extract features, pre-filter, explain and score.
+    CPU only (plus checkpoint flushes); all results are staged on `writer`.
+    `similarity_score` is passed when the caller scored a whole group at once
+    (similarity_matrix), else it is computed here.
+    """
+    resume_processing_id = job_payload["resumeProcessingId"]
+    job_description_id = job_payload["jobDescriptionId"]
+    normalized_resume_text = resume_text["normalizedText"]
+    job_doc = job_context.job_doc
+
+    job_embedding = job_context.job_embedding
 
-        prefilter_result = prefilter_resume(
-            similarity_score=similarity_score,
-            normalized_resume_text=normalized_resume_text,
-            required_skills=job_doc.get("required_skills", [])
-        )
 
+    embedding_fields = {
+        "resumeEmbedding": encode_embedding(resume_embedding, EMBEDDING_STORAGE_FORMAT),
+        "embeddingFormat": EMBEDDING_STORAGE_FORMAT,
+        "embeddingModel": model_name,
+        "embeddingStatus": "completed",
+    }
 
-        resume_processings_collection.update_one(
-            {"_id": ObjectId(resume_processing_id)},
-            {
-            "$set": {
-                "preFilter": prefilter_result,
-                "passFail": "passed" if prefilter_result.get("passed") else "failed"
-            }
-            }
+    # Binary formats store the job embedding once per job and reference it
+    if job_context.job_embedding_ref:
+        embedding_fields["jobEmbeddingRef"] = job_context.job_embedding_ref
+    else:
+        embedding_fields["jobEmbedding"] = job_embedding
+
+    writer.set(embedding_fields)
+    writer.checkpoint("embeddings")
+
+    logger.info("Phase 4.2 embeddings generated and stored\n")
+
+    # ---- Pre-filtering ----
+    if similarity_score is None:
+        similarity_score = similarity(
+            resume_embedding,
+            job_embedding,
+            model_name,
         )
 
-        logger.info(
-            f"Phase 4.3 pre-filter completed | "
-            f"passed={prefilter_result['passed']} | "
-            f"similarity={prefilter_result['similarityScore']}\n"
+    # ONE pass over the resume: skills, experience years, sections.
+    # The record is persisted and reused by explanations and ranking.
+    features, skill_matches = extract_resume_features(
+        normalized_resume_text,
+        job_context.skill_matcher,
+        required_years=job_doc.get("min_experience_years", 0),
+    )
+
+    prefilter_result = prefilter_resume(
+        similarity_score=similarity_score,
+        normalized_resume_text=normalized_resume_text,
+        required_skills=job_doc.get("required_skills", []),
+        skill_matches=skill_matches,
+    )
+
+
+    writer.set({
+        "features": features,
+        "preFilter": prefilter_result,
+        "passFail": "passed" if prefilter_result.get("passed") else "failed"
+    })
+    writer.checkpoint("prefilter")
+
+    logger.info(
+        f"Phase 4.3 pre-filter completed | "
+        f"passed={prefilter_result['passed']} | "
+        f"similarity={prefilter_result['similarityScore']}\n"
+    )
+
+    # --- Explanation ------
+    logger.info("Building explanation!")
+    logger.info("- Building skill explanation...")
+    skills_explanation = build_skill_explanation(
+        required_skills=job_doc["required_skills"],
+        preferred_skills=job_doc.get("preferred_skills", []),
+        normalized_resume_text=normalized_resume_text,
+        features=features,)
+    
+
+    writer.set({"explanation.skills": skills_explanation})
+
+    logger.info("Building decision explanation...")
+    decision_explanation = build_decision_explanation(
+        prefilter=prefilter_result,
+        skills_explanation=skills_explanation,
+        experience_info=experience_info(features),
+    )
+
+    writer.set({"explanation.decision": decision_explanation})
+
+
+    if prefilter_result["passed"]:
+        logger.info("Building score breakdown...")
+
+        required_skill_ratio = features["requiredSkillRatio"]
+        preferred_skill_ratio = features["preferredSkillRatio"]
+        experience_ratio = features["experienceRatio"]
+
+        score_breakdown = build_score_breakdown(
+            semantic_similarity=prefilter_result["similarityScore"],
+            required_skill_ratio=required_skill_ratio,
+            preferred_skill_ratio=preferred_skill_ratio,
+            experience_ratio=experience_ratio,
         )
 
-        extracted_experience_years = extract_experience_years(normalized_resume_text)
+        # --- ranking -------
+        # Score is computed ONCE per resume; ranks are materialized
+        # for the whole batch when it settles (see ranking.py)
+        final_score = compute_final_score(
+            semantic_similarity=prefilter_result["similarityScore"],
+            required_skill_match_ratio=required_skill_ratio,
+            preferred_skill_match_ratio=preferred_skill_ratio,
+            experience_match_ratio=experience_ratio,
+        )
 
+        writer.set({
+            "explanation.scoreBreakdown": score_breakdown,
+            "explanation.experience": experience_info(features),
+            "finalScore": final_score,
+            "rankingStatus": "pending",
+        })
 
-        # --- ranking -------
-        logger.info("Ranking starts")
-        rank_resumes_in_batch(
+        record_resume_score(
             batch_id=job_payload["batchId"],
             job_description_id=job_description_id,
-            required_skills=job_doc.get("required_skills", []),
-            preferred_skills=job_doc.get("preferred_skills", []),
-            min_experience_years=job_doc.get("min_experience_years", 0),
-        )        
-
-        logger.info("Ranking ends!")
-
-        # --- Explanation ------
-        logger.info("Building explanation!")
-        logger.info("- Building skill explanation...")
-        skills_explanation = build_skill_explanation(
-            required_skills=job_doc["required_skills"],
-            preferred_skills=job_doc.get("preferred_skills", []),
-            normalized_resume_text=normalized_resume_text,)
-        
-
-        resume_processings_collection.update_one(
-            {
-                "_id": ObjectId(resume_processing_id),
-            },
-            {
-                "$set": {
-                    "explanation.skills": skills_explanation
-                }
-            }
+            resume_processing_id=resume_processing_id,
+            final_score=final_score,
         )
 
-        logger.info("Building decision explanation...")
-        decision_explanation = build_decision_explanation(
-            prefilter=prefilter_result,
-            skills_explanation=skills_explanation,
-            experience_info={
-                "requiredYears": job_doc.get("min_experience_years", 0),
-                "candidateYears": extracted_experience_years,
-                "meetsRequirement": extracted_experience_years
-                >= job_doc.get("min_experience_years", 0),
-            },
-        )
+        logger.info(f"Resume scored | finalScore={final_score}")
 
-        resume_processings_collection.update_one(
-            {
-                "_id": ObjectId(resume_processing_id),
-            },
-            {
-                "$set": {
-                    "explanation.decision": decision_explanation
-                }
-            }
-        )
+    if not prefilter_result["passed"]:
+        writer.set({"rankingStatus": "skipped"})
 
+    writer.checkpoint("explanation")
 
-        if prefilter_result["passed"]:
-            logger.info("Building score breakdown...")
-
-            score_breakdown = build_score_breakdown(
-                semantic_similarity=prefilter_result["similarityScore"],
-                required_skill_ratio=compute_skill_match_ratio(
-                    normalized_resume_text,
-                    job_doc.get("required_skills", [])
-                ),
-                preferred_skill_ratio=compute_skill_match_ratio(
-                    normalized_resume_text,
-                    job_doc.get("preferred_skills", [])
-                ),
-                experience_ratio=compute_experience_match_ratio(
-                    extracted_years=extracted_experience_years,
-                    required_years=job_doc.get("min_experience_years", 0),
-                ),
-            )
+    return {
+        "result": "completed",
+        "resumeProcessingId": resume_processing_id,
+        "isDuplicate": False
+    }
 
-            resume_processings_collection.update_one(
-                { "_id": ObjectId(resume_processing_id) },
-                {
-                    "$set": {
-                        "explanation.scoreBreakdown": score_breakdown,
-                        "explanation.experience": {
-                            "requiredYears": job_doc.get("min_experience_years", 0),
-                            "candidateYears": extracted_experience_years,
-                            "meetsRequirement": extracted_experience_years
-                            >= job_doc.get("min_experience_years", 0),
-                        },
-                    }
-                }
-            )
 
-        if not prefilter_result["passed"]:
-            resume_processings_collection.update_one(
-                { "_id": ObjectId(resume_processing_id) },
-                {
-                    "$set": {
-                        "rankingStatus": "skipped"
-                    }
-                }
-            )
+def process_resume(job_payload, writer: ResumeProcessingWriter | None = None):
+    """
+    Phase 3 - Step 1:
+    Download resume + extract raw text, then run the stages below in order.
+    The async worker (app/queues/async_batch_worker.py) runs the same stages
+    on its own executors.
 
+    All ResumeProcessing fields are staged on `writer`. When the caller passes
+    a writer it owns the final flush (together with the terminal status);
+    otherwise a private writer is flushed before returning.
+    """
+    owns_writer = writer is None
 
+    try:
+        if owns_writer:
+            writer = ResumeProcessingWriter(job_payload["resumeProcessingId"])
 
-        # More steps to go
+        # 1-3. Download + extract + normalize (extraction cache aware)
+        resume_text = fetch_resume_text(job_payload["resumeUrl"])
 
-        return {
-            "result": "completed",
-            "resumeProcessingId": resume_processing_id,
-            "isDuplicate": False
-        }           
+        logger.info(
+            f"Normalized resume text length={len(resume_text['normalizedText'])}\n"
+        )
+
+        # 4. ---- HASHING ----
+        # Job doc / normalized text / hash / embedding are shared by every
+        # resume of this job → served from the job context cache
+        job_context = get_job_context(job_payload["jobDescriptionId"])
 
+        logger.info("Hashes computed successfully\n")
+
+        # 5-6. Dedup → embeddings → features / pre-filter / explanation / score
+        result = check_duplicate(job_payload, resume_text, job_context, writer)
+
+        if result is None:
+            resume_embedding, model_name = embed_resume(resume_text, job_context)
+
+            result = score_resume(
+                job_payload, resume_text, job_context, resume_embedding, model_name, writer
+            )
+
+        if owns_writer:
+            writer.flush()
+
+        return result
 
     except Exception as e:
         logger.exception(f"process_resume failed: {e}\n")
         raise
-
-    finally:
-        # 🧹 cleanup temp file
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
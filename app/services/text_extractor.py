@@ -1,25 +1,40 @@
-from pdfminer.high_level import extract_text
-from docx import Document
+from app.services.pdf_engine import extract_pdf
 
-def extract_text_from_pdf(file_path: str) -> str:
-    return extract_text(file_path)
+def extract_text_from_pdf(source) -> str:
+    return extract_pdf(source)["text"]
 
-def extract_text_from_docx(file_path: str) -> str:
-    doc = Document(file_path)
+def extract_text_from_docx(source) -> str:
+    # Lazy: python-docx is only needed for the (rare) docx resume
+    from docx import Document
+
+    doc = Document(source)
     return "\n".join([p.text for p in doc.paragraphs])
 
-def extract_raw_text(file_path: str, mime_type: str) -> str:
+def extract_document(source, mime_type: str) -> dict:
+    """
+    Like extract_raw_text, plus whether the WHOLE document was read.
+    `complete` is False when the PDF time budget cut extraction short
+    (partial text must not be cached as the file's text).
+    """
+    if mime_type == "application/pdf":
+        pdf = extract_pdf(source)
+        return {"text": pdf["text"], "complete": not pdf["timedOut"]}
+
+    return {"text": extract_raw_text(source, mime_type), "complete": True}
+
+def extract_raw_text(source, mime_type: str) -> str:
     """
     Extracts raw text using only PDF/DOCX extractors.
     No parsing, no section handling — Phase 3 ONLY needs plain text.
+    `source` is a file path or a seekable binary file object (in-memory download).
     """
     if mime_type == "application/pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
 
     if mime_type in [
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "application/msword"
     ]:
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source)
 
     raise ValueError(f"Unsupported resume format: {mime_type}")
@@ -0,0 +1,86 @@
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from app.utils.mongo import resume_processings_collection
+from app.utils.settings import WRITE_CHECKPOINTS
+
+
+class ResumeProcessingWriter:
+    """
+    Unit of work for ONE ResumeProcessing document.
+
+    Pipeline stages stage `$set` fields here instead of issuing their own
+    update_one. Everything is flushed in a single write at the end of the job,
+    or earlier at the checkpoints listed in WRITE_CHECKPOINTS.
+    """
+
+    def __init__(self, resume_processing_id, checkpoints=None):
+        self.resume_processing_id = resume_processing_id
+        self.checkpoints = set(WRITE_CHECKPOINTS if checkpoints is None else checkpoints)
+        self.flush_count = 0
+        self._pending = {}
+
+    def set(self, fields: dict):
+        """Stage fields for the next flush (last write wins per field)."""
+
+        # Mongo rejects "a" and "a.b" in the same $set → flush the older one first
+        if any(self._conflicts(key) for key in fields):
+            self.flush()
+
+        self._pending.update(fields)
+
+    def checkpoint(self, stage: str):
+        """Flush early if this stage is configured as a crash-safety checkpoint."""
+        if stage in self.checkpoints:
+            self.flush()
+
+    def flush(self) -> bool:
+        if not self._pending:
+            return False
+
+        resume_processings_collection.update_one(
+            {"_id": ObjectId(self.resume_processing_id)},
+            {"$set": self._pending},
+        )
+
+        self._pending = {}
+        self.flush_count += 1
+        return True
+
+    def discard(self):
+        """Drop staged fields (job failed → retry recomputes everything)."""
+        self._pending = {}
+
+    @property
+    def pending(self) -> dict:
+        return dict(self._pending)
+
+    def _conflicts(self, key: str) -> bool:
+        return any(
+            key != staged
+            and (key.startswith(f"{staged}.") or staged.startswith(f"{key}."))
+            for staged in self._pending
+        )
+
+
+def flush_writers(writers: list[ResumeProcessingWriter]) -> int:
+    """
+    Flushes many writers (one document each) in ONE unordered bulk write.
+    Returns the number of documents written.
+    """
+    operations = [
+        UpdateOne({"_id": ObjectId(writer.resume_processing_id)}, {"$set": writer._pending})
+        for writer in writers
+        if writer._pending
+    ]
+
+    if not operations:
+        return 0
+
+    resume_processings_collection.bulk_write(operations, ordered=False)
+
+    for writer in writers:
+        if writer._pending:
+            writer._pending = {}
+            writer.flush_count += 1
+
+    return len(operations)
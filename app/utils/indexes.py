@@ -0,0 +1,197 @@
+"""
+Index bootstrap for the worker's hot queries.
+
+    python -m app.utils.indexes            # apply (idempotent), rebuild changed indexes
+    python -m app.utils.indexes --check    # apply + fail on any COLLSCAN
+"""
+import sys
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.utils.mongo import db
+from app.utils.settings import ANALYSIS_CACHE_TTL_SECONDS
+
+# Mongo error codes for "same name / keys, different options"
+INDEX_CONFLICT_CODES = {85, 86}
+
+# -------------------------
+# Declared indexes (collection → IndexModel list)
+# -------------------------
+INDEXES = {
+    "resumeprocessings": [
+        # find_duplicate: only COMPLETED docs can be a dedup source
+        IndexModel(
+            [("resumeHash", ASCENDING), ("jobHash", ASCENDING)],
+            name="dedup_completed",
+            partialFilterExpression={"status": "completed"},
+        ),
+        # is_batch_settled: any doc of the batch not completed / failed
+        IndexModel(
+            [("batchId", ASCENDING), ("jobDescriptionId", ASCENDING), ("status", ASCENDING)],
+            name="batch_status",
+        ),
+        # _reseed_from_mongo: passed resumes of the batch only
+        IndexModel(
+            [("batchId", ASCENDING), ("jobDescriptionId", ASCENDING)],
+            name="batch_ranking_passed",
+            partialFilterExpression={"preFilter.passed": True},
+        ),
+    ],
+    "analysiscache": [
+        # Expiry of cached LLM analyses (ANALYSIS_CACHE_BACKEND=mongo)
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="analysis_cache_ttl",
+            expireAfterSeconds=ANALYSIS_CACHE_TTL_SECONDS,
+        ),
+    ],
+}
+
+# -------------------------
+# Hot queries (same filter shapes as the code paths)
+# -------------------------
+HOT_QUERIES = {
+    "find_duplicate": (
+        "resumeprocessings",
+        {"resumeHash": "x", "jobHash": "x", "status": "completed"},
+    ),
+    "is_batch_settled": (
+        "resumeprocessings",
+        {"batchId": "x", "jobDescriptionId": ObjectId(), "status": {"$nin": ["completed", "failed"]}},
+    ),
+    "reseed_ranking": (
+        "resumeprocessings",
+        {
+            "batchId": "x",
+            "jobDescriptionId": ObjectId(),
+            "preFilter.passed": True,
+            "$or": [{"finalScore": {"$ne": None}}, {"features": {"$exists": True}}],
+        },
+    ),
+    "analysis_by_id": (
+        "resumeprocessings",
+        {"_id": ObjectId()},
+    ),
+}
+
+
+def _update_ttl(collection_name: str, model: IndexModel) -> bool:
+    """
+    A TTL-only change (same keys, new expireAfterSeconds) is applied in place
+    with collMod. Returns False when the index differs in anything else.
+    """
+    spec = model.document
+    if "expireAfterSeconds" not in spec:
+        return False
+
+    existing = db[collection_name].index_information().get(spec["name"])
+    if existing is None or dict(existing["key"]) != dict(spec["key"]):
+        return False
+
+    other_options = {key: value for key, value in spec.items() if key not in ("key", "name", "expireAfterSeconds")}
+    if any(existing.get(key) != value for key, value in other_options.items()):
+        return False
+
+    db.command(
+        "collMod",
+        collection_name,
+        index={"name": spec["name"], "expireAfterSeconds": spec["expireAfterSeconds"]},
+    )
+    return True
+
+
+def ensure_indexes(rebuild: bool = False) -> dict:
+    """
+    Create every declared index. Existing identical indexes are a no-op;
+    a changed TTL is updated in place (collMod). Any other changed
+    declaration is only reported, unless `rebuild` (CLI): then the index is
+    dropped and rebuilt — never done at worker startup, where several
+    processes would race on drop / create.
+
+    Returns: {collection: [index names]}
+    """
+    applied = {}
+
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        names = []
+
+        for model in models:
+            name = model.document["name"]
+
+            try:
+                collection.create_indexes([model])
+
+            except OperationFailure as e:
+                if e.code not in INDEX_CONFLICT_CODES:
+                    raise
+
+                if _update_ttl(collection_name, model):
+                    print(f"⏱️ Index {collection_name}.{name} TTL updated")
+
+                elif rebuild:
+                    print(f"♻️ Index {collection_name}.{name} changed, rebuilding")
+                    collection.drop_index(name)
+                    collection.create_indexes([model])
+
+                else:
+                    print(
+                        f"⚠ Index {collection_name}.{name} differs from its declaration, kept as is "
+                        f"(rebuild with python -m app.utils.indexes)"
+                    )
+                    continue
+
+            names.append(name)
+
+        applied[collection_name] = names
+
+    return applied
+
+
+def _plan_stages(plan: dict) -> list[str]:
+    stages = [plan.get("stage")]
+    for child in ("inputStage", "queryPlan"):
+        if child in plan:
+            stages += _plan_stages(plan[child])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return [stage for stage in stages if stage]
+
+
+def check_query_plans() -> dict:
+    """
+    Explain every hot query; raises if a winning plan falls back to COLLSCAN.
+
+    Returns: {query name: [winning plan stages]}
+    """
+    plans = {}
+    collscans = []
+
+    for name, (collection_name, query) in HOT_QUERIES.items():
+        explain = db[collection_name].find(query).explain()
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+
+        plans[name] = stages
+        if "COLLSCAN" in stages:
+            collscans.append(name)
+
+    if collscans:
+        raise RuntimeError(f"Hot queries without an index (COLLSCAN): {', '.join(collscans)}")
+
+    return plans
+
+
+if __name__ == "__main__":
+    for collection_name, names in ensure_indexes(rebuild=True).items():
+        print(f"✅ {collection_name}: {', '.join(names)}")
+
+    if "--check" in sys.argv:
+        try:
+            plans = check_query_plans()
+        except RuntimeError as e:
+            sys.exit(f"❌ {e}")
+
+        for name, stages in plans.items():
+            print(f"🔎 {name}: {' ← '.join(stages)}")
@@ -1,23 +1,72 @@
 import os
+import threading
 from dotenv import load_dotenv
-from pymongo import MongoClient
 
 load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
 # -------------------------
-# Mongo connection
+# Mongo connection (created on first use, NOT at import:
+# importing a worker module never resolves DNS / opens sockets)
 # -------------------------
 
 MONGO_URI = os.getenv("MONGO_URI_PY")
-if not MONGO_URI:
-    raise RuntimeError("MONGO_URI_PY not set in env")
 
-client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=10000, maxPoolSize=20)
-db = client.get_default_database()  # picks DB from connection string
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client, _client_pid
+
+    # A forked child must not reuse the parent's sockets (pymongo is not fork-safe)
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                if not MONGO_URI:
+                    raise RuntimeError("MONGO_URI_PY not set in env")
+
+                from pymongo import MongoClient
+
+                _client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=10000, maxPoolSize=20)
+                _client_pid = os.getpid()
+
+    return _client
+
+
+def get_db():
+    return get_client().get_default_database()  # picks DB from connection string
+
 
 def ping():
     # quick connectivity check
-    return client.server_info()  # will raise on failure
+    return get_client().server_info()  # will raise on failure
+
+
+class LazyDatabase:
+    """`db[...]` / `db.name` resolved against the lazily created client."""
+
+    def __getitem__(self, name: str):
+        return get_db()[name]
+
+    def __getattr__(self, name: str):
+        return getattr(get_db(), name)
+
+
+class LazyCollection:
+    """Module-level collection handle; the client is created on the first call."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr: str):
+        return getattr(get_db()[self.name], attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+db = LazyDatabase()
 
 
 # -------------------------
@@ -25,8 +74,11 @@ def ping():
 # -------------------------
 
 # Stage-4 orchestration collection
-resume_processings_collection = db["resumeprocessings"]
-parsed_resume_collection = db["parsedresumes"]
-resume_analysis_collection = db["resumeanalyses"]
-job_descriptions_collection = db["jobs"]
-batches = db["batches"]
+resume_processings_collection = LazyCollection("resumeprocessings")
+parsed_resume_collection = LazyCollection("parsedresumes")
+resume_analysis_collection = LazyCollection("resumeanalyses")
+job_descriptions_collection = LazyCollection("jobs")
+job_embeddings_collection = LazyCollection("jobembeddings")
+resume_embeddings_collection = LazyCollection("resumeembeddings")
+batches = LazyCollection("batches")
+analysis_cache_collection = LazyCollection("analysiscache")
@@ -0,0 +1,8 @@
+import redis
+from app.utils.settings import REDIS_URL
+
+# -------------------------
+# Redis connection shared by worker modules
+# -------------------------
+
+redis_conn = redis.from_url(REDIS_URL)
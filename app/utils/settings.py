@@ -1,13 +1,190 @@
 import os
+from dotenv import load_dotenv
+
+load_dotenv(f".env.{os.getenv('ENV', 'development')}")
 
 # ---- LLM CONFIG ----
 LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash")
-LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1500"))
+# Output cap; on 2.5 models it also covers thinking tokens
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "4096"))
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+# Prompt input budget (estimated tokens): the resume is compacted to fit
+LLM_INPUT_TOKEN_BUDGET = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", "6000"))
+LLM_JOB_TOKEN_BUDGET = int(os.getenv("LLM_JOB_TOKEN_BUDGET", "1500"))
+LLM_RESUME_MIN_TOKENS = int(os.getenv("LLM_RESUME_MIN_TOKENS", "1000"))
+
+# "gemini", "http" (POST {LLM_SERVER_URL}/generate, e.g. benchmarks/fake_llm_server.py)
+# or "mock" (deterministic, offline)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+LLM_SERVER_URL = os.getenv("LLM_SERVER_URL", "http://127.0.0.1:8091")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "32"))
+LLM_MOCK_LATENCY_MS = float(os.getenv("LLM_MOCK_LATENCY_MS", "0"))
+
+# ---- LLM RATE LIMIT (shared by every analysis worker through Redis, 0 → unlimited) ----
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "300"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "1000000"))
+LLM_RATE_LIMIT_PREFIX = os.getenv("LLM_RATE_LIMIT_PREFIX", "llm:ratelimit")
+# 429 → every worker pauses; the pause doubles per 429 until a quiet period resets it
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "2"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+LLM_BACKOFF_RESET_SECONDS = int(os.getenv("LLM_BACKOFF_RESET_SECONDS", "120"))
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+
+# ---- ASYNC ANALYSIS WORKER (ANALYSIS_WORKER_MODE=async) ----
+ANALYSIS_MAX_IN_FLIGHT = int(os.getenv("ANALYSIS_MAX_IN_FLIGHT", "16"))
 
 # ---- ANALYSIS RETRY CONFIG ----
 ANALYSIS_MAX_RETRIES = int(os.getenv("ANALYSIS_MAX_RETRIES", "3"))
 ANALYSIS_BASE_DELAY = int(os.getenv("ANALYSIS_BASE_DELAY", "5"))  # seconds
 
+# ---- ANALYSIS CACHE (LLM outputs keyed by resumeHash + jobHash + prompt + model) ----
+# "redis", "mongo" (analysiscache collection, TTL index) or "none"
+ANALYSIS_CACHE_BACKEND = os.getenv("ANALYSIS_CACHE_BACKEND", "redis")
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
 # ---- REDIS ----
-REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379")
\ No newline at end of file
+REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379")
+
+# ---- RANKING ----
+# Per-batch ordered score sets live in Redis until the batch is materialized
+RANKING_KEY_PREFIX = os.getenv("RANKING_KEY_PREFIX", "ranking")
+RANKING_KEY_TTL_SECONDS = int(os.getenv("RANKING_KEY_TTL_SECONDS", str(7 * 24 * 3600)))
+# Rank materialization: UpdateOne ops per unordered bulk_write
+RANKING_WRITE_CHUNK_SIZE = int(os.getenv("RANKING_WRITE_CHUNK_SIZE", "1000"))
+# Queue the backend enqueues {"batchId", "jobDescriptionId"} into to finalize a batch
+RANKING_QUEUE_NAME = os.getenv("RANKING_QUEUE_NAME", "batch-ranking")
+# Failed finalize tasks are retried with exponential backoff through this retry set
+RANKING_RETRY_SET = os.getenv("RANKING_RETRY_SET", "rq:retry:ranking")
+RANKING_MAX_RETRIES = int(os.getenv("RANKING_MAX_RETRIES", "5"))
+RANKING_BASE_DELAY_SECONDS = int(os.getenv("RANKING_BASE_DELAY_SECONDS", "5"))
+
+# ---- RESUME PROCESSING WRITES ----
+# Pipeline stages that flush staged fields early (crash-safety), comma separated.
+# Known stages: hashes, embeddings, prefilter, explanation. Empty → one write per job.
+WRITE_CHECKPOINTS = [
+    stage.strip()
+    for stage in os.getenv("WRITE_CHECKPOINTS", "").split(",")
+    if stage.strip()
+]
+
+# ---- JOB CONTEXT CACHE ----
+# Per-job doc / normalized text / hash / embedding, shared by every resume of a job
+JOB_CONTEXT_CACHE_SIZE = int(os.getenv("JOB_CONTEXT_CACHE_SIZE", "64"))
+JOB_CONTEXT_TTL_SECONDS = int(os.getenv("JOB_CONTEXT_TTL_SECONDS", "300"))
+JOB_CONTEXT_REDIS_ENABLED = os.getenv("JOB_CONTEXT_REDIS_ENABLED", "true").lower() == "true"
+JOB_CONTEXT_REDIS_TTL_SECONDS = int(os.getenv("JOB_CONTEXT_REDIS_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# ---- EMBEDDINGS ----
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "minilm")
+# Micro-batching executor: flush when the batch is full or the oldest text waited long enough.
+# Off by default (a one-resume-at-a-time worker has nothing to batch);
+# start_batch_workers turns it on for BATCH_WORKER_MODE=async
+EMBED_BATCHING_ENABLED = os.getenv("EMBED_BATCHING_ENABLED", "false").lower() == "true"
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+EMBED_BATCH_RESULT_TIMEOUT_SECONDS = float(os.getenv("EMBED_BATCH_RESULT_TIMEOUT_SECONDS", "60"))
+
+# ---- EMBEDDING SERVER (optional sidecar owning ONE model per node) ----
+EMBEDDING_SERVER_ENABLED = os.getenv("EMBEDDING_SERVER_ENABLED", "false").lower() == "true"
+EMBEDDING_SERVER_HOST = os.getenv("EMBEDDING_SERVER_HOST", "127.0.0.1")
+EMBEDDING_SERVER_PORT = int(os.getenv("EMBEDDING_SERVER_PORT", "8765"))
+EMBEDDING_SERVER_URL = os.getenv(
+    "EMBEDDING_SERVER_URL", f"http://{EMBEDDING_SERVER_HOST}:{EMBEDDING_SERVER_PORT}"
+)
+# Provider the sidecar wraps (clients use EMBEDDING_PROVIDER=remote)
+EMBEDDING_SERVER_PROVIDER = os.getenv("EMBEDDING_SERVER_PROVIDER", "minilm")
+EMBEDDING_SERVER_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_TIMEOUT", "30"))  # seconds
+EMBEDDING_SERVER_STARTUP_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_STARTUP_TIMEOUT", "120"))  # seconds
+
+# ---- EMBEDDING STORAGE ----
+# "list" (BSON double array, legacy), "float32" or "int8" (BSON binary, see embeddings/codec.py)
+EMBEDDING_STORAGE_FORMAT = os.getenv("EMBEDDING_STORAGE_FORMAT", "list")
+
+# ---- RESUME DOWNLOAD ----
+DOWNLOAD_MAX_BYTES = int(os.getenv("DOWNLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(64 * 1024)))
+DOWNLOAD_CONNECT_TIMEOUT = float(os.getenv("DOWNLOAD_CONNECT_TIMEOUT", "5"))  # seconds
+DOWNLOAD_READ_TIMEOUT = float(os.getenv("DOWNLOAD_READ_TIMEOUT", "30"))  # seconds
+DOWNLOAD_POOL_SIZE = int(os.getenv("DOWNLOAD_POOL_SIZE", "10"))
+# Files up to this size stay in memory and go straight to the extractor (0 → always temp file)
+DOWNLOAD_SPOOL_MAX_BYTES = int(os.getenv("DOWNLOAD_SPOOL_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# ---- ASYNC BATCH WORKER (app/queues/async_batch_worker.py) ----
+# Resumes in flight per worker process
+PIPELINE_MAX_IN_FLIGHT = int(os.getenv("PIPELINE_MAX_IN_FLIGHT", "8"))
+# Per-stage concurrency limits
+PIPELINE_FETCH_CONCURRENCY = int(os.getenv("PIPELINE_FETCH_CONCURRENCY", "8"))
+PIPELINE_EXTRACT_CONCURRENCY = int(os.getenv("PIPELINE_EXTRACT_CONCURRENCY", "2"))
+PIPELINE_EMBED_CONCURRENCY = int(os.getenv("PIPELINE_EMBED_CONCURRENCY", "8"))
+PIPELINE_SCORE_CONCURRENCY = int(os.getenv("PIPELINE_SCORE_CONCURRENCY", "2"))
+# Threads for blocking I/O (HTTP, Mongo) and for CPU stages (pdfminer, scoring)
+PIPELINE_IO_THREADS = int(os.getenv("PIPELINE_IO_THREADS", "16"))
+PIPELINE_CPU_THREADS = int(os.getenv("PIPELINE_CPU_THREADS", "2"))
+
+# ---- RETRY SCHEDULER (app/queues/scheduler.py) ----
+# Jobs moved per Lua call (a ZSET with more due jobs is drained in several calls)
+RETRY_SCHED_BATCH_LIMIT = int(os.getenv("RETRY_SCHED_BATCH_LIMIT", "500"))
+# Longest sleep when nothing is due (safety net for missed wake-ups)
+RETRY_SCHED_MAX_SLEEP = float(os.getenv("RETRY_SCHED_MAX_SLEEP", "5"))
+# Workers publish here after scheduling a retry → the scheduler re-plans its sleep
+SCHEDULER_WAKEUP_CHANNEL = os.getenv("SCHEDULER_WAKEUP_CHANNEL", "rq:scheduler:wakeup")
+SCHEDULER_METRICS_PREFIX = os.getenv("SCHEDULER_METRICS_PREFIX", "rq:scheduler:metrics")
+
+# ---- BULK LEASING (BATCH_WORKER_MODE=bulk, app/queues/bulk_batch_worker.py) ----
+# Jobs leased per worker iteration
+BATCH_LEASE_SIZE = int(os.getenv("BATCH_LEASE_SIZE", "16"))
+# Leased jobs not acked by then are re-queued by scheduler.py (worker crash)
+BATCH_LEASE_TIMEOUT_SECONDS = int(os.getenv("BATCH_LEASE_TIMEOUT_SECONDS", "900"))
+BATCH_LEASE_SET = os.getenv("BATCH_LEASE_SET", "rq:lease")
+
+# ---- STAGED PIPELINE (BATCH_WORKER_MODE=staged, app/queues/stage_worker.py) ----
+# "fetch" consumes BATCH_QUEUE_NAME; later stages get their own queue + retry set
+STAGE_QUEUES = {
+    "extract": os.getenv("EXTRACT_QUEUE_NAME", "batch-extract"),
+    "embed": os.getenv("EMBED_QUEUE_NAME", "batch-embed"),
+    "score": os.getenv("SCORE_QUEUE_NAME", "batch-score"),
+}
+STAGE_RETRY_SETS = {
+    "extract": os.getenv("EXTRACT_RETRY_SET", "rq:retry:extract"),
+    "embed": os.getenv("EMBED_RETRY_SET", "rq:retry:embed"),
+    "score": os.getenv("SCORE_RETRY_SET", "rq:retry:score"),
+}
+# Downloaded resume bytes waiting for an extract worker
+STAGE_HANDOFF_TTL_SECONDS = int(os.getenv("STAGE_HANDOFF_TTL_SECONDS", str(24 * 3600)))
+
+# ---- PDF EXTRACTION ----
+# Pages after this are ignored (0 → no cap)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+# "default" (pdfminer LAParams), "tuned" (no box ordering / vertical detection) or "off"
+# (no layout analysis). Only "default" keeps the text — and so resumeHash / dedup /
+# analysis cache keys — identical to the original extractor; the others are opt-in
+PDF_LAYOUT_MODE = os.getenv("PDF_LAYOUT_MODE", "default")
+# Documents with at least this many pages are split across a process pool (0 → never)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_PAGES_PER_CHUNK = int(os.getenv("PDF_PAGES_PER_CHUNK", "4"))
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Extraction stops here and keeps the pages done so far (0 → no budget)
+PDF_TIME_BUDGET_SECONDS = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "10"))
+
+# ---- EXTRACTION CACHE (normalized text keyed by raw file bytes) ----
+# "disk" (local LRU shared by the workers of a node), "redis" or "none"
+EXTRACTION_CACHE_BACKEND = os.getenv("EXTRACTION_CACHE_BACKEND", "disk")
+# Holds full resume text (PII): private per-user directory (0700, files 0600), never a shared /tmp path
+EXTRACTION_CACHE_DIR = os.getenv(
+    "EXTRACTION_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "resume-worker", "extraction"),
+)
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Both tiers: entries older than this (since written) are never served
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+# Reuse resume embeddings across jobs, keyed by (resumeHash, embeddingModel)
+RESUME_EMBEDDING_REUSE_ENABLED = os.getenv("RESUME_EMBEDDING_REUSE_ENABLED", "true").lower() == "true"
+
+# ---- MONGO READS (app/services/resume_processings.py) ----
+# Documents per getMore for batch-wide cursors (ranking reseed)
+MONGO_CURSOR_BATCH_SIZE = int(os.getenv("MONGO_CURSOR_BATCH_SIZE", "1000"))
+
+# ---- MONGO INDEXES (app/utils/indexes.py) ----
+# Apply the declared indexes when the worker launchers start
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
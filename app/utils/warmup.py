@@ -0,0 +1,106 @@
+import importlib
+import time
+
+from app.utils.logger import logger
+from app.utils.settings import EMBEDDING_PROVIDER, EMBED_BATCHING_ENABLED
+
+
+PARSER_MODULES = (
+    "docx",
+    "pdfminer.converter",
+    "pdfminer.layout",
+    "pdfminer.pdfdocument",
+    "pdfminer.pdfinterp",
+    "pdfminer.pdfpage",
+    "pdfminer.pdfparser",
+)
+
+
+def _preload_parsers():
+    # Lazily imported by pdf_engine / text_extractor on the first resume
+    for module in PARSER_MODULES:
+        importlib.import_module(module)
+
+
+def _preload_embeddings():
+    # Loads the model weights (minilm) or the pooled sidecar session (remote)
+    if EMBED_BATCHING_ENABLED:
+        from app.embeddings.service import get_batcher
+        get_batcher(EMBEDDING_PROVIDER)
+    else:
+        from app.embeddings.factory import get_embedding_provider
+        get_embedding_provider(EMBEDDING_PROVIDER)
+
+
+def _preload_llm():
+    from app.ai.client import get_llm_backend
+    get_llm_backend()
+
+
+def _preload_nlp():
+    from app.services.extractors import get_nlp
+    get_nlp()
+
+
+def _connect():
+    from app.utils.mongo import ping
+    from app.utils.redis_client import redis_conn
+
+    redis_conn.ping()
+    ping()
+
+
+STEPS = {
+    "parsers": _preload_parsers,
+    "embeddings": _preload_embeddings,
+    "llm": _preload_llm,
+    "nlp": _preload_nlp,
+    "connections": _connect,
+}
+
+
+def warm_up(
+    parsers: bool = False,
+    embeddings: bool = False,
+    llm: bool = False,
+    nlp: bool = False,
+    connections: bool = False,
+) -> dict:
+    """
+    Loads what worker modules no longer load at import (pdfminer, docx,
+    embedding model, LLM client, spaCy), so the first job does not pay for it.
+
+    Called from a worker's __main__ BEFORE work(). Every worker here runs its
+    jobs in-process (execute_job is overridden, no work-horse fork), so
+    `connections` (Redis ping + Mongo client) is warmed for all of them too.
+
+    A failing step is logged, never raised: the job loads it lazily instead.
+    Returns: {step: milliseconds or "failed"}
+    """
+    enabled = {
+        "parsers": parsers,
+        "embeddings": embeddings,
+        "llm": llm,
+        "nlp": nlp,
+        "connections": connections,
+    }
+
+    timings = {}
+    started = time.perf_counter()
+
+    for name, step in STEPS.items():
+        if not enabled[name]:
+            continue
+
+        step_started = time.perf_counter()
+        try:
+            step()
+            timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        except Exception as e:
+            logger.warning(f"⚠ Warm-up step {name} failed: {e}\n")
+            timings[name] = "failed"
+
+    total = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"🔥 Warm-up done in {total} ms | {timings}\n")
+
+    return timings
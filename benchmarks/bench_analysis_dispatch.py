@@ -0,0 +1,152 @@
+"""
+Analysis dispatch benchmark — one blocking LLM call per process (sync RQ
+worker) vs AsyncAnalysisWorker keeping several calls in flight, against the
+local fake LLM server (benchmarks/fake_llm_server.py) with injected latency.
+
+Redis is fakeredis and Mongo is mongomock (see bench_async_pipeline). With
+--server-rpm below the offered load the server answers 429s and the shared
+rate limiter (--rpm / --tpm) has to absorb them. --provider mock uses the
+in-process deterministic backend instead (no sockets at all).
+
+    python -m benchmarks.bench_analysis_dispatch --jobs 40 --latency-ms 500 --in-flight 4 16
+    python -m benchmarks.bench_analysis_dispatch --provider mock --latency-ms 500
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import uuid
+
+from benchmarks.bench_async_pipeline import install_stand_ins, start_stand_in_server
+from benchmarks.fake_llm_server import FakeLLMHandler, start_fake_llm_server
+
+
+def enqueue_analyses(count: int) -> str:
+    from bson import ObjectId
+
+    from app.queues.analysis_worker import ANALYSIS_QUEUE
+    from app.utils.mongo import job_descriptions_collection, resume_processings_collection
+    from app.utils.redis_client import redis_conn
+
+    batch_id = f"bench-{uuid.uuid4()}"
+    job_description_id = ObjectId()
+    job_descriptions_collection.insert_one({
+        "_id": job_description_id,
+        "description": "Senior Data Engineer: python, docker, aws",
+        "required_skills": ["python", "docker"],
+        "preferred_skills": ["aws"],
+    })
+
+    for i in range(count):
+        resume_processing_id = resume_processings_collection.insert_one({
+            "batchId": batch_id,
+            "jobDescriptionId": job_description_id,
+            "externalResumeId": f"ext-{i}",
+            "status": "completed",
+            "resumeHash": uuid.uuid4().hex,
+            "jobHash": "bench-job",
+            "normalizedResumeText": "experience senior data engineer python docker aws pipelines " * 40,
+            "explanation": {"skills": {"matched": ["python", "docker"]}},
+        }).inserted_id
+
+        job_id = str(uuid.uuid4())
+        redis_conn.hset(f"rq:job:{job_id}", "data", json.dumps({"resumeProcessingId": str(resume_processing_id)}))
+        redis_conn.rpush(f"rq:queue:{ANALYSIS_QUEUE}", job_id)
+
+    return batch_id
+
+
+def run_sync() -> int:
+    from app.queues.analysis_worker import ANALYSIS_QUEUE, run_analysis_job
+    from app.utils.redis_client import redis_conn
+
+    processed = 0
+    while True:
+        job_id = redis_conn.lpop(f"rq:queue:{ANALYSIS_QUEUE}")
+        if job_id is None:
+            return processed
+
+        job_id = job_id.decode()
+        run_analysis_job(job_id, json.loads(redis_conn.hget(f"rq:job:{job_id}", "data")))
+        processed += 1
+
+
+def run_async(max_in_flight: int) -> int:
+    import asyncio
+
+    from app.queues.async_analysis_worker import AsyncAnalysisWorker
+
+    async def main():
+        return await AsyncAnalysisWorker(max_in_flight=max_in_flight, burst=True).work()
+
+    return asyncio.run(main())
+
+
+def report(label: str, batch_id: str, processed: int, elapsed: float):
+    from app.utils.mongo import resume_processings_collection
+
+    completed = resume_processings_collection.count_documents({"batchId": batch_id, "analysisStatus": "completed"})
+    stats = dict(FakeLLMHandler.stats)
+    server = f"   429s={stats['rateLimited']}   peak in flight={stats['maxInFlight']}" if stats["requests"] else ""
+    print(
+        f"{label:<26} {processed / elapsed:7.2f} analyses/s   {elapsed:6.2f} s   "
+        f"completed={completed}/{processed}{server}"
+    )
+    FakeLLMHandler.stats.update({"requests": 0, "rateLimited": 0, "maxInFlight": 0})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--server-rpm", type=int, default=0, help="fake server 429s above this rate (0 → never)")
+    parser.add_argument("--rpm", type=int, default=0, help="shared limiter requests/min (0 → unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="shared limiter tokens/min (0 → unlimited)")
+    parser.add_argument("--provider", choices=["http", "mock"], default="http")
+    parser.add_argument("--skip-sync", action="store_true")
+    args = parser.parse_args()
+
+    llm = start_fake_llm_server(latency_ms=args.latency_ms, rpm=args.server_rpm)
+    stand_in = start_stand_in_server()
+
+    os.environ.update({
+        "LLM_PROVIDER": args.provider,
+        "LLM_SERVER_URL": f"http://127.0.0.1:{llm.server_address[1]}",
+        "LLM_MOCK_LATENCY_MS": str(args.latency_ms),
+        "LLM_RPM_LIMIT": str(args.rpm),
+        "LLM_TPM_LIMIT": str(args.tpm),
+        "LLM_BACKOFF_BASE_SECONDS": "0.5",
+        "ANALYSIS_CACHE_BACKEND": "none",
+    })
+    install_stand_ins(f"http://127.0.0.1:{stand_in.server_address[1]}", mongo_latency=0)
+
+    from app.utils.logger import logger
+    logger.setLevel(logging.ERROR)
+
+    print(
+        f"{args.jobs} analyses/run | LLM {args.provider}, latency {args.latency_ms}ms | "
+        f"server rpm={args.server_rpm or '∞'} | limiter rpm={args.rpm or '∞'} tpm={args.tpm or '∞'}\n"
+    )
+
+    try:
+        if not args.skip_sync:
+            batch_id = enqueue_analyses(args.jobs)
+            started = time.perf_counter()
+            processed = run_sync()
+            report("sync worker", batch_id, processed, time.perf_counter() - started)
+
+        for in_flight in args.in_flight:
+            batch_id = enqueue_analyses(args.jobs)
+            started = time.perf_counter()
+            processed = run_async(in_flight)
+            report(f"async worker ({in_flight} in flight)", batch_id, processed, time.perf_counter() - started)
+
+    finally:
+        llm.shutdown()
+        stand_in.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Worker benchmark — per-process throughput of the sync worker (one resume
+at a time) vs the async worker (several resumes in flight) vs the bulk
+worker (K leased resumes processed as a group).
+
+Everything runs in this process against local stand-ins:
+- HTTP: one local server plays Cloudinary (generated PDF resumes), the
+  embedding sidecar (/health, /embed) and the callback endpoint, each with
+  an added latency
+- Redis: fakeredis (sync and asyncio clients share one in-memory server)
+- Mongo: mongomock with an added latency per call
+
+    python -m benchmarks.bench_async_pipeline --resumes 40 --download-ms 80 --mongo-ms 3
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIM = 384
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    resumes: dict[str, bytes] = {}
+    latency = {"download": 0.0, "embed": 0.0, "callback": 0.0}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, json.dumps({"status": "ok", "model": "bench-model"}).encode(), "application/json")
+
+        body = self.resumes.get(self.path)
+        if body is None:
+            return self._send(404, b"", "text/plain")
+
+        time.sleep(self.latency["download"])
+        self._send(200, body, "application/pdf")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.path == "/embed":
+            time.sleep(self.latency["embed"])
+            texts = json.loads(body)["texts"]
+            embeddings = [_fake_embedding(text) for text in texts]
+            payload = json.dumps({"model": "bench-model", "embeddings": embeddings}).encode()
+            return self._send(200, payload, "application/json")
+
+        time.sleep(self.latency["callback"])
+        self._send(200, b"{}", "application/json")
+
+
+def _fake_embedding(text: str) -> list[float]:
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(seed[i % len(seed)] - 128) / 128 for i in range(EMBEDDING_DIM)]
+
+
+def start_stand_in_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install_stand_ins(base_url: str, mongo_latency: float):
+    """Must run BEFORE any app module is imported (settings / connections are module-level)."""
+    os.environ.update({
+        "MONGO_URI_PY": "mongodb://localhost:27017/resume_bench",
+        "EMBEDDING_PROVIDER": "remote",
+        "EMBEDDING_SERVER_URL": base_url,
+        "CALLBACK_URL": f"{base_url}/callback",
+        "EXTRACTION_CACHE_BACKEND": "none",
+        "RESUME_EMBEDDING_REUSE_ENABLED": "false",
+    })
+
+    import fakeredis
+    import mongomock
+    import pymongo
+    import redis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+    redis.from_url = lambda *args, **kwargs: fakeredis.FakeRedis(server=server)
+    redis.asyncio.from_url = lambda *args, **kwargs: fakeredis.FakeAsyncRedis(server=server)
+
+    def slow(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            time.sleep(mongo_latency)
+            return method(*args, **kwargs)
+        return wrapper
+
+    for name in ("find_one", "find", "update_one", "bulk_write", "insert_one", "insert_many"):
+        setattr(mongomock.collection.Collection, name, slow(getattr(mongomock.collection.Collection, name)))
+
+    pymongo.MongoClient = mongomock.MongoClient
+
+
+def enqueue_batch(base_url: str, count: int, seed: int) -> str:
+    from bson import ObjectId
+
+    from benchmarks.bench_pdf_extraction import make_sample_pdf
+
+    from app.queues.batch_worker import QUEUE_NAME
+    from app.utils.mongo import job_descriptions_collection, resume_processings_collection
+    from app.utils.redis_client import redis_conn
+
+    batch_id = f"bench-{uuid.uuid4()}"
+    job_description_id = ObjectId()
+
+    job_descriptions_collection.insert_one({
+        "_id": job_description_id,
+        "title": "Senior Data Engineer",
+        "description": "Build data pipelines on aws with python and docker",
+        "required_skills": ["python", "docker"],
+        "preferred_skills": ["kubernetes", "aws"],
+        "min_experience_years": 3,
+    })
+
+    for i in range(count):
+        path = f"/resumes/{seed}-{i}.pdf"
+        StandInHandler.resumes[path] = make_sample_pdf(2, lines_per_page=30, seed=seed * 100_000 + i)
+
+        resume_processing_id = ObjectId()
+        resume_processings_collection.insert_one({
+            "_id": resume_processing_id,
+            "batchId": batch_id,
+            "jobDescriptionId": job_description_id,
+            "status": "pending",
+        })
+
+        job_id = str(uuid.uuid4())
+        redis_conn.hset(f"rq:job:{job_id}", "data", json.dumps({
+            "resumeUrl": f"{base_url}{path}",
+            "resumeProcessingId": str(resume_processing_id),
+            "externalResumeId": f"ext-{i}",
+            "jobDescriptionId": str(job_description_id),
+            "batchId": batch_id,
+        }))
+        redis_conn.rpush(f"rq:queue:{QUEUE_NAME}", job_id)
+
+    return batch_id
+
+
+def run_sync() -> int:
+    from app.queues.batch_worker import QUEUE_NAME, run_resume_job
+    from app.utils.redis_client import redis_conn
+
+    processed = 0
+    while True:
+        job_id = redis_conn.lpop(f"rq:queue:{QUEUE_NAME}")
+        if job_id is None:
+            return processed
+
+        job_id = job_id.decode()
+        payload = json.loads(redis_conn.hget(f"rq:job:{job_id}", "data"))
+        run_resume_job(job_id, payload)
+        processed += 1
+
+
+def run_async(max_in_flight: int) -> int:
+    from app.queues.async_batch_worker import AsyncBatchWorker
+
+    async def main():
+        return await AsyncBatchWorker(max_in_flight=max_in_flight, burst=True).work()
+
+    return asyncio.run(main())
+
+
+def run_bulk(lease_size: int) -> int:
+    from app.queues.bulk_batch_worker import work_leases
+
+    return work_leases(size=lease_size, burst=True)
+
+
+def report(label: str, batch_id: str, processed: int, elapsed: float):
+    from app.utils.mongo import resume_processings_collection
+
+    completed = resume_processings_collection.count_documents({"batchId": batch_id, "status": "completed"})
+    print(f"{label:<30} {processed / elapsed:7.2f} resumes/s   {elapsed:6.2f} s   completed={completed}/{processed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=40)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--lease-size", type=int, nargs="+", default=[16])
+    parser.add_argument("--download-ms", type=float, default=80)
+    parser.add_argument("--embed-ms", type=float, default=30)
+    parser.add_argument("--callback-ms", type=float, default=20)
+    parser.add_argument("--mongo-ms", type=float, default=3)
+    args = parser.parse_args()
+
+    StandInHandler.latency.update({
+        "download": args.download_ms / 1000,
+        "embed": args.embed_ms / 1000,
+        "callback": args.callback_ms / 1000,
+    })
+
+    server = start_stand_in_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    install_stand_ins(base_url, args.mongo_ms / 1000)
+
+    from app.utils.logger import logger
+    logger.setLevel(logging.ERROR)
+
+    print(
+        f"{args.resumes} resumes/run | latency: download={args.download_ms}ms "
+        f"embed={args.embed_ms}ms callback={args.callback_ms}ms mongo={args.mongo_ms}ms/call\n"
+    )
+
+    try:
+        batch_id = enqueue_batch(base_url, args.resumes, seed=0)
+        started = time.perf_counter()
+        processed = run_sync()
+        report("sync worker", batch_id, processed, time.perf_counter() - started)
+
+        for run, in_flight in enumerate(args.in_flight, start=1):
+            batch_id = enqueue_batch(base_url, args.resumes, seed=run)
+            started = time.perf_counter()
+            processed = run_async(in_flight)
+            report(f"async worker ({in_flight} in flight)", batch_id, processed, time.perf_counter() - started)
+
+        for run, lease_size in enumerate(args.lease_size, start=len(args.in_flight) + 1):
+            batch_id = enqueue_batch(base_url, args.resumes, seed=run)
+            started = time.perf_counter()
+            processed = run_bulk(lease_size)
+            report(f"bulk worker (lease {lease_size})", batch_id, processed, time.perf_counter() - started)
+
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Download benchmark — legacy download vs pooled streaming download.
+
+A local HTTP server stands in for Cloudinary and serves the sample resume.
+Legacy: fresh connection per file, whole body buffered, temp file on disk.
+New: pooled keep-alive session, chunked streaming with a byte cap,
+in-memory spooled buffer, magic-byte sniffing.
+
+    python -m benchmarks.bench_download --file downloaded_resume.pdf --downloads 200
+"""
+import argparse
+import functools
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.services.file_loader import close_resume, download_resume
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory: str) -> ThreadingHTTPServer:
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_download(resume_url: str):
+    """The pre-streaming implementation, kept here as the baseline."""
+    response = requests.get(resume_url, stream=True)
+    response.raise_for_status()
+
+    suffix = os.path.splitext(resume_url)[1] or ""
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    tmp.write(response.content)
+    tmp.close()
+
+    mime = mimetypes.guess_type(tmp.name)[0] or "application/octet-stream"
+    return tmp.name, mime
+
+
+def run(label: str, download, resume_url: str, count: int):
+    started = time.perf_counter()
+    for _ in range(count):
+        source, mime = download(resume_url)
+        close_resume(source)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed / count * 1000:8.3f} ms/download  (mime={mime})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", default="downloaded_resume.pdf")
+    parser.add_argument("--downloads", type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.file)
+    server = start_server(os.path.dirname(path))
+    resume_url = f"http://127.0.0.1:{server.server_address[1]}/{os.path.basename(path)}"
+
+    print(f"Serving {path} ({os.path.getsize(path)} bytes) at {resume_url}\n")
+
+    try:
+        run("legacy", legacy_download, resume_url, args.downloads)
+        run("pooled + streaming", download_resume, resume_url, args.downloads)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
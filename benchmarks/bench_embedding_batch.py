@@ -0,0 +1,75 @@
+"""
+Embedding throughput benchmark — MiniLM on CPU at different batch sizes.
+
+Encodes the same synthetic resume texts with batch sizes 1 / 8 / 32 / 64
+straight through MiniLMEmbeddingProvider.embed_many, then once more through
+the micro-batching executor with concurrent submitters (how the pipeline
+calls it).
+
+    python -m benchmarks.bench_embedding_batch --texts 256
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.embeddings.batching import EmbeddingBatcher
+from app.embeddings.providers.minilm import MiniLMEmbeddingProvider
+from app.embeddings.text_builder import build_resume_embedding_text
+
+VOCABULARY = (
+    "python java javascript react node mongodb docker kubernetes aws sql "
+    "developer engineer backend frontend microservices api design team lead "
+    "years experience university bachelor project delivered scalable systems"
+).split()
+
+
+def synthetic_texts(count: int, words: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        build_resume_embedding_text(" ".join(rng.choices(VOCABULARY, k=words)))
+        for _ in range(count)
+    ]
+
+
+def bench_direct(provider, texts: list[str], batch_size: int) -> float:
+    started = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        provider.embed_many(texts[i:i + batch_size])
+    return len(texts) / (time.perf_counter() - started)
+
+
+def bench_executor(provider, texts: list[str], batch_size: int, callers: int) -> float:
+    batcher = EmbeddingBatcher(provider, max_batch_size=batch_size, max_wait_ms=5)
+    batcher.embed(texts[0])  # start the flusher thread outside the timing
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(batcher.embed, texts))
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--callers", type=int, default=32)
+    args = parser.parse_args()
+
+    provider = MiniLMEmbeddingProvider()
+    texts = synthetic_texts(args.texts, args.words)
+
+    provider.embed_many(texts[:8])  # warm-up
+
+    print(f"{'batch':>6} | {'direct texts/s':>15} | {'executor texts/s':>17}")
+    print("-" * 45)
+
+    for batch_size in args.batch_sizes:
+        direct = bench_direct(provider, texts, batch_size)
+        executor = bench_executor(provider, texts, batch_size, args.callers)
+        print(f"{batch_size:>6} | {direct:15.1f} | {executor:17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+PDF extraction benchmark — pdfminer high-level extract_text (old path) vs
+the extraction engine in each layout mode, sequential and pooled.
+
+Runs over a directory of sample PDFs, or over a generated corpus of
+text-only CVs of various lengths when no directory is given.
+
+    python -m benchmarks.bench_pdf_extraction [--corpus DIR] [--repeat 2]
+"""
+import argparse
+import glob
+import io
+import os
+import random
+import time
+
+from pdfminer.high_level import extract_text
+
+from app.services.pdf_engine import extract_pdf
+
+WORDS = (
+    "python java kubernetes docker aws led team delivered platform migrated "
+    "services reduced latency percent built pipeline data engineer senior "
+    "experience years university bachelor science projects skills summary"
+).split()
+
+
+def make_sample_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """Minimal multi-page text PDF (Helvetica, no external dependency)."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # pages tree, filled below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+
+    for _ in range(pages):
+        lines = [
+            " ".join(rng.choices(WORDS, k=rng.randint(6, 12)))
+            for _ in range(lines_per_page)
+        ]
+        stream = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        content = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def load_corpus(directory: str | None) -> list[tuple[str, bytes]]:
+    if directory:
+        return [
+            (os.path.basename(path), open(path, "rb").read())
+            for path in sorted(glob.glob(os.path.join(directory, "*.pdf")))
+        ]
+
+    return [
+        (f"generated-{pages}p.pdf", make_sample_pdf(pages, seed=pages))
+        for pages in (1, 2, 3, 5, 12, 40)
+    ]
+
+
+def run(label: str, corpus, extract, repeat: int):
+    pages = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, data in corpus:
+            pages += extract(data)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {pages / elapsed:8.1f} pages/s   {elapsed / repeat * 1e3:9.1f} ms/corpus")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="directory of sample PDFs")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--max-pages", type=int, default=0, help="engine page cap (0 → none)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    page_counts = {name: extract_pdf(io.BytesIO(data), max_pages=0, time_budget_seconds=0,
+                                     parallel_min_pages=0)["totalPages"] for name, data in corpus}
+    print(f"corpus: {len(corpus)} files, {sum(page_counts.values())} pages, {os.cpu_count()} cpus\n")
+
+    run("high_level.extract_text (old)", corpus,
+        lambda data: extract_text(io.BytesIO(data)).count("\f"), args.repeat)
+
+    for mode in ("default", "tuned", "off"):
+        for parallel_min_pages, suffix in ((0, "sequential"), (8, "pooled ≥8p")):
+            run(
+                f"engine {mode} {suffix}", corpus,
+                lambda data: extract_pdf(
+                    io.BytesIO(data),
+                    max_pages=args.max_pages,
+                    layout_mode=mode,
+                    time_budget_seconds=0,
+                    parallel_min_pages=parallel_min_pages,
+                )["pages"],
+                args.repeat,
+            )
+
+    # Time budget: partial text instead of a blocked worker
+    largest = max(corpus, key=lambda item: page_counts[item[0]])
+    started = time.perf_counter()
+    result = extract_pdf(io.BytesIO(largest[1]), max_pages=0, time_budget_seconds=0.2, parallel_min_pages=0)
+    print(
+        f"\nbudget 0.2s on {largest[0]}: {result['pages']}/{result['totalPages']} pages "
+        f"in {(time.perf_counter() - started) * 1e3:.0f} ms (timedOut={result['timedOut']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Read volume benchmark — BSON bytes returned per access path for a batch,
+whole documents vs the projections in app/services/resume_processings.py.
+
+Seeds a throwaway batch of realistic resumeprocessings documents (resume
+text, list embeddings, explanation tree). Runs against MONGO_URI_PY, or
+fully in memory with --mongomock.
+
+    python -m benchmarks.bench_projection --resumes 5000 --mongomock
+"""
+import argparse
+import os
+import random
+import uuid
+
+import bson
+
+EMBEDDING_DIM = 384
+WORDS = "python docker kubernetes aws pipelines spark airflow terraform sql mentoring".split()
+
+
+def install_mongomock():
+    """Must run BEFORE any app module is imported (connections are module-level)."""
+    os.environ.setdefault("MONGO_URI_PY", "mongodb://localhost:27017/resume_bench")
+
+    import fakeredis
+    import mongomock
+    import pymongo
+    import redis
+
+    redis.from_url = lambda *args, **kwargs: fakeredis.FakeRedis()
+    pymongo.MongoClient = mongomock.MongoClient
+
+
+def _resume_doc(batch_id: str, job_description_id: bson.ObjectId, i: int) -> dict:
+    text = " ".join(random.choice(WORDS) for _ in range(900))
+    embedding = [random.uniform(-1, 1) for _ in range(EMBEDDING_DIM)]
+
+    return {
+        "batchId": batch_id,
+        "jobDescriptionId": job_description_id,
+        "externalResumeId": f"ext-{i}",
+        "status": "completed",
+        "resumeHash": uuid.uuid4().hex,
+        "jobHash": "bench-job",
+        "normalizedResumeText": text,
+        "resumeEmbedding": embedding,
+        "jobEmbedding": embedding,
+        "embeddingModel": "bench-model",
+        "features": {"version": 1, "tokenCount": 900, "experienceYears": 5, "requiredSkillRatio": 1.0},
+        "preFilter": {"passed": True, "similarityScore": random.random(), "reasons": []},
+        "finalScore": round(random.random(), 4),
+        "explanation": {
+            "skills": {"matched": WORDS[:6], "missing": WORDS[6:], "evidence": [text[:400]] * 5},
+            "experience": {"summary": text[:600]},
+        },
+    }
+
+
+def _bytes(docs) -> int:
+    return sum(len(bson.encode(doc)) for doc in docs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--mongomock", action="store_true")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        install_mongomock()
+
+    from app.services import resume_processings as repo
+    from app.utils.mongo import resume_processings_collection
+
+    batch_id = f"bench-{uuid.uuid4()}"
+    job_description_id = bson.ObjectId()
+    docs = [_resume_doc(batch_id, job_description_id, i) for i in range(args.resumes)]
+    ids = resume_processings_collection.insert_many(docs).inserted_ids
+
+    try:
+        ranking_filter = {"batchId": batch_id, "jobDescriptionId": job_description_id, "preFilter.passed": True}
+        rows = [
+            (
+                f"ranking ({args.resumes} resumes)",
+                _bytes(resume_processings_collection.find(ranking_filter)),
+                _bytes(repo.iter_ranking_candidates(batch_id, str(job_description_id))),
+            ),
+            (
+                "dedup (1 lookup)",
+                _bytes([resume_processings_collection.find_one({"_id": ids[0]})]),
+                _bytes([repo.find_dedup_source(docs[0]["resumeHash"], "bench-job")]),
+            ),
+            (
+                "analysis (1 lookup)",
+                _bytes([resume_processings_collection.find_one({"_id": ids[0]})]),
+                _bytes([repo.find_for_analysis(str(ids[0]))]),
+            ),
+            (
+                "status (1 lookup)",
+                _bytes([resume_processings_collection.find_one({"batchId": batch_id})]),
+                _bytes([resume_processings_collection.find_one({"batchId": batch_id}, repo.STATUS_PROJECTION)]),
+            ),
+        ]
+
+        print(f"{'access path':<26} | {'whole doc KB':>12} | {'projected KB':>12} | {'ratio':>6}")
+        print("-" * 66)
+        for label, whole, projected in rows:
+            print(f"{label:<26} | {whole / 1024:12.1f} | {projected / 1024:12.1f} | {whole / projected:5.1f}x")
+
+    finally:
+        resume_processings_collection.delete_many({"batchId": batch_id})
+
+
+if __name__ == "__main__":
+    main()
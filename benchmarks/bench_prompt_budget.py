@@ -0,0 +1,111 @@
+"""
+Prompt budget benchmark — Phase 5B prompt size before (whole resume inlined)
+and after (assemble_prompt: dedupe + section / skill aware compaction).
+
+Runs over a generated corpus of normalized resumes from 1 to 16 pages
+(repeated page header / footer included). Latency is measured with real
+Gemini calls when --live is given (GEMINI_API_KEY), otherwise modeled as
+--ms-per-1k-tokens of prompt prefill.
+
+    python -m benchmarks.bench_prompt_budget [--budget 6000] [--live]
+"""
+import argparse
+import random
+import time
+
+from app.analysis.budget import assemble_prompt, estimate_tokens
+from app.analysis.prompt import build_prompt
+from app.embeddings.skill_matcher import SkillMatcher
+from app.services.normalize import normalize_text
+
+REQUIRED_SKILLS = ["python", "docker", "aws", "apache spark"]
+PREFERRED_SKILLS = ["kubernetes", "terraform", "airflow"]
+
+FILLER = (
+    "led team delivered platform migrated services reduced latency percent built "
+    "pipeline stakeholders roadmap ownership mentoring reviews design documents "
+    "customers reliability on call incidents quarterly goals collaborated across"
+).split()
+
+SECTIONS = ["summary", "experience", "projects", "skills", "education", "certifications"]
+
+JOB_TEXT = (
+    "Senior Data Engineer. Build batch and streaming data pipelines on AWS with Python, "
+    "Apache Spark and Docker. Kubernetes, Terraform and Airflow are a plus. " * 4
+)
+
+EXPLANATION = {
+    "skills": {"matched": REQUIRED_SKILLS[:3], "missing": REQUIRED_SKILLS[3:]},
+    "experience": {"requiredYears": 5, "candidateYears": 7, "meetsRequirement": True},
+}
+
+
+def make_resume(pages: int, seed: int) -> str:
+    rng = random.Random(seed)
+    skills = REQUIRED_SKILLS + PREFERRED_SKILLS
+    footer = f"jane doe curriculum vitae jane doe example com page confidential seed {seed}"
+
+    parts = []
+    for page in range(pages):
+        section = SECTIONS[page % len(SECTIONS)]
+        parts.append(section)
+        for _ in range(30):
+            line = rng.choices(FILLER, k=rng.randint(8, 14))
+            if rng.random() < 0.15:
+                line.insert(rng.randrange(len(line)), rng.choice(skills))
+            parts.append(" ".join(line))
+        parts.append(footer)
+
+    return normalize_text(" ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--budget", type=int, default=None)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=120)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    matcher = SkillMatcher(REQUIRED_SKILLS, PREFERRED_SKILLS)
+    budget = {"budget": args.budget} if args.budget else {}
+
+    if args.live:
+        from app.analysis.runner import run_llm
+
+        def latency(prompt: str) -> float:
+            started = time.perf_counter()
+            run_llm(prompt)
+            return (time.perf_counter() - started) * 1000
+    else:
+        def latency(prompt: str) -> float:
+            return estimate_tokens(prompt) / 1000 * args.ms_per_1k_tokens
+
+    print(f"latency: {'live Gemini calls' if args.live else f'modeled, {args.ms_per_1k_tokens} ms / 1k prompt tokens'}\n")
+    print(
+        f"{'pages':>5} | {'before tok':>10} | {'after tok':>9} | {'resume kept':>11} | "
+        f"{'skills kept':>11} | {'assemble ms':>11} | {'before ms':>9} | {'after ms':>8}"
+    )
+    print("-" * 96)
+
+    for pages in args.pages:
+        resume = make_resume(pages, seed=pages)
+        before = build_prompt(resume_text=resume, job_text=JOB_TEXT, explanation=EXPLANATION)
+
+        started = time.perf_counter()
+        assembled = assemble_prompt(resume, JOB_TEXT, EXPLANATION, skill_matcher=matcher, **budget)
+        assemble_ms = (time.perf_counter() - started) * 1000
+
+        kept_skills = len(matcher.scan(assembled["resumeText"]).matched)
+        all_skills = len(matcher.scan(resume).matched)
+
+        print(
+            f"{pages:>5} | {estimate_tokens(before):>10} | {assembled['tokens']['total']:>9} | "
+            f"{assembled['tokens']['resume'] / estimate_tokens(resume):>10.0%} | "
+            f"{kept_skills:>5}/{all_skills:<5} | {assemble_ms:>11.2f} | "
+            f"{latency(before):>9.0f} | {latency(assembled['prompt']):>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Ranking benchmark — per-resume ranking cost vs batch size.
+
+Compares the legacy full re-rank (reload + rescore + one update per resume,
+on EVERY resume) with the incremental path (one ZADD per resume, one bulk
+write when the batch settles).
+
+Runs against the Mongo / Redis configured by MONGO_URI_PY / REDIS_URL and
+only touches documents of a throwaway batch id.
+
+    python -m benchmarks.bench_ranking --sizes 100 1000 5000 --legacy-max 1000
+"""
+import argparse
+import random
+import time
+import uuid
+
+from bson import ObjectId
+
+from app.embeddings.ranking import (
+    rank_batch_if_settled,
+    ranking_key,
+    record_resume_score,
+)
+from app.utils.mongo import resume_processings_collection
+from app.utils.redis_client import redis_conn
+
+
+def _seed_batch(batch_id: str, job_description_id: ObjectId, size: int):
+    docs = [
+        {
+            "batchId": batch_id,
+            "jobDescriptionId": job_description_id,
+            "status": "processing",
+            "preFilter": {"passed": True, "similarityScore": random.random()},
+        }
+        for _ in range(size)
+    ]
+    return resume_processings_collection.insert_many(docs).inserted_ids
+
+
+def _cleanup(batch_id: str, job_description_id: ObjectId):
+    resume_processings_collection.delete_many({"batchId": batch_id})
+    redis_conn.delete(ranking_key(batch_id, str(job_description_id)))
+
+
+def run_incremental(size: int) -> float:
+    batch_id = f"bench-{uuid.uuid4()}"
+    job_description_id = ObjectId()
+    ids = _seed_batch(batch_id, job_description_id, size)
+
+    try:
+        started = time.perf_counter()
+
+        for resume_id in ids:
+            score = round(random.random(), 4)
+            resume_processings_collection.update_one(
+                {"_id": resume_id},
+                {"$set": {"finalScore": score, "status": "completed"}},
+            )
+            record_resume_score(batch_id, str(job_description_id), str(resume_id), score)
+            rank_batch_if_settled(batch_id, str(job_description_id))
+
+        return time.perf_counter() - started
+
+    finally:
+        _cleanup(batch_id, job_description_id)
+
+
+def run_legacy(size: int) -> float:
+    batch_id = f"bench-{uuid.uuid4()}"
+    job_description_id = ObjectId()
+    _seed_batch(batch_id, job_description_id, size)
+
+    try:
+        started = time.perf_counter()
+
+        for _ in range(size):
+            resumes = list(
+                resume_processings_collection.find(
+                    {
+                        "batchId": batch_id,
+                        "jobDescriptionId": job_description_id,
+                        "preFilter.passed": True,
+                    }
+                )
+            )
+            scored = sorted(
+                ((doc["_id"], doc["preFilter"]["similarityScore"]) for doc in resumes),
+                key=lambda x: x[1],
+                reverse=True,
+            )
+            for rank, (resume_id, score) in enumerate(scored, start=1):
+                resume_processings_collection.update_one(
+                    {"_id": resume_id},
+                    {"$set": {"finalScore": score, "rank": rank, "rankingStatus": "completed"}},
+                )
+
+        return time.perf_counter() - started
+
+    finally:
+        _cleanup(batch_id, job_description_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=1000,
+        help="skip the O(N²) legacy path above this batch size",
+    )
+    args = parser.parse_args()
+
+    print(f"{'batch':>8} | {'incremental ms/resume':>22} | {'legacy ms/resume':>17}")
+    print("-" * 54)
+
+    for size in args.sizes:
+        incremental = run_incremental(size) / size * 1000
+        legacy = (
+            f"{run_legacy(size) / size * 1000:17.3f}"
+            if size <= args.legacy_max
+            else f"{'skipped':>17}"
+        )
+        print(f"{size:>8} | {incremental:22.3f} | {legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Rank materialization benchmark — writing finalScore / rank / rankingStatus
+for a whole batch:
+- one update_one per resume (previous loop)
+- chunked bulk_write(ordered=False) (materialize_ranks)
+
+Runs against the Mongo configured by MONGO_URI_PY and only touches documents
+of a throwaway batch id. --mongomock runs fully in memory instead; it has no
+network round trips, so add one with --mongo-ms (e.g. 0.5 for a local mongod).
+
+    python -m benchmarks.bench_ranking_materialize --sizes 100 1000 10000 --chunk-size 1000
+"""
+import argparse
+import functools
+import os
+import random
+import time
+import uuid
+
+
+def install_mongomock(round_trip: float):
+    """Must run BEFORE any app module is imported (connections are module-level)."""
+    os.environ.setdefault("MONGO_URI_PY", "mongodb://localhost:27017/resume_bench")
+
+    import fakeredis
+    import mongomock
+    import pymongo
+    import redis
+
+    redis.from_url = lambda *args, **kwargs: fakeredis.FakeRedis()
+    def slow(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            time.sleep(round_trip)
+            return method(*args, **kwargs)
+        return wrapper
+
+    for name in ("update_one", "bulk_write"):
+        setattr(mongomock.collection.Collection, name, slow(getattr(mongomock.collection.Collection, name)))
+
+    pymongo.MongoClient = mongomock.MongoClient
+
+
+def _seed_batch(size: int) -> tuple[str, list[tuple[str, float]]]:
+    from app.utils.mongo import resume_processings_collection
+
+    batch_id = f"bench-{uuid.uuid4()}"
+    ids = resume_processings_collection.insert_many(
+        [{"batchId": batch_id, "status": "completed"} for _ in range(size)]
+    ).inserted_ids
+
+    scored = sorted(
+        ((str(resume_id), round(random.random(), 4)) for resume_id in ids),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return batch_id, scored
+
+
+def run_per_resume(scored: list[tuple[str, float]]):
+    from bson import ObjectId
+
+    from app.utils.mongo import resume_processings_collection
+
+    for rank, (resume_id, score) in enumerate(scored, start=1):
+        resume_processings_collection.update_one(
+            {"_id": ObjectId(resume_id)},
+            {"$set": {"finalScore": score, "rank": rank, "rankingStatus": "completed"}},
+        )
+
+
+def timed(size: int, materialize) -> float:
+    from app.utils.mongo import resume_processings_collection
+
+    batch_id, scored = _seed_batch(size)
+    try:
+        started = time.perf_counter()
+        materialize(scored)
+        elapsed = time.perf_counter() - started
+
+        ranked = resume_processings_collection.count_documents({"batchId": batch_id, "rankingStatus": "completed"})
+        assert ranked == size, f"{ranked}/{size} resumes ranked"
+        return elapsed
+
+    finally:
+        resume_processings_collection.delete_many({"batchId": batch_id})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--mongomock", action="store_true")
+    parser.add_argument("--mongo-ms", type=float, default=0.0, help="added round trip per call (mongomock only)")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        install_mongomock(args.mongo_ms / 1000)
+
+    from app.embeddings.ranking import materialize_ranks
+    from app.utils.settings import RANKING_WRITE_CHUNK_SIZE
+
+    chunk_size = args.chunk_size or RANKING_WRITE_CHUNK_SIZE
+
+    print(f"chunk size: {chunk_size} | backend: {f'mongomock +{args.mongo_ms}ms/call' if args.mongomock else 'mongod'}\n")
+    print(f"{'batch':>8} | {'update_one loop ms':>18} | {'bulk_write ms':>13} | {'speedup':>7}")
+    print("-" * 57)
+
+    for size in args.sizes:
+        per_resume = timed(size, run_per_resume)
+        bulk = timed(size, lambda scored: materialize_ranks(scored, chunk_size=chunk_size))
+        print(f"{size:>8} | {per_resume * 1000:18.1f} | {bulk * 1000:13.1f} | {per_resume / bulk:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Similarity micro-benchmark — legacy pure-Python cosine vs NumPy paths.
+
+    python -m benchmarks.bench_similarity --resumes 5000 --dim 384
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.embeddings.similarity import (
+    cosine_similarity,
+    normalized_similarity,
+    similarity_matrix,
+)
+
+
+def legacy_cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
+    """The pre-NumPy implementation, kept here as the baseline."""
+    dot = sum(a * b for a, b in zip(vec1, vec2))
+    norm1 = math.sqrt(sum(a * a for a in vec1))
+    norm2 = math.sqrt(sum(b * b for b in vec2))
+
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+
+    return dot / (norm1 * norm2)
+
+
+def random_unit_vectors(count: int, dim: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timed(label: str, fn, count: int):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms  {elapsed / count * 1e6:10.2f} µs/resume")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    resumes = random_unit_vectors(args.resumes, args.dim)
+    job = random_unit_vectors(1, args.dim, seed=11)[0]
+
+    # Stored embeddings come back from Mongo as Python lists
+    resume_lists = resumes.tolist()
+    job_list = job.tolist()
+
+    timed("legacy cosine (pure Python)", lambda: [legacy_cosine_similarity(r, job_list) for r in resume_lists], args.resumes)
+    timed("cosine_similarity (NumPy, per pair)", lambda: [cosine_similarity(r, job_list) for r in resume_lists], args.resumes)
+    timed("normalized_similarity (dot, per pair)", lambda: [normalized_similarity(r, job_list) for r in resume_lists], args.resumes)
+    timed("similarity_matrix (from lists)", lambda: similarity_matrix(job_list, resume_lists), args.resumes)
+    timed("similarity_matrix (float32 matrix)", lambda: similarity_matrix(job, resumes), args.resumes)
+
+    legacy = np.array([legacy_cosine_similarity(r, job_list) for r in resume_lists])
+    vectorized = similarity_matrix(job, resumes)
+    print(f"\nmax |legacy - vectorized| = {np.max(np.abs(legacy - vectorized)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
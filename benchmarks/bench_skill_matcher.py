@@ -0,0 +1,104 @@
+"""
+Skill matching benchmark — legacy per-skill substring checks vs the
+compiled token automaton, on large skill lists.
+
+Legacy = what prefilter, both skill ratios and the skills explanation did
+for every resume (one `in` scan per skill per consumer).
+Compiled = SkillMatcher built once per job, one scan per resume shared by
+all consumers.
+
+    python -m benchmarks.bench_skill_matcher --skills 250 --resumes 500
+"""
+import argparse
+import random
+import re
+import time
+
+from app.embeddings.skill_matcher import SkillMatcher
+from app.services.normalize import normalize_text
+
+BASE_SKILLS = (
+    "python java javascript typescript go rust scala kotlin swift ruby php perl "
+    "react angular vue svelte node django flask fastapi spring rails laravel "
+    "mongodb postgresql mysql redis kafka rabbitmq elasticsearch cassandra "
+    "docker kubernetes terraform ansible jenkins aws azure gcp linux bash "
+    "pandas numpy pytorch tensorflow spark hadoop airflow graphql rest grpc"
+).split()
+QUALIFIERS = ["", "advanced", "distributed", "cloud", "data", "web", "mobile", "ml"]
+
+
+def skill_list(count: int, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    skills = dict.fromkeys(BASE_SKILLS)
+    while len(skills) < count:
+        skills[f"{rng.choice(QUALIFIERS)} {rng.choice(BASE_SKILLS)} {rng.randint(1, 9)}".strip()] = None
+    return list(skills)[:count]
+
+
+def resume_texts(count: int, words: int, skills: list[str], seed: int = 5) -> list[str]:
+    rng = random.Random(seed)
+    filler = "team delivered scalable systems years experience led project built".split()
+    vocabulary = filler * 4 + [token for skill in skills for token in skill.split()]
+    return [normalize_text(" ".join(rng.choices(vocabulary, k=words))) for _ in range(count)]
+
+
+def _normalize_skill(skill: str) -> str:
+    return re.sub(r"[^a-z0-9+.#]", "", skill.lower().strip())
+
+
+def legacy(text: str, required: list[str], preferred: list[str]):
+    # prefilter + required ratio + preferred ratio + explanation (required & preferred)
+    [s for s in required if s.lower() not in text]
+    [s for s in required if s.lower() in text]
+    [s for s in preferred if s.lower() in text]
+    [s for s in required if _normalize_skill(s) in text]
+    [s for s in preferred if _normalize_skill(s) in text]
+
+
+def compiled(matcher: SkillMatcher, text: str):
+    result = matcher.scan(text)
+    result.missing_required
+    result.required_ratio
+    result.preferred_ratio
+    result.matched_required
+    result.matched_preferred
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=250)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--words", type=int, default=800)
+    args = parser.parse_args()
+
+    skills = skill_list(args.skills)
+    required, preferred = skills[: len(skills) // 2], skills[len(skills) // 2:]
+    texts = resume_texts(args.resumes, args.words, skills)
+
+    started = time.perf_counter()
+    for text in texts:
+        legacy(text, required, preferred)
+    legacy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = SkillMatcher(required, preferred)
+    compile_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in texts:
+        compiled(matcher, text)
+    compiled_elapsed = time.perf_counter() - started
+
+    print(f"skills={len(skills)} resumes={args.resumes} words/resume={args.words}\n")
+    print(f"{'legacy substring checks':<28} {legacy_elapsed / args.resumes * 1e6:10.1f} µs/resume")
+    print(f"{'compiled automaton':<28} {compiled_elapsed / args.resumes * 1e6:10.1f} µs/resume")
+    print(f"{'compile (once per job)':<28} {compile_elapsed * 1e3:10.2f} ms")
+
+    # Word-boundary correctness: substring matching over-counts
+    text = texts[0]
+    substring_hits = {s for s in skills if s.lower() in text}
+    print(f"\nfirst resume: substring hits={len(substring_hits)} whole-word hits={len(matcher.scan(text).matched)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Worker cold start benchmark — `python -X importtime` of each worker entry
+module, plus the wall time of import + warm_up() (time-to-first-job minus the
+first job itself), in fresh interpreters.
+
+Mongo / Redis are never contacted (worker warm-up skips connections); with
+--warm-up the embedding model / LLM client of the worker are loaded too. --compare REF measures the
+same modules in a `git archive` of REF too (e.g. --compare HEAD~1).
+
+    python -m benchmarks.bench_startup [--top 10] [--compare REF] [--warm-up]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+# Entry module → the warm_up() arguments its __main__ uses
+MODULES = {
+    "app.queues.batch_worker": "parsers=True, embeddings=True",
+    "app.queues.async_batch_worker": "parsers=True, embeddings=True",
+    "app.queues.analysis_worker": "llm=True",
+}
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("MONGO_URI_PY", "mongodb://127.0.0.1:27017/resume_startup_bench")
+    env.setdefault("EMBEDDING_PROVIDER", "remote")
+    return env
+
+
+def import_profile(root: str, module: str) -> tuple[float, list[tuple[int, str]], str | None]:
+    """(total ms, [(self µs, top-level package)], error)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, env=_env(), capture_output=True, text=True,
+    )
+
+    packages: dict[str, int] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        # Self time per top-level package (pdfminer, pymongo, numpy, app, ...)
+        self_us, name = int(match.group(1)), match.group(2)
+        total += self_us
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1]
+
+    ranked = sorted(((us, name) for name, us in packages.items()), reverse=True)
+    return total / 1000, ranked, error
+
+
+def warm_up_time(root: str, module: str) -> float:
+    code = (
+        "import time; started = time.perf_counter()\n"
+        f"import {module}\n"
+        f"from app.utils.warmup import warm_up; warm_up({MODULES[module]})\n"
+        "print(time.perf_counter() - started)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=_env(), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def export_ref(ref: str) -> str:
+    directory = tempfile.mkdtemp(prefix="startup-bench-")
+    archive = os.path.join(directory, "tree.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, ref], check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(directory)
+    return directory
+
+
+def report(label: str, root: str, top: int, with_warm_up: bool):
+    print(f"== {label}")
+    for module in MODULES:
+        total, ranked, error = import_profile(root, module)
+        if error:
+            print(f"{module:<34} import failed: {error}")
+            continue
+
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in ranked[:top])
+        line = f"{module:<34} import {total:8.1f} ms"
+        if with_warm_up:
+            line += f" | import + warm_up {warm_up_time(root, module):8.1f} ms"
+        print(f"{line}\n    heaviest: {heaviest}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=6)
+    parser.add_argument("--compare", default=None, help="git ref to measure as the baseline")
+    parser.add_argument("--warm-up", action="store_true")
+    args = parser.parse_args()
+
+    if args.compare:
+        report(f"{args.compare}", export_ref(args.compare), args.top, with_warm_up=False)
+
+    started = time.perf_counter()
+    report("working tree", os.getcwd(), args.top, args.warm_up)
+    print(f"(benchmark ran in {time.perf_counter() - started:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
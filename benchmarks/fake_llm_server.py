@@ -0,0 +1,122 @@
+"""
+Local stand-in for the LLM provider (LLM_PROVIDER=http).
+
+POST /generate {"prompt", ...} → {"text": <valid Phase 5B analysis JSON>}
+after `--latency-ms` (+ `--ms-per-1k-tokens` of prompt). Above `--rpm`
+requests in the last 60 s it answers 429 like the real API.
+
+    python -m benchmarks.fake_llm_server --port 8091 --latency-ms 800 --rpm 600
+"""
+import argparse
+import collections
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANALYSIS = {
+    "parsed_resume": {
+        "name": None,
+        "email": None,
+        "phone": None,
+        "education": [],
+        "experience": [],
+        "skills": ["python", "docker"],
+    },
+    "analysis": {
+        "matchedSkills": ["python", "docker"],
+        "missingSkills": [],
+        "strengths": ["Relevant platform experience"],
+        "concerns": [],
+        "experienceAssessment": "Meets the required experience.",
+        "overallFit": "Strong",
+        "summary": "Strong match for the role.",
+        "recommendation": "Proceed to interview.",
+    },
+}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    latency = 0.8
+    ms_per_1k_tokens = 0.0
+    rpm = 0
+    stats = {"requests": 0, "rateLimited": 0, "inFlight": 0, "maxInFlight": 0}
+
+    _lock = threading.Lock()
+    _window = collections.deque()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _admit(self) -> bool:
+        cls = type(self)
+        with cls._lock:
+            now = time.monotonic()
+            while cls._window and cls._window[0] <= now - 60:
+                cls._window.popleft()
+
+            cls.stats["requests"] += 1
+            if cls.rpm and len(cls._window) >= cls.rpm:
+                cls.stats["rateLimited"] += 1
+                return False
+
+            cls._window.append(now)
+            cls.stats["inFlight"] += 1
+            cls.stats["maxInFlight"] = max(cls.stats["maxInFlight"], cls.stats["inFlight"])
+            return True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+        if not self._admit():
+            return self._send(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+
+        try:
+            prompt_tokens = len(request.get("prompt", "")) / 4
+            time.sleep(self.latency + prompt_tokens / 1000 * self.ms_per_1k_tokens / 1000)
+            self._send(200, {"text": json.dumps(ANALYSIS)})
+        finally:
+            with self._lock:
+                type(self).stats["inFlight"] -= 1
+
+
+def start_fake_llm_server(port: int = 0, latency_ms: float = 800, rpm: int = 0, ms_per_1k_tokens: float = 0) -> ThreadingHTTPServer:
+    FakeLLMHandler.latency = latency_ms / 1000
+    FakeLLMHandler.rpm = rpm
+    FakeLLMHandler.ms_per_1k_tokens = ms_per_1k_tokens
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=0)
+    parser.add_argument("--rpm", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_fake_llm_server(args.port, args.latency_ms, args.rpm, args.ms_per_1k_tokens)
+    print(f"🤖 Fake LLM server on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import unittest
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (runs the Lua scripts inside fakeredis)
+except ImportError:
+    fakeredis = None
+
+from app.analysis.rate_limit import BUCKET_SCRIPT
+
+KEYS = ["llm:rate:requests", "llm:rate:tokens", "llm:rate:cooldown"]
+
+
+@unittest.skipUnless(fakeredis, "fakeredis (with lupa) is not installed")
+class BucketScriptTest(unittest.TestCase):
+
+    def setUp(self):
+        self.redis = fakeredis.FakeStrictRedis()
+        self.bucket = self.redis.register_script(BUCKET_SCRIPT)
+
+    def acquire(self, now, tokens, rpm=60, tpm=6000):
+        return float(self.bucket(keys=KEYS, args=[now, rpm, tpm, tokens]))
+
+    def level(self, key):
+        return float(self.redis.hget(key, "level"))
+
+    def test_admits_until_the_bucket_is_empty_then_refills(self):
+        now = 1000.0
+        for _ in range(3):
+            self.assertEqual(self.acquire(now, 100, rpm=3), 0)
+
+        # 3 rpm: one request refills every 20 s
+        self.assertAlmostEqual(self.acquire(now, 100, rpm=3), 20)
+        self.assertAlmostEqual(self.acquire(now + 10, 100, rpm=3), 10)
+        self.assertEqual(self.acquire(now + 20, 100, rpm=3), 0)
+
+    def test_denial_does_not_consume_tokens(self):
+        now = 1000.0
+        self.assertEqual(self.acquire(now, 5000), 0)
+        self.assertAlmostEqual(self.level(KEYS[1]), 1000)
+
+        # Needs 2000 of the 1000 left: waits 10 s, takes nothing from either bucket
+        self.assertAlmostEqual(self.acquire(now, 2000), 10)
+        self.assertAlmostEqual(self.level(KEYS[1]), 1000)
+        self.assertAlmostEqual(self.level(KEYS[0]), 59)
+
+        self.assertEqual(self.acquire(now + 10, 2000), 0)
+        self.assertAlmostEqual(self.level(KEYS[1]), 0)
+
+    def test_cooldown_blocks_every_caller(self):
+        self.redis.set(KEYS[2], 1030)
+        self.assertAlmostEqual(self.acquire(1000.0, 1), 30)
+        self.assertIsNone(self.redis.hget(KEYS[0], "level"))
+
+
+if __name__ == "__main__":
+    unittest.main()
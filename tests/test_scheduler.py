@@ -0,0 +1,60 @@
+import time
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (runs the Lua scripts inside fakeredis)
+except ImportError:
+    fakeredis = None
+
+from app.queues import scheduler
+
+
+@unittest.skipUnless(fakeredis, "fakeredis (with lupa) is not installed")
+class MoveDueScriptTest(unittest.TestCase):
+
+    def setUp(self):
+        # Two scheduler replicas on the same Redis
+        server = fakeredis.FakeServer()
+        self.replicas = [fakeredis.FakeStrictRedis(server=server) for _ in range(2)]
+        self.redis = self.replicas[0]
+        self.keys = ["rq:retry", "rq:queue:batch-processing"]
+
+    def move(self, replica, now, limit=100):
+        return replica.register_script(scheduler.MOVE_DUE_SCRIPT)(keys=self.keys, args=[now, limit])
+
+    def test_replicas_never_enqueue_a_job_twice(self):
+        now = time.time()
+        self.redis.zadd("rq:retry", {f"job-{i}": now - 10 + i for i in range(6)})
+
+        first = self.move(self.replicas[0], now, limit=4)
+        second = self.move(self.replicas[1], now, limit=4)
+
+        moved = first[:-1:2] + second[:-1:2]
+        self.assertEqual(len(moved), 6)
+        self.assertEqual(len(set(moved)), 6)
+        self.assertEqual(self.redis.llen("rq:queue:batch-processing"), 6)
+        self.assertEqual(self.redis.zcard("rq:retry"), 0)
+
+    def test_only_due_jobs_move_and_head_is_the_next_due_score(self):
+        now = time.time()
+        self.redis.zadd("rq:retry", {"due": now - 1, "later": now + 30})
+
+        result = self.move(self.redis, now)
+
+        self.assertEqual(result[:-1:2], [b"due"])
+        self.assertEqual(float(result[-1]), now + 30)
+        self.assertEqual(self.redis.lrange("rq:queue:batch-processing", 0, -1), [b"due"])
+
+    def test_empty_retry_set_returns_no_head(self):
+        # Lua false comes back as nil: move_due_jobs reports no next due job
+        self.assertEqual(self.move(self.redis, time.time()), [None])
+
+        with mock.patch.object(scheduler, "r", self.redis), \
+                mock.patch.object(scheduler, "_move_due", self.redis.register_script(scheduler.MOVE_DUE_SCRIPT)):
+            self.assertEqual(scheduler.move_due_jobs("batch-processing", "rq:retry"), (0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from app.embeddings.skill_matcher import SkillMatcher
+from app.services.normalize import normalize_text
+
+
+def matched(required: list[str], text: str) -> set[str]:
+    return SkillMatcher(required, []).scan(normalize_text(text)).matched
+
+
+class SkillMatcherTest(unittest.TestCase):
+
+    def test_java_does_not_match_javascript(self):
+        self.assertEqual(matched(["Java"], "Senior JavaScript developer"), set())
+        self.assertEqual(matched(["Java"], "Java and JavaScript"), {"Java"})
+
+    def test_symbol_skills_are_not_matched_by_a_stray_c(self):
+        # "C++" / "C#" normalize to "c": never confirmed from normalized text
+        self.assertEqual(matched(["C++", "Java"], "Senior C# developer, JavaScript"), set())
+        self.assertEqual(matched(["C#"], "C++ and embedded c"), set())
+        self.assertEqual(SkillMatcher(["C++", "C#", "Java"]).unmatchable, ["C++", "C#"])
+
+    def test_plain_one_letter_skill_still_matches(self):
+        self.assertEqual(matched(["C", "R"], "Embedded C, statistics in R"), {"C", "R"})
+
+    def test_dotnet_is_a_whole_token(self):
+        self.assertEqual(matched([".NET"], "ASP.NET Core services"), {".NET"})
+        self.assertEqual(matched([".NET"], "C# / .NET 8"), {".NET"})
+        self.assertEqual(matched([".NET"], "network engineer"), set())
+
+    def test_multi_token_symbol_skills(self):
+        self.assertEqual(matched(["Objective-C", "Node.js"], "objective-c and node.js apps"), {"Objective-C", "Node.js"})
+
+
+if __name__ == "__main__":
+    unittest.main()